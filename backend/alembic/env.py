@@ -24,6 +24,8 @@ config.set_main_option("sqlalchemy.url", DATABASE_URL)
 
 from models.base import Base
 from models.epub_metadata import EpubMetadata
+from models.authors import Authors, BookAuthors
+from models.series import Series
 from models.users import Users
 from models.progress_mapping import ProgressMapping
 from models.requests import Requests
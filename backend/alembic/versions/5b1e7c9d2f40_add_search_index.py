@@ -0,0 +1,93 @@
+"""Add full-text search index
+
+Revision ID: 5b1e7c9d2f40
+Revises: a83f2c6d91e4
+Create Date: 2026-10-17 14:05:12.904117
+
+"""
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e7c9d2f40'
+down_revision: Union[str, None] = 'a83f2c6d91e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+# Frozen copies of the model helpers as of this revision, so later changes to models/ can't alter the migration
+_SEARCH_INDEX_DDL = {
+    'sqlite': [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS epub_metadata_fts USING fts5("
+        "search_text, content='epub_metadata', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER IF NOT EXISTS epub_metadata_fts_insert AFTER INSERT ON epub_metadata BEGIN "
+        "INSERT INTO epub_metadata_fts(rowid, search_text) VALUES (new.id, new.search_text); END",
+        "CREATE TRIGGER IF NOT EXISTS epub_metadata_fts_delete AFTER DELETE ON epub_metadata BEGIN "
+        "INSERT INTO epub_metadata_fts(epub_metadata_fts, rowid, search_text) VALUES ('delete', old.id, old.search_text); END",
+        "CREATE TRIGGER IF NOT EXISTS epub_metadata_fts_update AFTER UPDATE OF search_text ON epub_metadata BEGIN "
+        "INSERT INTO epub_metadata_fts(epub_metadata_fts, rowid, search_text) VALUES ('delete', old.id, old.search_text); "
+        "INSERT INTO epub_metadata_fts(rowid, search_text) VALUES (new.id, new.search_text); END",
+    ],
+    'postgresql': [
+        "CREATE INDEX IF NOT EXISTS epub_metadata_search_idx ON epub_metadata "
+        "USING gin (to_tsvector('simple'::regconfig, coalesce(search_text, '')))",
+    ],
+    'mysql': [
+        "CREATE FULLTEXT INDEX epub_metadata_search_idx ON epub_metadata (search_text)",
+    ],
+}
+
+
+def _fold_search_text(value):
+    decomposed = unicodedata.normalize('NFKD', value)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def _build_search_text(title, authors, series):
+    return _fold_search_text(' '.join(part for part in (title, authors, series) if part))
+
+
+def upgrade() -> None:
+    op.add_column('epub_metadata', sa.Column('search_text', sa.Text(), nullable=True))
+
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(text("""
+                                       SELECT id, title, authors, series
+                                       FROM epub_metadata
+                                       WHERE id > :last_id
+                                       ORDER BY id
+                                       LIMIT :batch_size
+                                       """), {"last_id": last_id, "batch_size": BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        connection.execute(
+            text("UPDATE epub_metadata SET search_text = :search_text WHERE id = :id"),
+            [{"id": row.id, "search_text": _build_search_text(row.title, row.authors, row.series)} for row in rows]
+        )
+        last_id = rows[-1].id
+
+    dialect = connection.dialect.name
+    for statement in _SEARCH_INDEX_DDL.get(dialect, []):
+        op.execute(statement)
+    if dialect == 'sqlite':
+        op.execute("INSERT INTO epub_metadata_fts(epub_metadata_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS epub_metadata_fts_insert")
+        op.execute("DROP TRIGGER IF EXISTS epub_metadata_fts_delete")
+        op.execute("DROP TRIGGER IF EXISTS epub_metadata_fts_update")
+        op.execute("DROP TABLE IF EXISTS epub_metadata_fts")
+    elif dialect in ('postgresql', 'mysql'):
+        op.drop_index('epub_metadata_search_idx', table_name='epub_metadata')
+    op.drop_column('epub_metadata', 'search_text')
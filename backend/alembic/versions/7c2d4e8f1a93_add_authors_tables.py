@@ -0,0 +1,165 @@
+"""Add authors and book_authors tables
+
+Revision ID: 7c2d4e8f1a93
+Revises: 5b1e7c9d2f40
+Create Date: 2026-10-17 16:31:47.215530
+
+"""
+import re
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2d4e8f1a93'
+down_revision: Union[str, None] = '5b1e7c9d2f40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+CHUNK_SIZE = 500
+
+# Frozen copies of the model helpers as of this revision, so later changes to models/ can't alter the migration
+_authors = sa.table(
+    'authors', sa.column('id'), sa.column('name'), sa.column('name_key'), sa.column('slug'),
+    sa.column('sort_name'), sa.column('book_count')
+)
+_book_authors = sa.table('book_authors', sa.column('book_id'), sa.column('author_id'), sa.column('position'))
+
+
+def _chunks(items):
+    items = list(items)
+    for i in range(0, len(items), CHUNK_SIZE):
+        yield items[i:i + CHUNK_SIZE]
+
+
+def _author_name_key(name):
+    decomposed = unicodedata.normalize('NFKD', name)
+    return ' '.join(''.join(char for char in decomposed if not unicodedata.combining(char)).casefold().split())
+
+
+def _split_author_names(authors):
+    names = {}
+    for name in (authors or '').split(','):
+        name = ' '.join(name.split())
+        if name:
+            names.setdefault(_author_name_key(name), name)
+    return list(names.values())
+
+
+def _author_slug(name):
+    return re.sub(r'\s+', '-', name.strip()).lower()
+
+
+def _author_sort_name(name):
+    return re.sub(r'^\W+', '', _author_name_key(name)) or _author_name_key(name)
+
+
+def _get_author_ids(connection, names_by_key):
+    author_ids = {}
+    for keys in _chunks(names_by_key):
+        author_ids.update(connection.execute(
+            sa.select(_authors.c.name_key, _authors.c.id).where(_authors.c.name_key.in_(keys))
+        ).all())
+    missing = [
+        {'name': name, 'name_key': key, 'slug': _author_slug(name), 'sort_name': _author_sort_name(name),
+         'book_count': 0}
+        for key, name in names_by_key.items() if key not in author_ids
+    ]
+    for chunk in _chunks(missing):
+        try:
+            with connection.begin_nested():
+                connection.execute(sa.insert(_authors), chunk)
+        except IntegrityError:
+            for values in chunk:
+                try:
+                    with connection.begin_nested():
+                        connection.execute(sa.insert(_authors), [values])
+                except IntegrityError:
+                    pass
+        author_ids.update(connection.execute(
+            sa.select(_authors.c.name_key, _authors.c.id)
+            .where(_authors.c.name_key.in_([values['name_key'] for values in chunk]))
+        ).all())
+    return author_ids
+
+
+def _link_book_authors(connection, book_authors):
+    """
+    Links books, given as {book_id: epub_metadata.authors}, to their authors. Returns the ids of the linked authors.
+    """
+    names_by_book = {book_id: _split_author_names(authors) for book_id, authors in book_authors.items()}
+    names_by_key = {_author_name_key(name): name for names in names_by_book.values() for name in names}
+    author_ids = _get_author_ids(connection, names_by_key)
+    links = [
+        {'book_id': book_id, 'author_id': author_ids[_author_name_key(name)], 'position': position}
+        for book_id, names in names_by_book.items()
+        for position, name in enumerate(names)
+    ]
+    for chunk in _chunks(links):
+        connection.execute(sa.insert(_book_authors), chunk)
+    return {link['author_id'] for link in links}
+
+
+def _refresh_book_counts(connection, author_ids):
+    book_count = (
+        sa.select(sa.func.count()).select_from(_book_authors)
+        .where(_book_authors.c.author_id == _authors.c.id).scalar_subquery()
+    )
+    for chunk in _chunks(author_ids):
+        connection.execute(sa.update(_authors).where(_authors.c.id.in_(chunk)).values(book_count=book_count))
+
+
+def upgrade() -> None:
+    op.create_table(
+        'authors',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('name_key', sa.String(length=255), nullable=False),
+        sa.Column('slug', sa.String(length=255), nullable=False),
+        sa.Column('sort_name', sa.String(length=255), nullable=False),
+        sa.Column('book_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_authors_name_key', 'authors', ['name_key'], unique=True)
+    op.create_index('ix_authors_slug', 'authors', ['slug'], unique=False)
+    op.create_index('ix_authors_sort_name', 'authors', ['sort_name', 'id'], unique=False)
+    op.create_table(
+        'book_authors',
+        sa.Column('book_id', sa.Integer(), nullable=False),
+        sa.Column('author_id', sa.Integer(), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('book_id', 'author_id')
+    )
+    op.create_index('ix_book_authors_author_book', 'book_authors', ['author_id', 'book_id'], unique=False)
+
+    connection = op.get_bind()
+    last_id = 0
+    all_author_ids = set()
+    while True:
+        rows = connection.execute(text("""
+                                       SELECT id, authors
+                                       FROM epub_metadata
+                                       WHERE id > :last_id
+                                       ORDER BY id
+                                       LIMIT :batch_size
+                                       """), {"last_id": last_id, "batch_size": BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        all_author_ids.update(_link_book_authors(connection, {row.id: row.authors for row in rows}))
+        last_id = rows[-1].id
+    _refresh_book_counts(connection, all_author_ids)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_book_authors_author_book', table_name='book_authors')
+    op.drop_table('book_authors')
+    op.drop_index('ix_authors_sort_name', table_name='authors')
+    op.drop_index('ix_authors_slug', table_name='authors')
+    op.drop_index('ix_authors_name_key', table_name='authors')
+    op.drop_table('authors')
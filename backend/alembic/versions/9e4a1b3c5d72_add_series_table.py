@@ -0,0 +1,155 @@
+"""Add series table
+
+Revision ID: 9e4a1b3c5d72
+Revises: 7c2d4e8f1a93
+Create Date: 2026-10-17 18:47:03.662904
+
+"""
+import re
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4a1b3c5d72'
+down_revision: Union[str, None] = '7c2d4e8f1a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+CHUNK_SIZE = 500
+
+# Frozen copies of the model helpers as of this revision, so later changes to models/ can't alter the migration
+_series = sa.table(
+    'series', sa.column('id'), sa.column('name'), sa.column('name_key'), sa.column('sort_name'),
+    sa.column('book_count'), sa.column('min_index'), sa.column('max_index'), sa.column('cover_book_id')
+)
+_epub_metadata = sa.table('epub_metadata', sa.column('id'), sa.column('series_id'), sa.column('seriesindex'))
+
+
+def _chunks(items):
+    items = list(items)
+    for i in range(0, len(items), CHUNK_SIZE):
+        yield items[i:i + CHUNK_SIZE]
+
+
+def _clean_series_name(name):
+    return ' '.join((name or '').split())
+
+
+def _series_name_key(name):
+    decomposed = unicodedata.normalize('NFKD', _clean_series_name(name))
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def _series_sort_name(name):
+    return re.sub(r'^\W+', '', _series_name_key(name)) or _series_name_key(name)
+
+
+def _get_series_ids(connection, names):
+    names_by_key = {}
+    for name in names:
+        if _clean_series_name(name):
+            names_by_key.setdefault(_series_name_key(name), _clean_series_name(name))
+    series_ids = {}
+    for keys in _chunks(names_by_key):
+        series_ids.update(connection.execute(
+            sa.select(_series.c.name_key, _series.c.id).where(_series.c.name_key.in_(keys))
+        ).all())
+    missing = [
+        {'name': name, 'name_key': key, 'sort_name': _series_sort_name(name), 'book_count': 0}
+        for key, name in names_by_key.items() if key not in series_ids
+    ]
+    for chunk in _chunks(missing):
+        try:
+            with connection.begin_nested():
+                connection.execute(sa.insert(_series), chunk)
+        except IntegrityError:
+            for values in chunk:
+                try:
+                    with connection.begin_nested():
+                        connection.execute(sa.insert(_series), [values])
+                except IntegrityError:
+                    pass
+        series_ids.update(connection.execute(
+            sa.select(_series.c.name_key, _series.c.id)
+            .where(_series.c.name_key.in_([values['name_key'] for values in chunk]))
+        ).all())
+    return series_ids
+
+
+def _refresh_series(connection, series_ids):
+    series_ids = {series_id for series_id in series_ids if series_id is not None}
+    books = _epub_metadata.c
+
+    def _aggregate(expression):
+        return sa.select(expression).where(books.series_id == _series.c.id).scalar_subquery()
+
+    cover_book = (
+        sa.select(books.id).where(books.series_id == _series.c.id)
+        .order_by(books.seriesindex, books.id).limit(1).scalar_subquery()
+    )
+    for chunk in _chunks(series_ids):
+        connection.execute(sa.update(_series).where(_series.c.id.in_(chunk)).values(
+            book_count=_aggregate(sa.func.count(books.id)),
+            min_index=_aggregate(sa.func.min(books.seriesindex)),
+            max_index=_aggregate(sa.func.max(books.seriesindex)),
+            cover_book_id=cover_book
+        ))
+        connection.execute(sa.delete(_series).where(_series.c.id.in_(chunk), _series.c.book_count == 0))
+
+
+def upgrade() -> None:
+    op.create_table(
+        'series',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('name_key', sa.String(length=255), nullable=False),
+        sa.Column('sort_name', sa.String(length=255), nullable=False),
+        sa.Column('book_count', sa.Integer(), nullable=False),
+        sa.Column('min_index', sa.Float(), nullable=True),
+        sa.Column('max_index', sa.Float(), nullable=True),
+        sa.Column('cover_book_id', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_series_name_key', 'series', ['name_key'], unique=True)
+    op.create_index('ix_series_sort_name', 'series', ['sort_name', 'id'], unique=False)
+    op.add_column('epub_metadata', sa.Column('series_id', sa.Integer(), nullable=True))
+    op.create_index('ix_epub_metadata_series_id', 'epub_metadata', ['series_id', 'seriesindex'], unique=False)
+
+    connection = op.get_bind()
+    last_id = 0
+    all_series_ids = set()
+    while True:
+        rows = connection.execute(text("""
+                                       SELECT id, series
+                                       FROM epub_metadata
+                                       WHERE id > :last_id
+                                       ORDER BY id
+                                       LIMIT :batch_size
+                                       """), {"last_id": last_id, "batch_size": BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        series_ids = _get_series_ids(connection, [row.series for row in rows])
+        updates = [
+            {"id": row.id, "series_id": series_ids[_series_name_key(row.series)]}
+            for row in rows if _series_name_key(row.series) in series_ids
+        ]
+        if updates:
+            connection.execute(text("UPDATE epub_metadata SET series_id = :series_id WHERE id = :id"), updates)
+        all_series_ids.update(series_ids.values())
+        last_id = rows[-1].id
+    _refresh_series(connection, all_series_ids)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_epub_metadata_series_id', table_name='epub_metadata')
+    op.drop_column('epub_metadata', 'series_id')
+    op.drop_index('ix_series_sort_name', table_name='series')
+    op.drop_index('ix_series_name_key', table_name='series')
+    op.drop_table('series')
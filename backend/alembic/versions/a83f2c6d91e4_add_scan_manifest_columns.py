@@ -0,0 +1,32 @@
+"""Add scan manifest columns
+
+Revision ID: a83f2c6d91e4
+Revises: 62c31a6df1a0
+Create Date: 2026-10-17 09:12:41.382215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a83f2c6d91e4'
+down_revision: Union[str, None] = '62c31a6df1a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('epub_metadata', sa.Column('file_size', sa.BigInteger(), nullable=True))
+    op.add_column('epub_metadata', sa.Column('file_mtime_ns', sa.BigInteger(), nullable=True))
+    op.add_column('epub_metadata', sa.Column('file_inode', sa.BigInteger(), nullable=True))
+    op.add_column('epub_metadata', sa.Column('file_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('epub_metadata', 'file_hash')
+    op.drop_column('epub_metadata', 'file_inode')
+    op.drop_column('epub_metadata', 'file_mtime_ns')
+    op.drop_column('epub_metadata', 'file_size')
@@ -0,0 +1,26 @@
+"""Add users token_version column
+
+Revision ID: d4f7a2b9c6e1
+Revises: 9e4a1b3c5d72
+Create Date: 2026-10-17 21:06:18.514377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f7a2b9c6e1'
+down_revision: Union[str, None] = '9e4a1b3c5d72'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
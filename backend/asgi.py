@@ -1,7 +1,9 @@
 from asgiref.wsgi import WsgiToAsgi
+from functions.sendfile import SendfileMiddleware
 
 # Import the existing Flask WSGI app
 from main import app as flask_app
 
-# Expose an ASGI-compatible app for uvicorn
-asgi_app = WsgiToAsgi(flask_app)
+# Expose an ASGI-compatible app for uvicorn. Files returned with send_file, such as downloads, books
+# and covers, are streamed by SendfileMiddleware so they don't hold up the WSGI bridge.
+asgi_app = SendfileMiddleware(WsgiToAsgi(flask_app), flask_app)
@@ -11,6 +11,9 @@ def make_celery():
         include=['functions.tasks.scan']  # Include your task modules
     )
     scan_interval = config.PERIODIC_SCAN_INTERVAL
+    if config.WATCHER_ENABLED:
+        # The watcher picks up changes as they happen; the periodic scan only reconciles missed events
+        scan_interval = config.WATCHER_RECONCILE_INTERVAL
     try:
         scan_interval = int(scan_interval)
     except ValueError:
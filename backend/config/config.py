@@ -42,6 +42,9 @@ class Config:
         self.ADMIN_RESET = str_to_bool(os.getenv('ADMIN_RESET', False))
         self.CF_ACCESS_AUTH = str_to_bool(os.getenv('CF_ACCESS_AUTH', False))
         self.ALLOW_UNAUTHENTICATED = str_to_bool(os.getenv('ALLOW_UNAUTHENTICATED', False))
+        self.AUTH_CACHE_TTL = int(os.getenv('AUTH_CACHE_TTL', 5))
+        self.BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))
+        self.PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
         self.WRITE_TO_EPUB = str_to_bool(os.getenv('WRITE_TO_EPUB', False))
         self.REQUESTS_ENABLED = str_to_bool(os.getenv('REQUESTS_ENABLED', True))
 
@@ -58,14 +61,29 @@ class Config:
         self.REDIS_PASSWORD = os.getenv('REDIS_PASSWORD', "").strip()
         self.REDIS_DB = os.getenv('REDIS_DB', 0)
         self.REDIS_LOCK_DB = os.getenv('REDIS_LOCK_DB', 6)
+        self.REDIS_CACHE_DB = os.getenv('REDIS_CACHE_DB', 4)
 
         self.RATE_LIMITER_ENABLED = str_to_bool(os.getenv('RATE_LIMITER_ENABLED', True))
         self.BACKEND_RATE_LIMIT = os.getenv('BACKEND_RATE_LIMIT', 300)
 
+        self.RESPONSE_CACHE_ENABLED = str_to_bool(os.getenv('RESPONSE_CACHE_ENABLED', True))
+        self.RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', 3600))
+
         self.SCHEDULER_ENABLED = str_to_bool(os.getenv('SCHEDULER_ENABLED', True))
         self.OPDS_ENABLED = str_to_bool(os.getenv('OPDS_ENABLED', False))
 
         self.PERIODIC_SCAN_INTERVAL = os.getenv('PERIODIC_SCAN_INTERVAL', 10)
+        self.SCAN_WORKERS = int(os.getenv('SCAN_WORKERS', 0))
+        self.SCAN_BATCH_SIZE = int(os.getenv('SCAN_BATCH_SIZE', 500))
+        self.SCAN_EXCLUDE = [pattern.strip() for pattern in os.getenv('SCAN_EXCLUDE', '').split(',') if pattern.strip()]
+        self.SCAN_PRUNE_UNCHANGED_DIRS = str_to_bool(os.getenv('SCAN_PRUNE_UNCHANGED_DIRS', False))
+
+        self.WATCHER_ENABLED = str_to_bool(os.getenv('WATCHER_ENABLED', False))
+        self.WATCHER_POLLING = str_to_bool(os.getenv('WATCHER_POLLING', False))
+        self.WATCHER_POLL_INTERVAL = int(os.getenv('WATCHER_POLL_INTERVAL', 30))
+        self.WATCHER_DEBOUNCE = float(os.getenv('WATCHER_DEBOUNCE', 2))
+        self.WATCHER_MAX_DELAY = float(os.getenv('WATCHER_MAX_DELAY', 30))
+        self.WATCHER_RECONCILE_INTERVAL = int(os.getenv('WATCHER_RECONCILE_INTERVAL', 360))
 
         self.DB_TYPE = os.getenv('DB_TYPE', 'sqlite').lower()
         self.DB_HOST = os.getenv('DB_HOST', 'localhost')
@@ -73,6 +91,11 @@ class Config:
         self.DB_NAME = os.getenv('DB_NAME', 'epub_library')
         self.DB_USER = os.getenv('DB_USER', 'root')
         self.DB_PASSWORD = os.getenv('DB_PASSWORD', None)
+        self.DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+        self.DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+        self.DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 30))
+        self.DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 0))
+        self.DB_POOL_PRE_PING = str_to_bool(os.getenv('DB_POOL_PRE_PING', True))
 
     def redis_db_uri(self, rdb=None):
         if rdb is None:
@@ -7,6 +7,11 @@ ENABLE_HTTPS="${ENABLE_HTTPS:-false}"
 SSL_CERT_FILE="/ssl/${SSL_CERT_FILE:-}"
 SSL_KEY_FILE="/ssl/${SSL_KEY_FILE:-}"
 CELERY_LOG_LEVEL="${CELERY_LOG_LEVEL:-info}"
+WEB_WORKERS="${WEB_WORKERS:-1}"
+
+if [ "$WEB_WORKERS" = "auto" ]; then
+    WEB_WORKERS="$(nproc)"
+fi
 
 source .venv/bin/activate
 
@@ -18,11 +23,11 @@ fi
 
 if [ "$ENABLE_HTTPS" = "true" ]; then
     if [ -f "$SSL_CERT_FILE" ] && [ -f "$SSL_KEY_FILE" ]; then
-        echo "Starting uvicorn (single worker) with HTTPS..."
+        echo "Starting uvicorn ($WEB_WORKERS worker(s)) with HTTPS..."
         uvicorn asgi:asgi_app \
             --host 0.0.0.0 \
             --port "$APP_PORT" \
-            --workers 1 \
+            --workers "$WEB_WORKERS" \
             --ssl-certfile "$SSL_CERT_FILE" \
             --ssl-keyfile "$SSL_KEY_FILE" &
     else
@@ -30,12 +35,17 @@ if [ "$ENABLE_HTTPS" = "true" ]; then
         exit 1
     fi
 else
-    echo "Starting uvicorn (single worker) without HTTPS..."
-    uvicorn asgi:asgi_app --host 0.0.0.0 --port "$APP_PORT" --workers 1 &
+    echo "Starting uvicorn ($WEB_WORKERS worker(s)) without HTTPS..."
+    uvicorn asgi:asgi_app --host 0.0.0.0 --port "$APP_PORT" --workers "$WEB_WORKERS" &
 fi
 
 echo "Starting Celery and Celery Beat..."
 celery -A celery_app.celery worker --loglevel="$CELERY_LOG_LEVEL" &
 celery -A celery_app.celery beat --loglevel="$CELERY_LOG_LEVEL" &
 
+if [ "${WATCHER_ENABLED:-false}" = "true" ]; then
+    echo "Starting library watcher..."
+    python watcher.py &
+fi
+
 wait
\ No newline at end of file
@@ -2,6 +2,7 @@ from config.config import config
 from routes.books import books_bp
 from routes.media import media_bp
 from routes.authors import authors_bp
+from routes.series import series_bp
 from routes.auth import auth_bp
 from routes.admin import admin_bp
 from routes.users import users_bp
@@ -13,6 +14,7 @@ def register_blueprints(app):
     app.register_blueprint(books_bp)
     app.register_blueprint(media_bp)
     app.register_blueprint(authors_bp)
+    app.register_blueprint(series_bp)
     app.register_blueprint(auth_bp)
     app.register_blueprint(admin_bp)
     app.register_blueprint(users_bp)
@@ -1,9 +1,33 @@
+import os
+from sqlalchemy import select
 from models.epub_metadata import EpubMetadata
+from models.authors import Authors, BookAuthors, author_slug
 from models.progress_mapping import ProgressMapping
 from functions.db import get_session
 from models.users import Users
 from config.logger import logger
 
+# Listing order of the catalog; leads with the author_title_index_series_idx columns, with id as a unique tiebreaker
+BOOK_SORT_COLUMNS = (
+    EpubMetadata.authors,
+    EpubMetadata.series,
+    EpubMetadata.seriesindex,
+    EpubMetadata.title,
+    EpubMetadata.id
+)
+
+
+def author_books_filter(author_name):
+    """
+    Condition matching the books of the author with this name or URL slug, resolved through the book_authors index.
+    """
+    return EpubMetadata.id.in_(
+        select(BookAuthors.book_id)
+        .join(Authors, Authors.id == BookAuthors.author_id)
+        .where(Authors.slug == author_slug(author_name))
+    )
+
+
 def generate_session_id():
     import uuid
     return str(uuid.uuid4())
@@ -11,9 +35,26 @@ def generate_session_id():
 
 def get_book_progress_record(token_state, book_identifier, session):
     token_user_id = token_state.get("user_id")
-    user = session.query(Users).filter_by(id=token_user_id).first()
-    book = session.query(EpubMetadata).filter_by(identifier=book_identifier).first()
-    return session.query(ProgressMapping).filter_by(user_id=user.id, book_id=book.id).first()
+    return (
+        session.query(ProgressMapping)
+        .join(EpubMetadata, ProgressMapping.book_id == EpubMetadata.id)
+        .filter(ProgressMapping.user_id == token_user_id, EpubMetadata.identifier == book_identifier)
+        .first()
+    )
+
+
+def get_book_progress_records(user_id, book_ids, session):
+    """
+    Returns the user's progress records for a list of book ids as {book_id: ProgressMapping}, using a single query.
+    Books the user has no progress for are left out.
+    """
+    if not book_ids:
+        return {}
+    records = session.query(ProgressMapping).filter(
+        ProgressMapping.user_id == user_id,
+        ProgressMapping.book_id.in_(book_ids)
+    ).all()
+    return {record.book_id: record for record in records}
 
 
 def construct_new_book_progress_record(data):
@@ -61,3 +102,15 @@ def update_book_progress_state(token_state, book_identifier, data):
         return False, f"Error updating progress state: {str(e)}"
     finally:
         session.close()
+
+
+def get_cover_url(identifier, cover_image_path):
+    """
+    Returns the URL of a book's cover. Stored covers are addressed by their token filename, which is
+    new every time a cover is replaced, so these URLs can be cached indefinitely.
+    Books without a stored cover fall back to the identifier URL, which serves the placeholder.
+    """
+    if not cover_image_path:
+        return f"/api/covers/{identifier}"
+    cover_token = os.path.splitext(os.path.basename(cover_image_path))[0]
+    return f"/api/covers/file/{cover_token}.webp"
@@ -0,0 +1,192 @@
+import hashlib
+import time
+from datetime import datetime, timezone
+from functools import wraps
+from flask import current_app, request, make_response
+from redis import RedisError
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from models.epub_metadata import EpubMetadata
+from models.progress_mapping import ProgressMapping
+from functions.extensions import cache
+from functions.utils import get_main_redis_client
+from config.config import config
+from config.logger import logger
+
+CATALOG_GENERATION_KEY = "catalog_generation"
+PROGRESS_VERSION_KEY = "progress_version:{user_id}"
+
+
+def _modified_at_key(key):
+    return f"{key}:modified_at"
+
+
+def _get_counters(keys):
+    """
+    Returns (value, modified_at) for each counter, with modified_at in seconds since the epoch or None if
+    the counter has never moved. Returns None if Redis is unavailable.
+    """
+    redis_client = get_main_redis_client()
+    if not redis_client:
+        return None
+    try:
+        values = redis_client.mget([*keys, *(_modified_at_key(key) for key in keys)])
+        return [
+            (int(value or 0), int(modified_at) if modified_at else None)
+            for value, modified_at in zip(values[:len(keys)], values[len(keys):])
+        ]
+    except (RedisError, ValueError) as e:
+        logger.debug(f"_get_counters: Could not read {', '.join(keys)}: {e}")
+        return None
+
+
+def _bump_counters(keys):
+    redis_client = get_main_redis_client()
+    if not redis_client or not keys:
+        return
+    try:
+        now = int(time.time())
+        pipe = redis_client.pipeline()
+        for key in keys:
+            pipe.incr(key)
+            pipe.set(_modified_at_key(key), now)
+        pipe.execute()
+    except RedisError as e:
+        logger.warning(f"_bump_counters: Could not update {', '.join(keys)}: {e}")
+
+
+def get_catalog_generation():
+    """
+    Returns the catalog generation, a counter that moves on every committed change to the library.
+    Returns None if Redis is unavailable, in which case responses must not be treated as cacheable.
+    """
+    counters = _get_counters([CATALOG_GENERATION_KEY])
+    return counters[0][0] if counters else None
+
+
+def bump_catalog_generation():
+    _bump_counters([CATALOG_GENERATION_KEY])
+
+
+def get_progress_version(user_id):
+    """
+    Returns a counter that moves whenever the user's reading progress, finished or favorite flags change.
+    """
+    counters = _get_counters([PROGRESS_VERSION_KEY.format(user_id=user_id)])
+    return counters[0][0] if counters else None
+
+
+def mark_catalog_changed(session):
+    """
+    Bumps the catalog generation once session commits. Bulk statements bypass the ORM events, so
+    code that writes epub_metadata with session.execute() calls this itself.
+    """
+    session.info['catalog_changed'] = True
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_catalog_changes(session, flush_context):
+    for target in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(target, EpubMetadata):
+            mark_catalog_changed(session)
+        elif isinstance(target, ProgressMapping):
+            session.info.setdefault('progress_changed_users', set()).add(target.user_id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_on_commit(session):
+    keys = [PROGRESS_VERSION_KEY.format(user_id=user_id) for user_id in session.info.pop('progress_changed_users', ())]
+    if session.info.pop('catalog_changed', False):
+        keys.append(CATALOG_GENERATION_KEY)
+    _bump_counters(keys)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_on_rollback(session):
+    session.info.pop('catalog_changed', None)
+    session.info.pop('progress_changed_users', None)
+
+
+def _response_validators(user_specific, token_state):
+    """
+    Returns the ETag and Last-Modified time of the current request's response, or (None, None) if the
+    counters they derive from can't be read.
+    """
+    keys = [CATALOG_GENERATION_KEY]
+    user_id = None
+    if user_specific and token_state not in (None, "no_token"):
+        user_id = token_state.get("user_id")
+        keys.append(PROGRESS_VERSION_KEY.format(user_id=user_id))
+    counters = _get_counters(keys)
+    if counters is None:
+        return None, None
+    versions = [value for value, _ in counters]
+    modified_times = [modified_at for _, modified_at in counters if modified_at is not None]
+    parts = (request.host_url, request.path, sorted(request.args.items(multi=True)), user_id, versions[1:])
+    digest = hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()[:24]
+    last_modified = datetime.fromtimestamp(max(modified_times), timezone.utc) if modified_times else None
+    return f"{versions[0]}-{digest}", last_modified
+
+
+def _is_not_modified(etag, last_modified):
+    # If-Modified-Since is only consulted when the client sent no ETag, as RFC 9110 requires
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if_modified_since = request.if_modified_since
+    return bool(last_modified and if_modified_since and last_modified <= if_modified_since)
+
+
+def set_catalog_validators(response, etag, last_modified=None):
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    # Clients may keep the response, but must check it is still current before using it
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def _cache_get(key):
+    try:
+        return cache.get(key)
+    except Exception as e:
+        logger.debug(f"_cache_get: Response cache read failed for {key}: {e}")
+        return None
+
+
+def _cache_set(key, value):
+    try:
+        cache.set(key, value)
+    except Exception as e:
+        logger.debug(f"_cache_set: Response cache write failed for {key}: {e}")
+
+
+def catalog_response(user_specific=False):
+    """
+    Caches the responses of a catalog endpoint in Redis, and answers conditional requests
+    (If-None-Match, or If-Modified-Since) with 304 before the view runs. Responses are keyed on the
+    host, path, sorted query arguments and catalog generation, so any committed change to the
+    library makes every cached response stale.
+
+    user_specific views also key on the user and their progress version. Apply below the
+    authentication decorator.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            etag, last_modified = _response_validators(user_specific, kwargs.get("token_state"))
+            if etag is None:
+                return func(*args, **kwargs)
+            if _is_not_modified(etag, last_modified):
+                return set_catalog_validators(current_app.response_class(status=304), etag, last_modified)
+            cache_key = f"{request.endpoint}:{etag}"
+            cached = _cache_get(cache_key)
+            if cached is not None:
+                response = current_app.response_class(cached["body"], mimetype=cached["mimetype"])
+                return set_catalog_validators(response, etag, last_modified)
+            response = make_response(func(*args, **kwargs))
+            if response.status_code != 200 or response.direct_passthrough:
+                return response
+            _cache_set(cache_key, {"body": response.get_data(), "mimetype": response.mimetype})
+            return set_catalog_validators(response, etag, last_modified)
+        return wrapper
+    return decorator
@@ -1,7 +1,14 @@
-from sqlalchemy import create_engine
+import os
+import threading
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from config.config import config
 
+_engines = {}
+_session_factories = {}
+_registry_lock = threading.Lock()
+
+
 def get_database_url():
     """
     Construct the SQLAlchemy database URL based on the configuration.
@@ -18,15 +25,78 @@ def get_database_url():
         raise ValueError(f"Unsupported DB_TYPE: {config.DB_TYPE}")
 
 
+def get_engine_options():
+    """
+    Pool settings for the configured DB_TYPE. MySQL drops idle connections after wait_timeout,
+    so connections are recycled well before that; SQLite connections never go stale.
+    pysqlite's own transaction handling is switched off for SQLite, see _begin_sqlite_transaction.
+    """
+    options = {
+        'pool_size': config.DB_POOL_SIZE,
+        'max_overflow': config.DB_MAX_OVERFLOW,
+        'pool_timeout': config.DB_POOL_TIMEOUT,
+        'pool_pre_ping': config.DB_POOL_PRE_PING,
+    }
+    if config.DB_TYPE == 'mysql':
+        options['pool_recycle'] = config.DB_POOL_RECYCLE or 3600
+    elif config.DB_TYPE == 'postgres':
+        options['pool_recycle'] = config.DB_POOL_RECYCLE or 1800
+    else:
+        options['pool_pre_ping'] = False
+        options['connect_args'] = {'isolation_level': None}
+        if config.DB_POOL_RECYCLE:
+            options['pool_recycle'] = config.DB_POOL_RECYCLE
+    return options
+
+
+def _begin_sqlite_transaction(connection):
+    # pysqlite only starts a transaction before DML, so a SAVEPOINT issued first opened one itself and
+    # releasing it committed everything written so far. With the driver in autocommit mode, every
+    # transaction is started here instead, so savepoints nest inside it.
+    connection.exec_driver_sql("BEGIN")
+
+
 def get_engine():
+    """
+    Returns the process-wide engine for the configured database, creating it on first use.
+    """
     database_url = get_database_url()
-    return create_engine(database_url)
+    engine = _engines.get(database_url)
+    if engine is not None:
+        return engine
+    with _registry_lock:
+        engine = _engines.get(database_url)
+        if engine is None:
+            engine = create_engine(database_url, **get_engine_options())
+            if engine.dialect.name == 'sqlite':
+                event.listen(engine, 'begin', _begin_sqlite_transaction)
+            _engines[database_url] = engine
+            _session_factories[database_url] = sessionmaker(bind=engine)
+    return engine
 
 
 def get_session():
     """
-    Provides a new database session (connection).
+    Provides a new database session (connection) checked out from the shared engine pool.
     """
-    engine = get_engine()
-    Session = sessionmaker(bind=engine)
+    database_url = get_database_url()
+    Session = _session_factories.get(database_url)
+    if Session is None:
+        get_engine()
+        Session = _session_factories[database_url]
     return Session()
+
+
+def _reset_engines_after_fork():
+    # Pooled connections inherited from the parent process must never be used (or closed) by the child,
+    # so the pools are dropped without closing the underlying sockets (e.g. Celery prefork workers).
+    global _registry_lock
+    _registry_lock = threading.Lock()
+    for engine in _engines.values():
+        engine.dispose(close=False)
+    _engines.clear()
+    _session_factories.clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_engines_after_fork)
@@ -1,3 +1,4 @@
+from flask_caching import Cache
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_cors import CORS
@@ -14,6 +15,24 @@ def setup_limiter(app):
     return limiter
 
 
+# Rendered responses of catalog endpoints; see functions.catalog.catalog_response
+cache = Cache()
+
+
+def setup_cache(app):
+    # Tests patch the views a cached response would skip, so responses are never cached under test
+    if config.RESPONSE_CACHE_ENABLED and config.ENVIRONMENT != "test":
+        cache.init_app(app, config={
+            "CACHE_TYPE": "RedisCache",
+            "CACHE_REDIS_URL": config.redis_db_uri(config.REDIS_CACHE_DB),
+            "CACHE_KEY_PREFIX": "response:",
+            "CACHE_DEFAULT_TIMEOUT": config.RESPONSE_CACHE_TIMEOUT,
+        })
+    else:
+        cache.init_app(app, config={"CACHE_TYPE": "NullCache"})
+    return cache
+
+
 def setup_cors(app):
     allowed_origin = config.BASE_URL
     CORS(app, resources={
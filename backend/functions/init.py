@@ -48,7 +48,12 @@ def init_uploads(app):
                 raise FileExistsError(f"Incorrect symlink at {link_path}")
         elif os.path.exists(link_path):
             raise FileExistsError(f"File or directory exists at {link_path} and is not a symlink")
-        os.symlink(config.UPLOADS_DIRECTORY, link_path)
+        try:
+            os.symlink(config.UPLOADS_DIRECTORY, link_path)
+        except FileExistsError:
+            # Another web worker booting at the same time created it first
+            if not os.path.islink(link_path) or os.readlink(link_path) != config.UPLOADS_DIRECTORY:
+                raise FileExistsError(f"Incorrect symlink at {link_path}")
         app.config["UPLOADS_ENABLED"] = True
     except (OSError, FileExistsError) as e:
         logger.warning(f"{e}. Disabling uploads feature.")
@@ -3,27 +3,142 @@ import re
 import ebookmeta
 import secrets
 import hashlib
-from models.epub_metadata import EpubMetadata
+import itertools
+import fnmatch
+import multiprocessing
+import time
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from models.epub_metadata import EpubMetadata, build_search_text
+from models.authors import set_book_authors
+from models.series import get_series_ids, refresh_series, series_name_key
 from models.progress_mapping import ProgressMapping
 from models.users import Users
 from functions.db import get_session
 from config.logger import logger
 from config.config import config
-from sqlalchemy import select
+from sqlalchemy import select, insert, update
 from sqlalchemy.exc import IntegrityError
 from tempfile import NamedTemporaryFile
+from datetime import datetime, timezone
 import pyvips
-from functions.utils import update_redis_cache, invalidate_redis_cache
+from functions.utils import update_redis_cache, invalidate_redis_cache, get_redis_hash, replace_redis_hash
+from functions.catalog import mark_catalog_changed
+
+# Below this many files to parse, starting a process pool costs more than it saves
+PARALLEL_SCAN_MIN_FILES = 16
+
+
+def is_excluded(relative_path, name, exclude_patterns):
+    relative_path = relative_path.replace(os.sep, '/')
+    return any(fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(relative_path, pattern) for pattern in exclude_patterns)
+
+
+def is_path_excluded(relative_path, exclude_patterns=None):
+    """
+    Whether a full scan skips relative_path, because it or one of the directories above it matches exclude_patterns
+    (default config.SCAN_EXCLUDE).
+    """
+    if exclude_patterns is None:
+        exclude_patterns = config.SCAN_EXCLUDE
+    parts = os.path.normpath(relative_path).split(os.sep)
+    return any(is_excluded(os.path.join(*parts[:i]), parts[i - 1], exclude_patterns) for i in range(1, len(parts) + 1))
+
+
+def walk_epubs(base_directory, exclude_patterns=None, known_dir_mtimes=None, dir_mtimes=None, stat_files=True,
+               start_directory=None):
+    """
+    Lazily yields (path, stat_result) for every .epub file (any case) under base_directory, or only under
+    start_directory if given. Paths are matched against exclude_patterns and known_dir_mtimes relative to
+    base_directory either way.
+    Uses os.scandir so directory entries are classified without extra stat calls, and the file stat
+    comes from the DirEntry. Symlinked directories are not followed, as with os.walk, so the _uploads link
+    to UPLOADS_DIRECTORY doesn't pick up uploads that are still pending. Paths matching any of exclude_patterns
+    (default config.SCAN_EXCLUDE) are skipped along with everything below them.
+
+    known_dir_mtimes maps relative directory paths to the mtime_ns recorded by a previous walk; files in a
+    directory whose mtime is unchanged are yielded with stat_result None instead of being stat'ed.
+    If dir_mtimes is given, the current mtime_ns of every visited directory is recorded in it.
+    With stat_files=False every file is yielded with stat_result None.
+    """
+    if exclude_patterns is None:
+        exclude_patterns = config.SCAN_EXCLUDE
+    known_dir_mtimes = known_dir_mtimes or {}
+    stack = [start_directory or base_directory]
+    while stack:
+        directory = stack.pop()
+        try:
+            dir_stat = os.stat(directory)
+        except OSError as e:
+            logger.warning(f"Unable to read directory '{directory}': {e}")
+            continue
+        relative_dir = os.path.relpath(directory, base_directory)
+        if dir_mtimes is not None:
+            dir_mtimes[relative_dir] = dir_stat.st_mtime_ns
+        unchanged_dir = known_dir_mtimes.get(relative_dir) == dir_stat.st_mtime_ns
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if exclude_patterns and is_excluded(os.path.relpath(entry.path, base_directory), entry.name, exclude_patterns):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name.lower().endswith('.epub') and entry.is_file():
+                            yield entry.path, entry.stat() if stat_files and not unchanged_dir else None
+                    except OSError as e:
+                        logger.warning(f"Unable to read '{entry.path}': {e}")
+        except OSError as e:
+            logger.warning(f"Unable to read directory '{directory}': {e}")
 
 
 def find_epubs(base_directory):
-    epubs = []
-    for root, dirs, files in os.walk(base_directory):
-        for file in files:
-            if file.endswith('.epub'):
-                full_path = os.path.join(root, file)
-                epubs.append(full_path)
-    return epubs
+    return (path for path, _ in walk_epubs(base_directory))
+
+
+def get_file_stat(epub_path, stat_result=None):
+    """
+    Returns the scan manifest fields (size, mtime and inode) for a file.
+    """
+    if stat_result is None:
+        stat_result = os.stat(epub_path)
+    return {
+        'file_size': stat_result.st_size,
+        'file_mtime_ns': stat_result.st_mtime_ns,
+        # st_ino is unsigned; keep it within a signed BIGINT column
+        'file_inode': stat_result.st_ino & 0x7FFFFFFFFFFFFFFF
+    }
+
+
+def get_file_hash(epub_path, file_size, block_size=65536):
+    """
+    Returns a content hash built from the size and the first and last blocks of a file.
+    Cheap enough to compute for every new or changed file, and stable across moves between filesystems.
+    """
+    digest = hashlib.blake2b(str(file_size).encode('ascii'), digest_size=32)
+    with open(epub_path, 'rb') as f:
+        digest.update(f.read(block_size))
+        if file_size > block_size:
+            f.seek(max(file_size - block_size, block_size))
+            digest.update(f.read(block_size))
+    return digest.hexdigest()
+
+
+def get_file_manifest(epub_path):
+    """
+    Returns the full scan manifest (stat fields and content hash) for a file.
+    """
+    file_stat = get_file_stat(epub_path)
+    file_stat['file_hash'] = get_file_hash(epub_path, file_stat['file_size'])
+    return file_stat
+
+
+def manifest_matches(record, file_stat):
+    return (
+        record.file_size == file_stat['file_size']
+        and record.file_mtime_ns == file_stat['file_mtime_ns']
+        and record.file_inode == file_stat['file_inode']
+    )
 
 
 def get_metadata(epub_path, base_directory):
@@ -115,10 +230,19 @@ def extract_metadata(epub_path):
     return book_meta
 
 
+def remove_db_entries(session, records):
+    for record in records:
+        session.query(ProgressMapping).filter(ProgressMapping.book_id == record.id).delete(synchronize_session=False)
+        session.delete(record)
+        invalidate_redis_cache(record.identifier)
+        logger.debug(f"Removed DB entry for identifier={record.identifier}, Path: {record.relative_path}")
+
+
 def remove_missing_files(session, db_identifiers, filesystem_identifiers):
     """
     Deletes database records corresponding to files missing in the filesystem, and removes the associated DB entry from ProgressMapping.
     Excludes manually uploaded files by checking if they exist in the uploads directory.
+    Returns the number of records removed.
     """
     missing_files = db_identifiers - filesystem_identifiers
     if missing_files:
@@ -133,18 +257,15 @@ def remove_missing_files(session, db_identifiers, filesystem_identifiers):
                     f"Skipping deletion of existing file not found in scan: {result.identifier} (path: {result.relative_path})")
                 continue
             files_to_delete.append(result)
-        for result in files_to_delete:
-            mapping_records = session.query(ProgressMapping).filter(ProgressMapping.book_id == result.id).all()
-            for record in mapping_records:
-                session.delete(record)
-            session.delete(result)
-            invalidate_redis_cache(result.identifier)
+        remove_db_entries(session, files_to_delete)
         if files_to_delete:
             logger.debug(
                 f"Removed {len(files_to_delete)} records from DB as the files are truly missing from filesystem.")
         if uploaded_files_skipped > 0:
             logger.debug(
                 f"Skipped deletion of {uploaded_files_skipped} files that exist but weren't found in filesystem scan.")
+        return len(files_to_delete)
+    return 0
 
 
 def remove_missing_user_progress(session):
@@ -152,32 +273,217 @@ def remove_missing_user_progress(session):
     session.query(ProgressMapping).filter(~ProgressMapping.user_id.in_(valid_users_subquery)).delete(synchronize_session=False)
 
 
-def add_new_db_entry(session, unique_id, metadata):
+def build_db_entry_values(unique_id, metadata):
     fallback_identifier = unique_id.strip() or metadata['relative_path']
     cover_image_path = metadata['cover_image_path'].as_posix() if metadata['cover_image_path'] is not None else None
-    new_entry = EpubMetadata(
-        identifier=fallback_identifier,
-        title=metadata['title'],
-        authors=', '.join(metadata['authors']),
-        series=metadata['series'],
-        seriesindex=metadata['seriesindex'],
-        relative_path=metadata['relative_path'],
-        cover_image_path=cover_image_path
-    )
-    session.add(new_entry)
+    authors = ', '.join(metadata['authors'])
+    return {
+        'identifier': fallback_identifier,
+        'title': metadata['title'],
+        'authors': authors,
+        'series': metadata['series'],
+        'seriesindex': metadata['seriesindex'],
+        'relative_path': metadata['relative_path'],
+        'cover_image_path': cover_image_path,
+        'file_size': metadata.get('file_size'),
+        'file_mtime_ns': metadata.get('file_mtime_ns'),
+        'file_inode': metadata.get('file_inode'),
+        'file_hash': metadata.get('file_hash'),
+        # Bulk inserts skip the ORM events that normally fill this in
+        'search_text': build_search_text(metadata['title'], authors, metadata['series'])
+    }
+
+
+def add_new_db_entry(session, unique_id, metadata):
+    new_entry = EpubMetadata(**build_db_entry_values(unique_id, metadata))
     try:
-        session.flush()
+        with session.begin_nested():
+            session.add(new_entry)
         logger.debug(f"Stored new metadata in DB for identifier={new_entry.identifier}")
         return True
     except IntegrityError:
         logger.warning(f"Duplicate entry skipped for identifier={unique_id}")
-        session.rollback()
         return False
 
 
+class ScanProgress:
+    """
+    Counts what a scan did and how long each phase took. Phases are timed exclusively: time spent in a
+    phase nested inside another is only charged to the inner one. Parse and cover encode timings come from
+    the worker processes, so with several workers they add up to more than the wall-clock time.
+    If report is given it is called with as_dict() at most every report_interval seconds.
+    """
+    COUNTERS = ('discovered', 'parsed', 'skipped', 'inserted', 'updated', 'removed', 'duplicates', 'covers', 'errors')
+    PHASES = ('walk', 'parse', 'cover_encode', 'cover_write', 'db_write', 'cache_update')
+
+    def __init__(self, report=None, report_interval=2.0):
+        self.counts = dict.fromkeys(self.COUNTERS, 0)
+        self.timings = dict.fromkeys(self.PHASES, 0.0)
+        self.report = report
+        self.report_interval = report_interval
+        self.started_at = time.perf_counter()
+        self.last_report_at = 0.0
+        self._stack = []
+        self._phase_started_at = None
+
+    def _charge_current_phase(self, now):
+        if self._stack:
+            self.timings[self._stack[-1]] += now - self._phase_started_at
+        self._phase_started_at = now
+
+    @contextmanager
+    def phase(self, name):
+        self._charge_current_phase(time.perf_counter())
+        self._stack.append(name)
+        try:
+            yield
+        finally:
+            self._charge_current_phase(time.perf_counter())
+            self._stack.pop()
+
+    def timed(self, iterable, name):
+        """Wraps an iterator so the time spent producing each item is charged to phase name."""
+        iterator = iter(iterable)
+        while True:
+            with self.phase(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def add_timings(self, timings):
+        for name, seconds in timings.items():
+            self.timings[name] += seconds
+
+    def as_dict(self):
+        return {
+            'counts': dict(self.counts),
+            'timings': {name: round(seconds, 3) for name, seconds in self.timings.items()},
+            'elapsed': round(time.perf_counter() - self.started_at, 3)
+        }
+
+    def maybe_report(self):
+        if self.report is None:
+            return
+        now = time.perf_counter()
+        if now - self.last_report_at >= self.report_interval:
+            self.last_report_at = now
+            try:
+                self.report(self.as_dict())
+            except Exception as e:
+                logger.debug(f"Failed to publish scan progress: {e}")
+
+
+class ScanBatchWriter:
+    """
+    Buffers new and changed epub_metadata rows during a scan and writes them with bulk INSERT/UPDATE
+    statements, config.SCAN_BATCH_SIZE rows at a time. Each chunk runs in its own savepoint; if a chunk
+    fails, its rows are retried one by one so a single duplicate only skips that row.
+    on_flush, if given, is called after every chunk is written, e.g. to commit it.
+    """
+    def __init__(self, session, batch_size=None, progress=None, on_flush=None):
+        self.session = session
+        self.batch_size = batch_size or config.SCAN_BATCH_SIZE
+        self.pending_inserts = []
+        self.pending_updates = []
+        self.progress = progress or ScanProgress()
+        self.counts = self.progress.counts
+        self.on_flush = on_flush
+
+    def insert(self, unique_id, metadata):
+        self.pending_inserts.append((build_db_entry_values(unique_id, metadata), metadata))
+        if len(self.pending_inserts) >= self.batch_size:
+            self.flush_inserts()
+
+    def update(self, values):
+        """values must include the primary key 'id' and only the columns to change."""
+        self.pending_updates.append(values)
+        if len(self.pending_updates) >= self.batch_size:
+            self.flush_updates()
+
+    def flush(self):
+        self.flush_inserts()
+        self.flush_updates()
+
+    def flush_inserts(self):
+        if not self.pending_inserts:
+            return
+        chunk, self.pending_inserts = self.pending_inserts, []
+        with self.progress.phase('db_write'):
+            # Bulk inserts skip the ORM events that assign series and authors
+            series_ids = get_series_ids(self.session.connection(), [values['series'] for values, _ in chunk])
+            for values, _ in chunk:
+                values['series_id'] = series_ids.get(series_name_key(values['series']))
+            try:
+                with self.session.begin_nested():
+                    self.session.execute(insert(EpubMetadata), [values for values, _ in chunk])
+                stored = chunk
+            except IntegrityError:
+                logger.debug(f"Batch insert of {len(chunk)} rows failed, retrying rows individually.")
+                stored = []
+                for values, metadata in chunk:
+                    try:
+                        with self.session.begin_nested():
+                            self.session.execute(insert(EpubMetadata), [values])
+                        stored.append((values, metadata))
+                    except IntegrityError:
+                        self.counts['duplicates'] += 1
+                        logger.warning(f"Duplicate entry skipped for identifier={values['identifier']}")
+            if stored:
+                book_authors = dict(self.session.execute(
+                    select(EpubMetadata.id, EpubMetadata.authors)
+                    .where(EpubMetadata.identifier.in_([values['identifier'] for values, _ in stored]))
+                ).all())
+                set_book_authors(self.session.connection(), book_authors)
+                mark_catalog_changed(self.session)
+            refresh_series(self.session.connection(), set(series_ids.values()))
+        for values, metadata in stored:
+            if metadata['cover_image_path'] is not None:
+                with self.progress.phase('cover_write'):
+                    write_cover_image(metadata['cover_image_data'], metadata['cover_image_path'])
+                self.counts['covers'] += 1
+                with self.progress.phase('cache_update'):
+                    update_redis_cache(metadata)
+        self.counts['inserted'] += len(stored)
+        logger.debug(f"Stored {len(stored)} new metadata rows in DB.")
+        if self.on_flush:
+            self.on_flush()
+
+    def flush_updates(self):
+        if not self.pending_updates:
+            return
+        chunk, self.pending_updates = self.pending_updates, []
+        with self.progress.phase('db_write'):
+            try:
+                with self.session.begin_nested():
+                    self.session.execute(update(EpubMetadata), chunk)
+                updated = len(chunk)
+            except IntegrityError:
+                # e.g. a file moved onto the path another row still holds
+                logger.debug(f"Batch update of {len(chunk)} rows failed, retrying rows individually.")
+                updated = 0
+                for values in chunk:
+                    try:
+                        with self.session.begin_nested():
+                            self.session.execute(update(EpubMetadata), [values])
+                        updated += 1
+                    except IntegrityError:
+                        self.counts['duplicates'] += 1
+                        logger.warning(f"Duplicate entry skipped when updating id={values['id']}")
+        if updated:
+            mark_catalog_changed(self.session)
+        self.counts['updated'] += updated
+        if self.on_flush:
+            self.on_flush()
+
+
 def save_cover_image(cover_image_data, cover_image_path):
+    write_cover_image(make_cover_webp_vips(cover_image_data), cover_image_path)
+
+
+def write_cover_image(webp_bytes, cover_image_path):
     path = config.COVER_BASE_DIRECTORY.joinpath(cover_image_path)
-    webp_bytes = make_cover_webp_vips(cover_image_data)
     path.parent.mkdir(parents=True, exist_ok=True)
 
     with NamedTemporaryFile("wb", delete=False, dir=path.parent) as tmp:
@@ -197,38 +503,363 @@ def save_cover_image(cover_image_data, cover_image_path):
         raise
 
 
-def scan_and_store_metadata(base_directory, source="default"):
+def get_scan_workers():
+    if config.SCAN_WORKERS > 0:
+        return config.SCAN_WORKERS
+    return os.cpu_count() or 1
+
+
+def parse_epub(epub_path, base_directory, file_stat):
+    """
+    Parses a single ePub and encodes its cover to WebP. Runs inside the scan process pool, so it only
+    reads from the filesystem; DB, Redis and cover file writes stay in the scanning process.
+    The time spent on each step is returned under metadata['timings'].
+    Returns None if the ePub could not be parsed.
+    """
+    started_at = time.perf_counter()
+    try:
+        metadata = get_metadata(epub_path, base_directory)
+    except Exception as e:
+        logger.error(f"Failed to read metadata from '{epub_path}': {e}")
+        return None
+    parsed_at = time.perf_counter()
+    metadata.update(file_stat)
+    if metadata['cover_image_data'] is not None:
+        try:
+            metadata['cover_image_data'] = make_cover_webp_vips(metadata['cover_image_data'])
+        except Exception as e:
+            logger.warning(f"Failed to convert cover image for '{epub_path}': {e}")
+            metadata['cover_image_data'] = None
+            metadata['cover_image_path'] = None
+    metadata['timings'] = {'parse': parsed_at - started_at, 'cover_encode': time.perf_counter() - parsed_at}
+    return metadata
+
+
+def _iter_parsed_in_process(pending, base_directory):
+    for epub_path, file_stat in pending:
+        yield epub_path, parse_epub(epub_path, base_directory, file_stat)
+
+
+def iter_parsed_epubs(pending, base_directory):
+    """
+    Yields (epub_path, metadata) for each (epub_path, file_stat) in pending, in completion order.
+    pending may be a lazy iterator; it is consumed as results are handed back. Parsing is fanned out to a
+    bounded process pool of get_scan_workers() processes, with at most a few files per worker in flight.
+    Daemonic processes, such as Celery's prefork workers, can't start a pool and parse in-process instead.
+    """
+    workers = get_scan_workers()
+    pending_iter = iter(pending)
+    head = list(itertools.islice(pending_iter, PARALLEL_SCAN_MIN_FILES))
+    pending_iter = itertools.chain(head, pending_iter)
+    if workers <= 1 or len(head) < PARALLEL_SCAN_MIN_FILES:
+        yield from _iter_parsed_in_process(pending_iter, base_directory)
+        return
+    if multiprocessing.current_process().daemon:
+        logger.debug("Running in a daemonic process, parsing ePubs without worker processes.")
+        yield from _iter_parsed_in_process(pending_iter, base_directory)
+        return
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    in_flight = {}
+    try:
+        # Worker processes are started by submit, so a pool that can't start fails here
+        for epub_path, file_stat in itertools.islice(head, workers * 4):
+            in_flight[executor.submit(parse_epub, epub_path, base_directory, file_stat)] = epub_path
+    except (AssertionError, OSError) as e:
+        logger.warning(f"Could not start scan worker processes, parsing ePubs in-process instead: {e}")
+        executor.shutdown(cancel_futures=True)
+        yield from _iter_parsed_in_process(pending_iter, base_directory)
+        return
+    logger.debug(f"Parsing ePubs with {workers} worker processes.")
+    pending_iter = itertools.islice(pending_iter, len(in_flight), None)
+    try:
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                epub_path = in_flight.pop(future)
+                for next_path, next_stat in itertools.islice(pending_iter, 1):
+                    in_flight[executor.submit(parse_epub, next_path, base_directory, next_stat)] = next_path
+                yield epub_path, future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def reread_db_entry(record, metadata):
+    """
+    Replaces a record's title, authors, series and cover with the metadata read from its file.
+    """
+    values = build_db_entry_values(record.identifier, metadata)
+    for key in ('title', 'authors', 'series', 'seriesindex'):
+        setattr(record, key, values[key])
+    if metadata['cover_image_path'] is None:
+        return
+    save_cover_image(metadata['cover_image_data'], metadata['cover_image_path'])
+    old_cover_path = record.cover_image_path
+    record.cover_image_path = values['cover_image_path']
+    update_redis_cache({'identifier': record.identifier,
+                        'cover_image_path': metadata['cover_image_path'],
+                        'relative_path': record.relative_path})
+    if old_cover_path:
+        try:
+            config.COVER_BASE_DIRECTORY.joinpath(old_cover_path).unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Failed to remove old cover file at {old_cover_path}: {e}")
+
+
+def sync_epub_paths(base_directory, relative_paths, reread=False):
+    """
+    Brings epub_metadata in line with the filesystem for specific paths (files or directories) relative to
+    base_directory, without walking the rest of the library. New files are read and stored, changed files get
+    their manifest refreshed, moves are matched by content hash and records whose file is gone are removed.
+    With reread=True, existing records also have their metadata and cover re-read from the file, replacing
+    any edits made in BookHaven.
+    Returns a dict of inserted/updated/skipped/duplicates/removed counts, or None if the sync failed.
+    """
     session = get_session()
+    counts = {'inserted': 0, 'updated': 0, 'skipped': 0, 'duplicates': 0, 'removed': 0}
     try:
-        epubs = find_epubs(base_directory)
-        logger.debug(f"Found {len(epubs)} ePubs in base directory: {base_directory}")
-        all_db_records = session.query(EpubMetadata).all()
-        db_identifiers = {record.identifier for record in all_db_records}
+        existing_paths, missing_paths = [], []
+        for relative_path in dict.fromkeys(os.path.normpath(path) for path in relative_paths):
+            if os.path.isabs(relative_path) or relative_path == '..' or relative_path.startswith('..' + os.sep):
+                logger.warning(f"Ignoring path outside of the library: {relative_path}")
+                continue
+            full_path = os.path.join(base_directory, relative_path)
+            if relative_path != '.' and is_path_excluded(relative_path):
+                # A full scan never reads excluded paths, so only records whose file is gone are cleaned up
+                missing_paths.append(relative_path)
+            elif os.path.isdir(full_path):
+                existing_paths.extend(
+                    os.path.relpath(path, base_directory)
+                    for path, _ in walk_epubs(base_directory, stat_files=False, start_directory=full_path)
+                )
+                # Files that disappeared from an existing directory are picked up by the prefix check below
+                missing_paths.append(relative_path)
+            elif os.path.isfile(full_path):
+                existing_paths.append(relative_path)
+            else:
+                missing_paths.append(relative_path)
+
+        # Handle new paths first so a move is matched to its old record before that record is removed
+        for relative_path in existing_paths:
+            epub_path = os.path.join(base_directory, relative_path)
+            file_stat = get_file_stat(epub_path)
+            record = session.query(EpubMetadata).filter_by(relative_path=relative_path).first()
+            if record is not None and not reread and manifest_matches(record, file_stat):
+                counts['skipped'] += 1
+                continue
+            file_stat['file_hash'] = get_file_hash(epub_path, file_stat['file_size'])
+            if record is not None:
+                if reread:
+                    try:
+                        reread_db_entry(record, get_metadata(epub_path, base_directory))
+                    except Exception as e:
+                        logger.error(f"Failed to re-read metadata from '{epub_path}': {e}")
+                        continue
+                for key, value in file_stat.items():
+                    setattr(record, key, value)
+                counts['updated'] += 1
+                continue
+            moved_record = session.query(EpubMetadata).filter_by(file_hash=file_stat['file_hash']).first()
+            if moved_record is None:
+                try:
+                    metadata = get_metadata(epub_path, base_directory)
+                except Exception as e:
+                    logger.error(f"Failed to read metadata from '{epub_path}': {e}")
+                    continue
+                metadata.update(file_stat)
+                moved_record = session.query(EpubMetadata).filter_by(identifier=metadata['identifier']).first()
+                if moved_record is None:
+                    if add_new_db_entry(session, metadata['identifier'], metadata):
+                        if metadata['cover_image_path'] is not None:
+                            save_cover_image(metadata['cover_image_data'], metadata['cover_image_path'])
+                        update_redis_cache(metadata)
+                        counts['inserted'] += 1
+                    else:
+                        counts['duplicates'] += 1
+                    continue
+            if os.path.exists(os.path.join(base_directory, moved_record.relative_path)):
+                counts['duplicates'] += 1
+                logger.warning(f"Duplicate entry skipped for identifier={moved_record.identifier}, Path: {relative_path}")
+                continue
+            moved_record.relative_path = relative_path
+            for key, value in file_stat.items():
+                setattr(moved_record, key, value)
+            update_redis_cache({'identifier': moved_record.identifier,
+                                'cover_image_path': moved_record.cover_image_path,
+                                'relative_path': relative_path})
+            counts['updated'] += 1
+            logger.debug(f"Detected moved file for identifier={moved_record.identifier}, Path: {relative_path}")
+        session.flush()
+
+        for relative_path in missing_paths:
+            prefix = '' if relative_path == '.' else relative_path.replace(os.sep, '/') + '/'
+            candidates = session.query(EpubMetadata).filter(
+                (EpubMetadata.relative_path == relative_path) | EpubMetadata.relative_path.startswith(prefix, autoescape=True)
+            ).all()
+            removed = [record for record in candidates
+                       if not os.path.exists(os.path.join(base_directory, record.relative_path))]
+            remove_db_entries(session, removed)
+            counts['removed'] += len(removed)
+        session.commit()
+        logger.info(f"Synced {len(relative_paths)} library paths. Inserted: {counts['inserted']}, "
+                    f"updated: {counts['updated']}, skipped: {counts['skipped']}, duplicates: {counts['duplicates']}, "
+                    f"removed: {counts['removed']}.")
+        return counts
+    except Exception as e:
+        logger.error(f"Error during targeted library sync: {e}")
+        session.rollback()
+    finally:
+        session.close()
+
+
+def scan_and_store_metadata(base_directory, source="default", progress=None):
+    """
+    Scans base_directory for ePubs and brings epub_metadata in line with it.
+    Progress counts and phase timings are tracked on progress (a ScanProgress), which is reported
+    as the scan goes if it has a report callback.
+
+    Written rows are committed every config.SCAN_BATCH_SIZE changes, so books show up while a large
+    library is still being imported, and a checkpoint is kept in Redis until the scan completes. If the
+    scan is interrupted, the next one resumes from there: committed files match their manifest and are
+    skipped without being parsed again.
+    Returns progress.as_dict() when the scan completes, or None if it failed.
+    """
+    session = get_session()
+    progress = progress or ScanProgress()
+
+    def _update_cache(metadata):
+        with progress.phase('cache_update'):
+            update_redis_cache(metadata)
+
+    try:
+        all_db_records = session.query(
+            EpubMetadata.id,
+            EpubMetadata.identifier,
+            EpubMetadata.relative_path,
+            EpubMetadata.cover_image_path,
+            EpubMetadata.file_size,
+            EpubMetadata.file_mtime_ns,
+            EpubMetadata.file_inode,
+            EpubMetadata.file_hash
+        ).all()
+        db_identifiers = {record.identifier: (record.id, record.relative_path) for record in all_db_records}
+        records_by_path = {record.relative_path: record for record in all_db_records}
+        records_by_hash = {record.file_hash: record for record in all_db_records if record.file_hash}
         filesystem_identifiers = set()
-        for epub_path in epubs:
-            metadata = get_metadata(epub_path, base_directory)
+        dir_mtimes_key = f"scan_directory_mtimes:{base_directory}"
+        known_dir_mtimes = None
+        # The startup scan always stats every file, catching in-place edits that pruning would miss
+        if config.SCAN_PRUNE_UNCHANGED_DIRS and source != "init":
+            known_dir_mtimes = {path: int(mtime) for path, mtime in get_redis_hash(dir_mtimes_key).items()}
+        dir_mtimes = {}
+        checkpoint_key = f"scan_checkpoint:{base_directory}"
+        checkpoint = get_redis_hash(checkpoint_key)
+        if checkpoint:
+            logger.info(f"Resuming scan interrupted at {checkpoint.get('updated_at')} after "
+                        f"{checkpoint.get('inserted', 0)} inserts and {checkpoint.get('updated', 0)} updates; "
+                        f"last committed file: {checkpoint.get('last_path')}")
+        checkpoint = {'started_at': checkpoint.get('started_at') or datetime.now(timezone.utc).isoformat(), 'last_path': ''}
+
+        def _commit_checkpoint():
+            with progress.phase('db_write'):
+                session.commit()
+            checkpoint.update(updated_at=datetime.now(timezone.utc).isoformat(),
+                              inserted=progress.counts['inserted'],
+                              updated=progress.counts['updated'])
+            with progress.phase('cache_update'):
+                replace_redis_hash(checkpoint_key, checkpoint)
+
+        writer = ScanBatchWriter(session, progress=progress, on_flush=_commit_checkpoint)
+
+        def _changed_epubs():
+            """Walks the library and yields (epub_path, file_stat) for files that need parsing."""
+            for epub_path, stat_result in walk_epubs(base_directory, known_dir_mtimes=known_dir_mtimes, dir_mtimes=dir_mtimes):
+                progress.counts['discovered'] += 1
+                progress.maybe_report()
+                relative_path = os.path.relpath(epub_path, base_directory)
+                known_record = records_by_path.get(relative_path)
+                if known_record is not None and stat_result is None:
+                    file_stat = None
+                else:
+                    file_stat = get_file_stat(epub_path, stat_result)
+                if known_record is not None and (file_stat is None or manifest_matches(known_record, file_stat)):
+                    writer.counts['skipped'] += 1
+                    filesystem_identifiers.add(known_record.identifier)
+                    if source == "init":
+                        _update_cache({'identifier': known_record.identifier,
+                                       'cover_image_path': known_record.cover_image_path,
+                                       'relative_path': known_record.relative_path})
+                    continue
+                file_stat['file_hash'] = get_file_hash(epub_path, file_stat['file_size'])
+                moved_record = records_by_hash.get(file_stat['file_hash'])
+                if (moved_record is not None and moved_record.relative_path != relative_path
+                        and not os.path.exists(os.path.join(base_directory, moved_record.relative_path))):
+                    writer.update({'id': moved_record.id, 'relative_path': relative_path, **file_stat})
+                    filesystem_identifiers.add(moved_record.identifier)
+                    _update_cache({'identifier': moved_record.identifier,
+                                   'cover_image_path': moved_record.cover_image_path,
+                                   'relative_path': relative_path})
+                    logger.debug(f"Detected moved file for identifier={moved_record.identifier}, Path: {relative_path}")
+                    continue
+                yield epub_path, file_stat
+
+        for epub_path, metadata in iter_parsed_epubs(progress.timed(_changed_epubs(), 'walk'), base_directory):
+            progress.maybe_report()
+            if metadata is None:
+                progress.counts['errors'] += 1
+                continue
+            progress.counts['parsed'] += 1
+            progress.add_timings(metadata.pop('timings'))
+            checkpoint['last_path'] = metadata['relative_path']
             unique_id = metadata['identifier']
             logger.debug(f"Book Title: {metadata['title']}")
-            filesystem_identifiers.add(unique_id)
-            existing_record = session.query(EpubMetadata).filter_by(identifier=unique_id).first()
+            if unique_id in filesystem_identifiers:
+                writer.counts['duplicates'] += 1
+                logger.warning(f"Duplicate entry skipped for identifier={unique_id}, Path: {metadata['relative_path']}")
+                continue
+            existing_record = db_identifiers.get(unique_id)
             if existing_record:
+                record_id, record_path = existing_record
+                path_changed = record_path != metadata['relative_path']
+                if path_changed and os.path.exists(os.path.join(base_directory, record_path)):
+                    # The original file is still in place, so this is a copy rather than a move
+                    writer.counts['duplicates'] += 1
+                    logger.warning(f"Duplicate entry skipped for identifier={unique_id}, Path: {metadata['relative_path']}")
+                    continue
+                filesystem_identifiers.add(unique_id)
                 if source == "init":
-                    update_redis_cache(metadata)
-                if existing_record.relative_path != metadata['relative_path']:
-                    existing_record.relative_path = metadata['relative_path']
-                    session.add(existing_record)
-                    update_redis_cache(metadata)
+                    _update_cache(metadata)
+                values = {
+                    'id': record_id,
+                    'file_size': metadata['file_size'],
+                    'file_mtime_ns': metadata['file_mtime_ns'],
+                    'file_inode': metadata['file_inode'],
+                    'file_hash': metadata['file_hash']
+                }
+                if path_changed:
+                    values['relative_path'] = metadata['relative_path']
+                    _update_cache(metadata)
                     logger.debug(f"Updated relative_path in DB for identifier={unique_id}, Path: {metadata['relative_path']}")
+                writer.update(values)
             else:
-                if add_new_db_entry(session, unique_id, metadata):
-                    if metadata['cover_image_path'] is not None:
-                        save_cover_image(metadata['cover_image_data'], metadata['cover_image_path'])
-                        update_redis_cache(metadata)
-        if config.ENVIRONMENT != "test":
-            remove_missing_files(session, db_identifiers, filesystem_identifiers)
-            remove_missing_user_progress(session)
-        session.commit()
-        logger.info("Library scan and metadata update completed successfully.")
+                filesystem_identifiers.add(unique_id)
+                writer.insert(unique_id, metadata)
+        writer.flush()
+        logger.debug(f"Found {progress.counts['discovered']} ePubs in base directory: {base_directory}")
+        with progress.phase('db_write'):
+            if config.ENVIRONMENT != "test":
+                progress.counts['removed'] = remove_missing_files(session, set(db_identifiers), filesystem_identifiers)
+                remove_missing_user_progress(session)
+            session.commit()
+        with progress.phase('cache_update'):
+            if config.SCAN_PRUNE_UNCHANGED_DIRS:
+                replace_redis_hash(dir_mtimes_key, dir_mtimes)
+            replace_redis_hash(checkpoint_key, {})
+        result = progress.as_dict()
+        counts = result['counts']
+        logger.info(f"Library scan and metadata update completed successfully in {result['elapsed']}s. "
+                    + ", ".join(f"{name}: {count}" for name, count in counts.items()) + ".")
+        logger.info("Scan phase timings (s): " + ", ".join(f"{name}: {seconds}" for name, seconds in result['timings'].items()))
+        return result
     except Exception as e:
         logger.error(f"Error during library scan and metadata update: {e}")
         session.rollback()
@@ -0,0 +1,147 @@
+import base64
+import binascii
+import json
+from sqlalchemy import and_, or_, false
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    """
+    Encodes the sort key of a row into an opaque, URL-safe cursor token.
+    """
+    payload = json.dumps(list(values), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, length):
+    """
+    Decodes a cursor token created by encode_cursor, raising InvalidCursor if it is malformed
+    or doesn't hold exactly `length` values.
+    """
+    try:
+        payload = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        values = json.loads(payload)
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise InvalidCursor("Invalid cursor.")
+    if not isinstance(values, list) or len(values) != length:
+        raise InvalidCursor("Invalid cursor.")
+    for value in values:
+        if value is not None and not isinstance(value, (str, int, float)):
+            raise InvalidCursor("Invalid cursor.")
+    return values
+
+
+def nulls_sort_last(session):
+    """
+    Whether the database sorts NULLs after other values in ascending order.
+    PostgreSQL does, while MySQL and SQLite sort them first.
+    """
+    return session.get_bind().dialect.name == 'postgresql'
+
+
+def _after(column, value, nulls_last):
+    if value is None:
+        return false() if nulls_last else column.is_not(None)
+    if nulls_last:
+        return or_(column > value, column.is_(None))
+    return column > value
+
+
+def _before(column, value, nulls_last):
+    if value is None:
+        return column.is_not(None) if nulls_last else false()
+    if nulls_last:
+        return column < value
+    return or_(column < value, column.is_(None))
+
+
+def _equal(column, value):
+    return column.is_(None) if value is None else column == value
+
+
+def keyset_filter(columns, values, before=False, nulls_last=False):
+    """
+    Builds the condition selecting rows that sort after (or before) `values` when ordered ascending by `columns`.
+    Equivalent to a row-value comparison, but tolerant of NULLs and portable across MySQL, PostgreSQL and SQLite.
+    """
+    compare = _before if before else _after
+    conditions = []
+    for i, (column, value) in enumerate(zip(columns, values)):
+        conditions.append(and_(
+            *[_equal(prev_column, prev_value) for prev_column, prev_value in zip(columns[:i], values[:i])],
+            compare(column, value, nulls_last)
+        ))
+    condition = or_(*conditions)
+    # Redundant bound on the leading column, so the database can seek into the index instead of filtering every row
+    leading_column, leading_value = columns[0], values[0]
+    if leading_value is not None:
+        if before and nulls_last:
+            condition = and_(leading_column <= leading_value, condition)
+        elif not before and not nulls_last:
+            condition = and_(leading_column >= leading_value, condition)
+    return condition
+
+
+def cursor_values(item, columns):
+    return [getattr(item, column.key) for column in columns]
+
+
+def paginate_keyset(query, columns, limit, after=None, before=None, nulls_last=False):
+    """
+    Returns one page of `query` ordered by `columns`, which must end in a unique column.
+    `after` and `before` are cursor tokens from a previous page; with neither the first page is returned.
+
+    Returns (items, next_cursor, prev_cursor). A cursor is None when there are no more rows in that direction.
+    """
+    query = query.order_by(None)
+    if before:
+        values = decode_cursor(before, len(columns))
+        query = query.filter(keyset_filter(columns, values, before=True, nulls_last=nulls_last))
+        items = query.order_by(*[column.desc() for column in columns]).limit(limit + 1).all()
+        has_more_before = len(items) > limit
+        items = items[:limit][::-1]
+        has_more_after = True
+    else:
+        if after:
+            values = decode_cursor(after, len(columns))
+            query = query.filter(keyset_filter(columns, values, nulls_last=nulls_last))
+        items = query.order_by(*columns).limit(limit + 1).all()
+        has_more_after = len(items) > limit
+        items = items[:limit]
+        has_more_before = bool(after)
+    next_cursor = encode_cursor(cursor_values(items[-1], columns)) if items and has_more_after else None
+    prev_cursor = encode_cursor(cursor_values(items[0], columns)) if items and has_more_before else None
+    return items, next_cursor, prev_cursor
+
+
+def _decode_position(token):
+    position = decode_cursor(token, 1)[0]
+    if not isinstance(position, int) or isinstance(position, bool) or position < 0:
+        raise InvalidCursor("Invalid cursor.")
+    return position
+
+
+def paginate_ranked(query, order_by, limit, after=None, before=None, offset=0):
+    """
+    Pages through results sorted by an expression that can't be used as a keyset, such as search relevance.
+    Cursors hold the position of a row in the ordered results, so `after` and `before` behave as in paginate_keyset.
+
+    Returns (items, item_cursors, next_cursor, prev_cursor).
+    """
+    start = offset
+    if before:
+        end = _decode_position(before)
+        start = max(0, end - limit)
+        limit = end - start
+    elif after:
+        start = _decode_position(after) + 1
+    items = query.order_by(None).order_by(*order_by).offset(start).limit(limit + 1).all() if limit > 0 else []
+    has_more_after = len(items) > limit
+    items = items[:limit]
+    item_cursors = [encode_cursor([start + i]) for i in range(len(items))]
+    next_cursor = item_cursors[-1] if items and (has_more_after or before) else None
+    prev_cursor = item_cursors[0] if items and start > 0 else None
+    return items, item_cursors, next_cursor, prev_cursor
@@ -0,0 +1,106 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+from config.config import config
+
+_executor = None
+_lock = threading.Lock()
+_stats = {"in_flight": 0, "completed": 0, "failed": 0}
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=config.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+                )
+    return _executor
+
+
+def _reset_after_fork():
+    # Threads don't survive a fork, so a child process must start its own pool
+    global _executor, _lock
+    _executor = None
+    _lock = threading.Lock()
+    _stats.update(in_flight=0, completed=0, failed=0)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _run(func, *args):
+    """
+    Runs func on the password hashing pool and waits for its result.
+
+    Flask views reach this through the WSGI bridge, which serves them one at a time per web worker, so a
+    process has at most one request waiting here and logins are hashed in parallel across WEB_WORKERS
+    processes. The pool caps how many hashes run at once when several threads call in, and any beyond
+    PASSWORD_HASH_WORKERS wait their turn rather than being turned away.
+    """
+    with _lock:
+        _stats["in_flight"] += 1
+    outcome = "failed"
+    try:
+        result = _get_executor().submit(func, *args).result()
+        outcome = "completed"
+        return result
+    finally:
+        with _lock:
+            _stats["in_flight"] -= 1
+            _stats[outcome] += 1
+
+
+def _hashpw(password, rounds):
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
+
+
+def _checkpw(password, password_hash):
+    return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+
+
+def hash_password(password: str) -> str:
+    return _run(_hashpw, password, config.BCRYPT_ROUNDS)
+
+
+def check_password(password: str, password_hash: str | None) -> bool:
+    if not password_hash:
+        return False
+    return _run(_checkpw, password, password_hash)
+
+
+def needs_rehash(password_hash: str | None) -> bool:
+    """
+    Whether password_hash was made with a bcrypt cost other than BCRYPT_ROUNDS.
+    """
+    try:
+        return int(password_hash.split('$')[2]) != config.BCRYPT_ROUNDS
+    except (AttributeError, IndexError, ValueError):
+        return False
+
+
+def rehash_if_needed(password: str, password_hash: str) -> str | None:
+    """
+    Returns a hash of the just-verified password at the configured cost if password_hash uses a different
+    one, otherwise None.
+    """
+    if not needs_rehash(password_hash):
+        return None
+    return hash_password(password)
+
+
+def get_password_hasher_stats():
+    with _lock:
+        in_flight = _stats["in_flight"]
+        return {
+            "workers": config.PASSWORD_HASH_WORKERS,
+            "running": min(in_flight, config.PASSWORD_HASH_WORKERS),
+            "queued": max(in_flight - config.PASSWORD_HASH_WORKERS, 0),
+            "completed": _stats["completed"],
+            "failed": _stats["failed"],
+            "bcrypt_rounds": config.BCRYPT_ROUNDS,
+        }
+
@@ -0,0 +1,146 @@
+import hashlib
+import hmac
+import json
+import os
+import time
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from redis import RedisError
+from models.users import Users
+from functions.db import get_session
+from functions.utils import get_main_redis_client
+from config.config import config
+from config.logger import logger
+
+PRINCIPAL_KEY = "user_principal:{user_id}"
+# Bumped whenever the user changes; a cached principal is only used while its generation is current
+PRINCIPAL_GENERATION_KEY = "user_principal_generation:{user_id}"
+# Redis entries are dropped whenever the user changes, the TTL only bounds how long an orphaned entry lives
+PRINCIPAL_REDIS_TTL = 300
+# Outlives every principal cached under an older generation, so a reset counter can't make one current again
+PRINCIPAL_GENERATION_TTL = PRINCIPAL_REDIS_TTL * 2
+
+# user_id -> (expires_at, principal); short-lived, as other processes can't invalidate it
+_local_principals = {}
+# user_id -> number of local invalidations, so a load that overlaps one isn't cached locally either
+_local_generations = {}
+
+
+def _clear_local_principals():
+    _local_principals.clear()
+    _local_generations.clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_clear_local_principals)
+
+
+def credential_digest(value):
+    """
+    Keyed hash for storing secrets, or values derived from them, in Redis.
+    """
+    return hmac.new(config.SECRET_KEY.encode('utf-8'), value.encode('utf-8'), hashlib.sha256).hexdigest()
+
+
+def password_tag_for(password_hash):
+    # Changes whenever the password does, without exposing the hash itself
+    return credential_digest(f"password:{password_hash or ''}")[:16]
+
+
+def _redis_call(method, *args, **kwargs):
+    # Always the main database, so invalidations from outside a request (e.g. ADMIN_RESET) reach the cache
+    redis_client = get_main_redis_client()
+    if not redis_client:
+        return None
+    try:
+        return getattr(redis_client, method)(*args, **kwargs)
+    except RedisError as e:
+        logger.debug(f"_redis_call: Redis {method} failed for {args[0]}: {e}")
+        return None
+
+
+def _load_principal(user_id):
+    session = get_session()
+    try:
+        user = session.query(
+            Users.role, Users.auth_type, Users.token_version, Users.password_hash
+        ).filter(Users.id == user_id).first()
+    finally:
+        session.close()
+    if not user:
+        return None
+    return {
+        "role": user.role,
+        "auth_type": user.auth_type,
+        "token_version": user.token_version or 0,
+        "password_tag": password_tag_for(user.password_hash),
+    }
+
+
+def get_user_principal(user_id):
+    """
+    Returns {'role', 'auth_type', 'token_version', 'password_tag'} for a user, or None if the user doesn't exist.
+    Served from an in-process cache for config.AUTH_CACHE_TTL seconds, then from Redis, and only
+    then from the database.
+    """
+    now = time.monotonic()
+    cached = _local_principals.get(user_id)
+    if cached and cached[0] > now:
+        return cached[1]
+    local_generation = _local_generations.get(user_id, 0)
+    key = PRINCIPAL_KEY.format(user_id=user_id)
+    principal_json, generation = _redis_call(
+        "mget", [key, PRINCIPAL_GENERATION_KEY.format(user_id=user_id)]
+    ) or (None, None)
+    generation = int(generation or 0)
+    cached_entry = json.loads(principal_json) if principal_json is not None else None
+    if cached_entry and cached_entry["generation"] == generation:
+        principal = cached_entry["principal"]
+    else:
+        # Stamped with the generation read before the load, so if the user changes while it runs,
+        # the entry is already out of date when it's written and the next read loads it again
+        principal = _load_principal(user_id)
+        _redis_call("set", key, json.dumps({"generation": generation, "principal": principal}), ex=PRINCIPAL_REDIS_TTL)
+    if config.AUTH_CACHE_TTL > 0 and _local_generations.get(user_id, 0) == local_generation:
+        _local_principals[user_id] = (now + config.AUTH_CACHE_TTL, principal)
+    return principal
+
+
+def invalidate_user_principal(user_id):
+    _local_principals.pop(user_id, None)
+    _local_generations[user_id] = _local_generations.get(user_id, 0) + 1
+    generation_key = PRINCIPAL_GENERATION_KEY.format(user_id=user_id)
+    _redis_call("incr", generation_key)
+    _redis_call("expire", generation_key, PRINCIPAL_GENERATION_TTL)
+    _redis_call("delete", PRINCIPAL_KEY.format(user_id=user_id))
+
+
+def revoke_user_tokens(user):
+    """
+    Invalidates every token issued to the user so far, e.g. after an admin resets their password.
+    Takes effect when the session the user belongs to commits.
+    """
+    user.token_version = Users.token_version + 1
+
+
+def get_token_version(user_id):
+    principal = get_user_principal(user_id)
+    return principal["token_version"] if principal else 0
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_user_changes(session, flush_context):
+    for target in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(target, Users):
+            session.info.setdefault('changed_user_ids', set()).add(target.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_on_commit(session):
+    for user_id in session.info.pop('changed_user_ids', ()):
+        invalidate_user_principal(user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_on_rollback(session):
+    session.info.pop('changed_user_ids', None)
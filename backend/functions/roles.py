@@ -1,42 +1,36 @@
 from flask import request, jsonify
-from functions.db import get_session
-from models.users import Users
 from config.logger import logger
 from functions.auth import verify_token
+from functions.principals import get_user_principal
 from functools import wraps
 from config.config import config
 import inspect
 
 def user_logged_in():
-    session = get_session()
-    try:
-        auth_header = request.headers.get('Authorization')
-        no_token = "no_token"
-        if auth_header and auth_header.startswith("Bearer "):
-            token = auth_header.split(" ")[1]
-            decoded_token = verify_token(token)
-            if not decoded_token:
-                return False, "Invalid or expired token.", no_token
-            user_id = decoded_token.get("user_id")
-            user_record = session.query(Users).filter_by(id=user_id).first()
-            if not user_record:
-                return False, "User not found.", no_token
-            return True, "User token validated.", decoded_token
-        return True, "Unauthenticated session in progress.", no_token
-    finally:
-        session.close()
+    auth_header = request.headers.get('Authorization')
+    no_token = "no_token"
+    if auth_header and auth_header.startswith("Bearer "):
+        token = auth_header.split(" ")[1]
+        decoded_token = verify_token(token)
+        if not decoded_token:
+            return False, "Invalid or expired token.", no_token
+        user_id = decoded_token.get("user_id")
+        principal = get_user_principal(user_id)
+        if not principal:
+            return False, "User not found.", no_token
+        # Tokens issued before the version claim existed count as version 0
+        if decoded_token.get("token_version", 0) != principal["token_version"]:
+            return False, "Token has been revoked.", no_token
+        return True, "User token validated.", decoded_token
+    return True, "Unauthenticated session in progress.", no_token
 
 
 def get_user_role(user_id):
-    """Get the current role for a user from the database"""
-    session = get_session()
-    try:
-        user_record = session.query(Users).filter_by(id=user_id).first()
-        if not user_record:
-            return None
-        return user_record.role
-    finally:
-        session.close()
+    """Get the current role for a user, from the principal cache or the database"""
+    principal = get_user_principal(user_id)
+    if not principal:
+        return None
+    return principal["role"]
 
 
 def login_required(func=None, totp=False, required_roles=None):
@@ -0,0 +1,55 @@
+import re
+from sqlalchemy import text, func, literal_column, table, column, and_, or_
+from models.epub_metadata import EpubMetadata, fold_search_text
+
+# InnoDB ignores words shorter than innodb_ft_min_token_size (3 by default), so those are matched with LIKE instead
+MYSQL_MIN_TOKEN_SIZE = 3
+
+_epub_metadata_fts = table('epub_metadata_fts', column('rowid'), column('rank'))
+
+
+def get_search_terms(search):
+    """
+    Splits a search string into lowercased, accent-folded words.
+    """
+    return re.findall(r'\w+', fold_search_text(search))
+
+
+def _like_terms(terms):
+    return [
+        or_(EpubMetadata.search_text.startswith(term, autoescape=True),
+            EpubMetadata.search_text.contains(f" {term}", autoescape=True))
+        for term in terms
+    ]
+
+
+def apply_search(query, search, session):
+    """
+    Filters query to books whose title, authors or series contain words starting with every word in search.
+    Uses the database's full-text index: FTS5 on SQLite, a tsvector GIN index on PostgreSQL and FULLTEXT on MySQL.
+
+    Returns the filtered query and the ORDER BY clauses that sort it by relevance.
+    """
+    terms = get_search_terms(search)
+    if not terms:
+        return query, []
+    dialect = session.get_bind().dialect.name
+    if dialect == 'sqlite':
+        match = ' '.join(f'"{term}"*' for term in terms)
+        query = query.join(_epub_metadata_fts, _epub_metadata_fts.c.rowid == EpubMetadata.id).filter(
+            text("epub_metadata_fts MATCH :search_match").bindparams(search_match=match)
+        )
+        return query, [_epub_metadata_fts.c.rank]
+    if dialect == 'postgresql':
+        vector = func.to_tsvector(literal_column("'simple'::regconfig"),
+                                  func.coalesce(EpubMetadata.search_text, literal_column("''")))
+        ts_query = func.to_tsquery(literal_column("'simple'::regconfig"), ' & '.join(f"{term}:*" for term in terms))
+        return query.filter(vector.op('@@')(ts_query)), [func.ts_rank(vector, ts_query).desc()]
+    if dialect == 'mysql':
+        indexed_terms = [term for term in terms if len(term) >= MYSQL_MIN_TOKEN_SIZE]
+        short_terms = [term for term in terms if len(term) < MYSQL_MIN_TOKEN_SIZE]
+        if not indexed_terms:
+            return query.filter(*_like_terms(short_terms)), []
+        match = EpubMetadata.search_text.match(' '.join(f"+{term}*" for term in indexed_terms))
+        return query.filter(and_(match, *_like_terms(short_terms))), [match.desc()]
+    return query.filter(*_like_terms(terms)), []
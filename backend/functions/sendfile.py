@@ -0,0 +1,125 @@
+import asyncio
+import os
+import re
+from config.logger import logger
+
+# Size of each read when streaming a file in chunks
+SENDFILE_CHUNK_SIZE = 256 * 1024
+# Only these responses carry the file; any other status keeps the body the view sent
+SENDFILE_STATUSES = (200, 206)
+CONTENT_RANGE_PATTERN = re.compile(r'^bytes (\d+)-(\d+)/(\d+|\*)$')
+
+
+def _get_header(headers, name):
+    name = name.lower().encode('latin-1')
+    for key, value in headers:
+        if key.lower() == name:
+            return value.decode('latin-1')
+    return None
+
+
+def _without_header(headers, name):
+    name = name.lower().encode('latin-1')
+    return [(key, value) for key, value in headers if key.lower() != name]
+
+
+def _byte_range(headers, file_size):
+    """
+    Returns (offset, count) of the bytes to send, taken from the Content-Range werkzeug set when it
+    answered a Range request, or the whole file otherwise.
+    """
+    content_range = _get_header(headers, 'content-range')
+    match = CONTENT_RANGE_PATTERN.match(content_range or '')
+    if not match:
+        return 0, file_size
+    start, end = int(match.group(1)), int(match.group(2))
+    return start, end - start + 1
+
+
+class SendfileMiddleware:
+    """
+    Streams the files behind X-Sendfile responses from the event loop, rather than on the WSGI bridge.
+
+    With USE_X_SENDFILE set, send_file and send_from_directory still resolve the path, check access and
+    answer conditional and Range requests in the Flask views, but return only the headers and an
+    X-Sendfile path. This middleware drops that header and sends the file itself, so a large download
+    holds the WSGI bridge only for as long as the view takes to run, instead of for the whole transfer.
+    """
+    def __init__(self, app, flask_app):
+        self.app = app
+        flask_app.config['USE_X_SENDFILE'] = True
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        sendfile_start = None
+
+        async def send_wrapper(message):
+            nonlocal sendfile_start
+            if message['type'] == 'http.response.start' and _get_header(message['headers'], 'x-sendfile'):
+                if message['status'] in SENDFILE_STATUSES:
+                    sendfile_start = message
+                    return
+                # e.g. 412 from a failed If-Match. The body is empty, but Content-Length still gives the file size
+                headers = _without_header(_without_header(message['headers'], 'x-sendfile'), 'content-length')
+                message = {**message, 'headers': headers + [(b'content-length', b'0')]}
+            if sendfile_start is not None:
+                # The WSGI response body of an X-Sendfile response is empty
+                return
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+        if sendfile_start is not None:
+            await self._send_file(scope, receive, send, sendfile_start)
+
+    async def _send_file(self, scope, receive, send, start):
+        headers = list(start['headers'])
+        path = _get_header(headers, 'x-sendfile')
+        headers = _without_header(headers, 'x-sendfile')
+        try:
+            file = await asyncio.to_thread(open, path, 'rb')
+        except OSError as e:
+            logger.warning(f"SendfileMiddleware: Could not open {path}: {e}")
+            await send({'type': 'http.response.start', 'status': 404,
+                        'headers': [(b'content-type', b'text/plain'), (b'content-length', b'14')]})
+            await send({'type': 'http.response.body', 'body': b'File not found'})
+            return
+        try:
+            file_size = os.fstat(file.fileno()).st_size
+            offset, count = _byte_range(headers, file_size)
+            headers = _without_header(headers, 'content-length') + [(b'content-length', str(count).encode('latin-1'))]
+            await send({'type': 'http.response.start', 'status': start['status'], 'headers': headers})
+            if scope['method'] == 'HEAD' or count <= 0:
+                await send({'type': 'http.response.body', 'body': b''})
+                return
+            if 'http.response.zerocopysend' in scope.get('extensions', {}):
+                await send({'type': 'http.response.zerocopysend', 'file': file, 'offset': offset, 'count': count})
+                return
+            await self._stream_chunks(receive, send, file, offset, count)
+        finally:
+            file.close()
+
+    @staticmethod
+    async def _stream_chunks(receive, send, file, offset, count):
+        disconnected = asyncio.Event()
+
+        async def watch_disconnect():
+            while (await receive())['type'] != 'http.disconnect':
+                pass
+            disconnected.set()
+
+        watcher = asyncio.create_task(watch_disconnect())
+        try:
+            await asyncio.to_thread(file.seek, offset)
+            remaining = count
+            while remaining > 0 and not disconnected.is_set():
+                chunk = await asyncio.to_thread(file.read, min(SENDFILE_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': remaining > 0})
+            if remaining > 0 and not disconnected.is_set():
+                # The file shrank since its size was sent; end the response rather than leave it hanging
+                await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            watcher.cancel()
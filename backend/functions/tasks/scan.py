@@ -1,25 +1,81 @@
+import threading
+from contextlib import contextmanager
 from redis import Redis
+from redis.exceptions import LockError
 from celery_app import celery
 from celery.exceptions import MaxRetriesExceededError
 from config.config import config
 from config.logger import logger
 from sqlalchemy.exc import SQLAlchemyError
-from functions.metadata.scan import scan_and_store_metadata
+from functions.metadata.scan import scan_and_store_metadata, sync_epub_paths, ScanProgress
 
 logger.info(f"REDIS LOCK URI: {config.redis_db_uri(2)}")
 url = config.redis_db_uri(2)
 redis_lock_client = Redis.from_url(url)
 
+# The lock is kept alive by a heartbeat while the scan runs, so the timeout only bounds how long
+# a crashed worker can block scans, not how long a scan may take.
+SCAN_LOCK_TIMEOUT = 120
+SCAN_LOCK_HEARTBEAT_INTERVAL = 30
+SCAN_PENDING_KEY = "scan_pending"
+
+
+@contextmanager
+def lock_heartbeat(lock, interval=SCAN_LOCK_HEARTBEAT_INTERVAL):
+    """
+    Resets the lock's timeout every interval seconds from a background thread until the block exits.
+    """
+    stop = threading.Event()
+
+    def _renew():
+        while not stop.wait(interval):
+            try:
+                lock.reacquire()
+            except LockError as e:
+                logger.error(f"Failed to renew scan lock, another scan may start: {e}")
+                return
+
+    thread = threading.Thread(target=_renew, name="scan-lock-heartbeat", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def request_pending_scan(source):
+    """
+    Records that a scan was requested while one was running. Any number of requests collapse into a
+    single follow-up scan; an "init" request takes precedence so its cache refresh isn't lost.
+    """
+    if source == "init":
+        redis_lock_client.set(SCAN_PENDING_KEY, source)
+    else:
+        redis_lock_client.set(SCAN_PENDING_KEY, source, nx=True)
+
+
+def pop_pending_scan():
+    pipe = redis_lock_client.pipeline()
+    pipe.get(SCAN_PENDING_KEY)
+    pipe.delete(SCAN_PENDING_KEY)
+    source, _ = pipe.execute()
+    return source.decode() if source else None
+
+
 @celery.task(bind=True, name="functions.tasks.scan.scan_library_task", max_retries=5)
 def scan_library_task(self, source="default"):
-    lock = redis_lock_client.lock("scan_lock", timeout=900)  # e.g., 15-minute hard max timeout
+    # Not thread-local, so the heartbeat thread can renew it
+    lock = redis_lock_client.lock("scan_lock", timeout=SCAN_LOCK_TIMEOUT, thread_local=False)
     if not lock.acquire(blocking=False):
-        logger.warning("Another scan is already running. Skipping this one.")
-        return "scan_already_running"
+        request_pending_scan(source)
+        logger.info("Another scan is already running. A follow-up scan will run once it completes.")
+        return "scan_queued"
     try:
         logger.info("Starting scan with lock acquired.")
-        scan_and_store_metadata(config.BASE_DIRECTORY, source)
-        return "scan_completed"
+        progress = ScanProgress(report=lambda meta: self.update_state(state="PROGRESS", meta=meta))
+        with lock_heartbeat(lock):
+            result = scan_and_store_metadata(config.BASE_DIRECTORY, source, progress)
     except SQLAlchemyError as exc:
         if self.request.retries >= self.max_retries:
             logger.exception(f"Max retries exceeded after {self.request.retries} attempts. DB Error: {str(exc)}")
@@ -28,5 +84,30 @@ def scan_library_task(self, source="default"):
         logger.warning(f"Retrying due to DB error: {str(exc)} (attempt {self.request.retries + 1})")
         raise self.retry(exc=exc, countdown=retry_delay)
     finally:
-        lock.release()
-        logger.info("Scan complete. Lock released.")
+        try:
+            lock.release()
+            logger.info("Scan complete. Lock released.")
+        except LockError:
+            logger.warning("Scan complete, but the scan lock had already expired.")
+    pending_source = pop_pending_scan()
+    if pending_source:
+        logger.info("Starting follow-up scan requested while the last one was running.")
+        scan_library_task.delay(pending_source)
+    if result is None:
+        return "scan_failed"
+    return {"status": "scan_completed", **result}
+
+
+@celery.task(bind=True, name="functions.tasks.scan.sync_paths_task", max_retries=5)
+def sync_paths_task(self, relative_paths, reread=False):
+    """
+    Syncs specific paths relative to BASE_DIRECTORY. Runs without the scan lock: it only touches the
+    given paths, and unique constraints keep it safe alongside a running full scan.
+    """
+    result = sync_epub_paths(config.BASE_DIRECTORY, relative_paths, reread)
+    if result is None:
+        if self.request.retries >= self.max_retries:
+            logger.error(f"Giving up syncing {len(relative_paths)} paths after {self.request.retries} retries.")
+            return "sync_failed"
+        raise self.retry(countdown=3 ** self.request.retries)
+    return result
@@ -2,7 +2,8 @@ from cryptography.fernet import Fernet
 from models.users import Users
 from functions.db import get_session
 from email_validator import validate_email, EmailNotValidError
-import bcrypt
+from sqlalchemy.exc import IntegrityError
+from functions.passwords import hash_password
 import re
 from flask import current_app, jsonify, request, has_app_context
 from config.config import config
@@ -29,10 +30,6 @@ def check_required_envs(secret_key: str, base_url: str, oidc_enabled: bool) -> t
     return True, "Required environment variables are set."
 
 
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-
-
 def check_pw_complexity(password: str) -> tuple[bool, str]:
     if len(password) < 8:
         return False, "Password must be at least 8 characters long."
@@ -74,6 +71,12 @@ def check_admin_user(password: str, email: str) -> tuple[bool, str]:
         session.add(new_admin_user)
         session.commit()
         return True, "Admin user created successfully."
+    except IntegrityError as e:
+        # Another web worker booting at the same time created it first
+        session.rollback()
+        if session.query(Users).filter_by(username='admin').first():
+            return True, "Admin user already exists. Skipping initial setup."
+        return False, str(e)
     except Exception as e:
         return False, str(e)
     finally:
@@ -159,6 +162,29 @@ def _get_redis_client():
         return None
 
 
+_main_redis_client = None
+
+
+def get_main_redis_client():
+    """
+    Returns a client for the main Redis database (REDIS_DB), whether or not there is an app context.
+    Use it for state the web app, Celery workers and startup code must all see, such as cache generations
+    and invalidations, rather than _get_redis_client, which falls back to another database outside the app.
+    """
+    global _main_redis_client
+    if has_app_context():
+        redis_client = getattr(current_app, "redis", None)
+        if redis_client:
+            return redis_client
+    if _main_redis_client is None:
+        try:
+            _main_redis_client = Redis.from_url(config.redis_db_uri(), decode_responses=True)
+        except Exception as e:
+            logger.debug(f"get_main_redis_client: Could not create Redis client: {e}")
+            return None
+    return _main_redis_client
+
+
 def update_redis_cache(data):
     redis_client = _get_redis_client()
     if not redis_client:
@@ -187,3 +213,29 @@ def invalidate_redis_cache(identifier):
     except Exception as e:
         logger.debug(f"Exception occurred when trying to invalidate redis cache: {e}")
         return
+
+
+def get_redis_hash(name):
+    redis_client = _get_redis_client()
+    if not redis_client:
+        return {}
+    try:
+        return redis_client.hgetall(name)
+    except Exception as e:
+        logger.debug(f"Exception occurred when trying to read redis hash {name}: {e}")
+        return {}
+
+
+def replace_redis_hash(name, mapping):
+    redis_client = _get_redis_client()
+    if not redis_client:
+        logger.debug("Redis client not available, skipping hash update")
+        return
+    try:
+        pipe = redis_client.pipeline()
+        pipe.delete(name)
+        if mapping:
+            pipe.hset(name, mapping=mapping)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"replace_redis_hash: Redis write failed for {name}: {e}")
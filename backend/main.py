@@ -1,5 +1,5 @@
 from functions.blueprints import register_blueprints
-from functions.extensions import setup_cors, setup_limiter
+from functions.extensions import setup_cors, setup_limiter, setup_cache
 from functions.init import init_env, init_admin_user, init_admin_password_reset, init_rate_limit, init_encryption, init_oauth, CustomFlask, init_redis, init_uploads
 from config.config import config
 from celery_app import celery
@@ -14,6 +14,7 @@ def create_app() -> CustomFlask:
     app.config["RATELIMIT_STORAGE_URI"] = url
     setup_cors(app)
     setup_limiter(app)
+    setup_cache(app)
     register_blueprints(app)
     app.celery = celery
     init_admin_user()
@@ -0,0 +1,121 @@
+import re
+from sqlalchemy import Column, Integer, String, Index, PrimaryKeyConstraint, select, insert, update, delete, func
+from models.base import Base
+from models.lookup_tables import chunks, get_or_create_ids
+
+
+class Authors(Base):
+    __tablename__ = 'authors'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(255), nullable=False)
+    name_key = Column(String(255), nullable=False)
+    slug = Column(String(255), nullable=False)
+    sort_name = Column(String(255), nullable=False)
+    book_count = Column(Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        Index('ix_authors_name_key', 'name_key', unique=True),
+        Index('ix_authors_slug', 'slug'),
+        Index('ix_authors_sort_name', 'sort_name', 'id'),
+    )
+
+
+class BookAuthors(Base):
+    __tablename__ = 'book_authors'
+
+    book_id = Column(Integer, nullable=False)
+    author_id = Column(Integer, nullable=False)
+    position = Column(Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint('book_id', 'author_id'),
+        Index('ix_book_authors_author_book', 'author_id', 'book_id'),
+    )
+
+
+def split_author_names(authors):
+    """
+    Splits an EpubMetadata.authors string into individual names, dropping blanks and repeats.
+    """
+    names = {}
+    for name in (authors or '').split(','):
+        name = ' '.join(name.split())
+        if name:
+            names.setdefault(author_name_key(name), name)
+    return list(names.values())
+
+
+def author_name_key(name):
+    from models.epub_metadata import fold_search_text
+    return ' '.join(fold_search_text(name).split())
+
+
+def author_slug(name):
+    """
+    The author's URL segment as built by the frontend: lowercased, with whitespace replaced by hyphens.
+    """
+    return re.sub(r'\s+', '-', name.strip()).lower()
+
+
+def author_sort_name(name):
+    return re.sub(r'^\W+', '', author_name_key(name)) or author_name_key(name)
+
+
+def _get_author_ids(connection, names_by_key):
+    return get_or_create_ids(connection, Authors, names_by_key, lambda key, name: {
+        'name': name, 'name_key': key, 'slug': author_slug(name), 'sort_name': author_sort_name(name), 'book_count': 0
+    })
+
+
+def _get_linked_author_ids(connection, book_ids):
+    author_ids = set()
+    for chunk in chunks(book_ids):
+        author_ids.update(connection.execute(
+            select(BookAuthors.author_id).where(BookAuthors.book_id.in_(chunk))
+        ).scalars())
+    return author_ids
+
+
+def _refresh_book_counts(connection, author_ids):
+    """
+    Recounts the books of the given authors, and removes authors that no longer have any.
+    """
+    book_count = (
+        select(func.count()).select_from(BookAuthors).where(BookAuthors.author_id == Authors.id).scalar_subquery()
+    )
+    for chunk in chunks(author_ids):
+        connection.execute(update(Authors).where(Authors.id.in_(chunk)).values(book_count=book_count))
+        connection.execute(delete(Authors).where(Authors.id.in_(chunk), Authors.book_count == 0))
+
+
+def set_book_authors(connection, book_authors):
+    """
+    Replaces the author links of books, given as {book_id: EpubMetadata.authors}.
+    """
+    if not book_authors:
+        return
+    names_by_book = {book_id: split_author_names(authors) for book_id, authors in book_authors.items()}
+    names_by_key = {author_name_key(name): name for names in names_by_book.values() for name in names}
+    author_ids = _get_author_ids(connection, names_by_key)
+    changed_author_ids = _get_linked_author_ids(connection, names_by_book)
+    for chunk in chunks(names_by_book):
+        connection.execute(delete(BookAuthors).where(BookAuthors.book_id.in_(chunk)))
+    links = [
+        {'book_id': book_id, 'author_id': author_ids[author_name_key(name)], 'position': position}
+        for book_id, names in names_by_book.items()
+        for position, name in enumerate(names)
+    ]
+    for chunk in chunks(links):
+        connection.execute(insert(BookAuthors), chunk)
+    changed_author_ids.update(link['author_id'] for link in links)
+    _refresh_book_counts(connection, changed_author_ids)
+
+
+def remove_book_authors(connection, book_ids):
+    if not book_ids:
+        return
+    changed_author_ids = _get_linked_author_ids(connection, book_ids)
+    for chunk in chunks(book_ids):
+        connection.execute(delete(BookAuthors).where(BookAuthors.book_id.in_(chunk)))
+    _refresh_book_counts(connection, changed_author_ids)
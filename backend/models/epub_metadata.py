@@ -1,5 +1,9 @@
-from sqlalchemy import Column, Integer, String, Float, Index
+import unicodedata
+from sqlalchemy import Column, Integer, BigInteger, String, Float, Text, Index, DDL, event, inspect
+from sqlalchemy.orm import deferred, Session
 from models.base import Base
+from models.authors import set_book_authors, remove_book_authors
+from models.series import get_series_id, refresh_series
 
 class EpubMetadata(Base):
     __tablename__ = 'epub_metadata'
@@ -10,11 +14,124 @@ class EpubMetadata(Base):
     authors = Column(String(255))
     series = Column(String(255))
     seriesindex = Column(Float)
+    series_id = Column(Integer, nullable=True)
     relative_path = Column(String(255), unique=True)
     cover_image_path = Column(String(255), nullable=True)
     progress = Column(String(255), nullable=True)
+    file_size = Column(BigInteger, nullable=True)
+    file_mtime_ns = Column(BigInteger, nullable=True)
+    file_inode = Column(BigInteger, nullable=True)
+    file_hash = Column(String(64), nullable=True)
+    # Folded copy of title, authors and series for the full-text index; see build_search_text
+    search_text = deferred(Column(Text, nullable=True))
 
     __table_args__ = (
         Index('book_identifier', 'identifier', unique=True),
-        Index('author_title_index_series_idx', 'authors', 'series', 'seriesindex', 'title', unique=True)
+        Index('author_title_index_series_idx', 'authors', 'series', 'seriesindex', 'title', unique=True),
+        Index('ix_epub_metadata_series_id', 'series_id', 'seriesindex')
     )
+
+
+def fold_search_text(text):
+    """
+    Lowercases text and strips diacritics, so "Brontë" and "bronte" match.
+    """
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def build_search_text(title, authors, series):
+    return fold_search_text(' '.join(part for part in (title, authors, series) if part))
+
+
+@event.listens_for(EpubMetadata, 'before_insert')
+@event.listens_for(EpubMetadata, 'before_update')
+def _set_search_text(mapper, connection, target):
+    state = inspect(target)
+    if state.persistent and not any(state.attrs[key].history.has_changes() for key in ('title', 'authors', 'series')):
+        return
+    target.search_text = build_search_text(target.title, target.authors, target.series)
+
+
+@event.listens_for(EpubMetadata, 'before_insert')
+@event.listens_for(EpubMetadata, 'before_update')
+def _set_series_id(mapper, connection, target):
+    state = inspect(target)
+    if state.persistent and not state.attrs.series.history.has_changes():
+        return
+    target.series_id = get_series_id(connection, target.series)
+
+
+@event.listens_for(Session, 'before_flush')
+def _collect_removed_series(session, flush_context, instances):
+    # Read before the flush, as the rows of deleted books are gone by the time the aggregates are refreshed
+    removed = {target.series_id for target in session.deleted if isinstance(target, EpubMetadata)}
+    if removed:
+        session.info.setdefault('refresh_series_ids', set()).update(removed)
+
+
+@event.listens_for(Session, 'after_flush')
+def _sync_book_authors(session, flush_context):
+    """
+    Keeps book_authors in step with EpubMetadata.authors for books written through the ORM.
+    Bulk inserts bypass this, and call set_book_authors themselves.
+    """
+    changed = {}
+    for target in list(session.new) + list(session.dirty):
+        if isinstance(target, EpubMetadata) and (target in session.new or inspect(target).attrs.authors.history.has_changes()):
+            changed[target.id] = target.authors
+    removed = [target.id for target in session.deleted if isinstance(target, EpubMetadata)]
+    if changed:
+        set_book_authors(session.connection(), changed)
+    if removed:
+        remove_book_authors(session.connection(), removed)
+
+
+@event.listens_for(Session, 'after_flush')
+def _refresh_series(session, flush_context):
+    """
+    Refreshes the aggregates of series whose books were added, removed, moved between series or renumbered.
+    """
+    series_ids = session.info.pop('refresh_series_ids', set())
+    for target in list(session.new) + list(session.dirty):
+        if not isinstance(target, EpubMetadata):
+            continue
+        state = inspect(target)
+        if target in session.new or state.attrs.seriesindex.history.has_changes():
+            series_ids.add(target.series_id)
+        series_history = state.attrs.series_id.history
+        if series_history.has_changes():
+            series_ids.update(series_history.added)
+            series_ids.update(series_history.deleted)
+    if series_ids - {None}:
+        refresh_series(session.connection(), series_ids)
+
+
+# Full-text index over search_text, using each database's native implementation.
+# SQLite keeps an external-content FTS5 table in sync with triggers; PostgreSQL and MySQL index the column directly.
+SEARCH_INDEX_DDL = {
+    'sqlite': [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS epub_metadata_fts USING fts5("
+        "search_text, content='epub_metadata', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER IF NOT EXISTS epub_metadata_fts_insert AFTER INSERT ON epub_metadata BEGIN "
+        "INSERT INTO epub_metadata_fts(rowid, search_text) VALUES (new.id, new.search_text); END",
+        "CREATE TRIGGER IF NOT EXISTS epub_metadata_fts_delete AFTER DELETE ON epub_metadata BEGIN "
+        "INSERT INTO epub_metadata_fts(epub_metadata_fts, rowid, search_text) VALUES ('delete', old.id, old.search_text); END",
+        "CREATE TRIGGER IF NOT EXISTS epub_metadata_fts_update AFTER UPDATE OF search_text ON epub_metadata BEGIN "
+        "INSERT INTO epub_metadata_fts(epub_metadata_fts, rowid, search_text) VALUES ('delete', old.id, old.search_text); "
+        "INSERT INTO epub_metadata_fts(rowid, search_text) VALUES (new.id, new.search_text); END",
+    ],
+    'postgresql': [
+        "CREATE INDEX IF NOT EXISTS epub_metadata_search_idx ON epub_metadata "
+        "USING gin (to_tsvector('simple'::regconfig, coalesce(search_text, '')))",
+    ],
+    'mysql': [
+        "CREATE FULLTEXT INDEX epub_metadata_search_idx ON epub_metadata (search_text)",
+    ],
+}
+
+for _dialect, _statements in SEARCH_INDEX_DDL.items():
+    for _statement in _statements:
+        event.listen(EpubMetadata.__table__, 'after_create', DDL(_statement).execute_if(dialect=_dialect))
+event.listen(EpubMetadata.__table__, 'before_drop',
+             DDL("DROP TABLE IF EXISTS epub_metadata_fts").execute_if(dialect='sqlite'))
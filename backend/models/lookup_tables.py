@@ -0,0 +1,37 @@
+from sqlalchemy import select, insert
+from sqlalchemy.exc import IntegrityError
+
+CHUNK_SIZE = 500
+
+
+def chunks(items):
+    items = list(items)
+    for i in range(0, len(items), CHUNK_SIZE):
+        yield items[i:i + CHUNK_SIZE]
+
+
+def get_or_create_ids(connection, model, names_by_key, make_row):
+    """
+    Returns {name_key: id} for a table with a unique name_key column, such as authors or series.
+    Keys of names_by_key that aren't in the table yet are inserted with the values make_row(key, name) returns.
+    """
+    ids = {}
+    for keys in chunks(names_by_key):
+        ids.update(connection.execute(select(model.name_key, model.id).where(model.name_key.in_(keys))).all())
+    missing = [make_row(key, name) for key, name in names_by_key.items() if key not in ids]
+    for chunk in chunks(missing):
+        try:
+            with connection.begin_nested():
+                connection.execute(insert(model), chunk)
+        except IntegrityError:
+            # Another writer added some of these rows since they were looked up
+            for values in chunk:
+                try:
+                    with connection.begin_nested():
+                        connection.execute(insert(model), [values])
+                except IntegrityError:
+                    pass
+        ids.update(connection.execute(
+            select(model.name_key, model.id).where(model.name_key.in_([values['name_key'] for values in chunk]))
+        ).all())
+    return ids
@@ -0,0 +1,82 @@
+import re
+from sqlalchemy import Column, Integer, String, Float, Index, select, update, delete, func, table, column
+from models.base import Base
+from models.lookup_tables import chunks, get_or_create_ids
+
+# Lightweight handle on epub_metadata, which imports this module
+_epub_metadata = table('epub_metadata', column('id'), column('series_id'), column('seriesindex'))
+
+
+class Series(Base):
+    __tablename__ = 'series'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(255), nullable=False)
+    name_key = Column(String(255), nullable=False)
+    sort_name = Column(String(255), nullable=False)
+    book_count = Column(Integer, default=0, nullable=False)
+    min_index = Column(Float, nullable=True)
+    max_index = Column(Float, nullable=True)
+    cover_book_id = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index('ix_series_name_key', 'name_key', unique=True),
+        Index('ix_series_sort_name', 'sort_name', 'id'),
+    )
+
+
+def clean_series_name(name):
+    return ' '.join((name or '').split())
+
+
+def series_name_key(name):
+    from models.epub_metadata import fold_search_text
+    return fold_search_text(clean_series_name(name))
+
+
+def series_sort_name(name):
+    return re.sub(r'^\W+', '', series_name_key(name)) or series_name_key(name)
+
+
+def get_series_ids(connection, names):
+    """
+    Returns {name_key: series id} for the given series names, creating any that don't exist yet.
+    Blank names are standalone books and get no series.
+    """
+    names_by_key = {}
+    for name in names:
+        if clean_series_name(name):
+            names_by_key.setdefault(series_name_key(name), clean_series_name(name))
+    return get_or_create_ids(connection, Series, names_by_key, lambda key, name: {
+        'name': name, 'name_key': key, 'sort_name': series_sort_name(name), 'book_count': 0
+    })
+
+
+def get_series_id(connection, name):
+    if not clean_series_name(name):
+        return None
+    return get_series_ids(connection, [name])[series_name_key(name)]
+
+
+def refresh_series(connection, series_ids):
+    """
+    Recomputes the book count, index range and cover book of the given series, and removes series with no books left.
+    """
+    series_ids = {series_id for series_id in series_ids if series_id is not None}
+    books = _epub_metadata.c
+
+    def _aggregate(expression):
+        return select(expression).where(books.series_id == Series.id).scalar_subquery()
+
+    cover_book = (
+        select(books.id).where(books.series_id == Series.id)
+        .order_by(books.seriesindex, books.id).limit(1).scalar_subquery()
+    )
+    for chunk in chunks(series_ids):
+        connection.execute(update(Series).where(Series.id.in_(chunk)).values(
+            book_count=_aggregate(func.count(books.id)),
+            min_index=_aggregate(func.min(books.seriesindex)),
+            max_index=_aggregate(func.max(books.seriesindex)),
+            cover_book_id=cover_book
+        ))
+        connection.execute(delete(Series).where(Series.id.in_(chunk), Series.book_count == 0))
@@ -28,3 +28,5 @@ class Users(Base):
     mfa_enabled = Column(Boolean, default=False, nullable=False)
     mfa_secret = Column(String(255), nullable=True)
     last_used_otp = Column(String(8), nullable=True)
+    # Bumped to revoke every token issued to the user so far
+    token_version = Column(Integer, default=0, server_default='0', nullable=False)
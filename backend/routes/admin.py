@@ -2,8 +2,10 @@ from flask import Blueprint, jsonify, request, g
 from functions.db import get_session
 import random
 import string
-from functions.utils import hash_password, check_pw_complexity, unlink_oidc
+from functions.utils import check_pw_complexity, unlink_oidc
+from functions.passwords import hash_password, get_password_hasher_stats
 from functions.roles import login_required
+from functions.principals import revoke_user_tokens
 from models.users import Users
 from config.logger import logger
 from email_validator import validate_email, EmailNotValidError
@@ -95,6 +97,7 @@ def reset_user_password(user_id, token_state):
         if user.auth_type != "local":
             return jsonify({"error": "Cannot reset passwords for OIDC-authenticated users."}), 400
         user.password_hash = hash_password(new_password)
+        revoke_user_tokens(user)
         session.commit()
         logger.info(f"Admin UID {token_state["user_id"]} successfully reset UID {user_id} password.")
         return jsonify({"success": True}), 200
@@ -248,3 +251,10 @@ def unlink_oidc_admin(user_id):
     unlink_response, unlink_status = unlink_oidc(user_id)
 
     return unlink_response, unlink_status
+
+
+@admin_bp.route('/password-hashing', methods=['GET'])
+@login_required(required_roles=["admin"])
+def get_password_hashing_stats(token_state):
+    """Report the load on this worker's password hashing pool"""
+    return jsonify(get_password_hasher_stats()), 200
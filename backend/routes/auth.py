@@ -3,13 +3,14 @@ import pyotp
 from functions.init import CustomFlask
 from typing import cast
 from flask import request, jsonify, make_response, redirect, Blueprint, current_app, url_for, session as oidc_session
-from bcrypt import checkpw
 from datetime import datetime, timezone, timedelta
 from config.config import config
 from config.logger import logger
 from functions.roles import login_required
-from functions.utils import decrypt_totp_secret, hash_password
+from functions.utils import decrypt_totp_secret
+from functions.passwords import hash_password, check_password, rehash_if_needed
 from functions.auth import verify_token
+from functions.principals import get_token_version
 from functions.db import get_session
 from models.users import Users
 from sqlalchemy import func
@@ -38,6 +39,7 @@ def generate_token(user_id, user_email, user_role):
             'user_id': user_id,
             'user_email':user_email,
             'user_role':user_role,
+            'token_version': get_token_version(user_id),
             'exp': datetime.now(timezone.utc) + timedelta(hours=24)
         },
         config.SECRET_KEY,
@@ -53,6 +55,7 @@ def generate_cf_token(user_id, user_role, user_email, cf_iss):
             'user_role':user_role,
             'user_email':user_email,
             'iss':cf_iss,
+            'token_version': get_token_version(user_id),
             'exp': datetime.now(timezone.utc) + timedelta(hours=24)
         },
         config.SECRET_KEY,
@@ -125,7 +128,11 @@ def login():
             user = session.query(Users).filter(Users.email == username).first()
         if user.auth_type == "oidc":
             return jsonify({"error": "OIDC user cannot log in with username and password."}), 400
-        if user and checkpw(password.encode('utf-8'), user.password_hash.encode('utf-8')):
+        if user and check_password(password, user.password_hash):
+            rehashed_password = rehash_if_needed(password, user.password_hash)
+            if rehashed_password:
+                user.password_hash = rehashed_password
+                session.commit()
             if not user.mfa_enabled:
                 user.last_login = datetime.now(timezone.utc)
                 session.commit()
@@ -1,61 +1,97 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
+from sqlalchemy import func
 from models.epub_metadata import EpubMetadata
+from models.authors import Authors, author_sort_name
 from functions.db import get_session
 from functions.roles import login_required
+from functions.book_management import author_books_filter, BOOK_SORT_COLUMNS, get_cover_url
+from functions.pagination import paginate_keyset, InvalidCursor
+from functions.catalog import catalog_response
 
 authors_bp = Blueprint('authors', __name__)
 
+MAX_AUTHORS_PAGE_SIZE = 500
+
 
 @authors_bp.route('/api/authors', methods=['GET'])
 @login_required
+@catalog_response()
 def get_authors():
     """
-    Returns a list of distinct authors sorted alphabetically.
+    Returns a page of authors sorted alphabetically, with their book counts, optionally limited
+    to names starting with 'prefix'. Further pages are requested with the 'cursor' (or 'before')
+    token from the previous response. With 'letters=true', also returns the number of authors
+    under each initial, so a client can lay out an index before loading any names.
     """
+    prefix = request.args.get('prefix', '', type=str)
+    cursor = request.args.get('cursor', None, type=str)
+    before = request.args.get('before', None, type=str)
+    limit = min(max(request.args.get('limit', 100, type=int), 1), MAX_AUTHORS_PAGE_SIZE)
+    include_letters = request.args.get('letters', 'false', type=str).lower() == 'true'
+    sort_prefix = author_sort_name(prefix) if prefix.strip() else ''
+
     session = get_session()
-    total_books = session.query(EpubMetadata.id).count()
-    if total_books == 0:
-        return jsonify({
-            "authors": [],
-            "total_authors": 0
-        })
-    authors_query = session.query(EpubMetadata.authors).all()
-    authors = set()
-    for entry in authors_query:
-        if entry.authors:
-            authors.update([author.strip() for author in entry.authors.split(",")])
-    sorted_authors = sorted(authors)
-    return jsonify({
-        "authors": sorted_authors,
-        "total_authors": len(sorted_authors)
-    })
+    try:
+        authors_query = session.query(
+            Authors.id, Authors.name, Authors.slug, Authors.sort_name, Authors.book_count
+        ).filter(Authors.book_count > 0)
+        if sort_prefix:
+            authors_query = authors_query.filter(Authors.sort_name.startswith(sort_prefix, autoescape=True))
+        try:
+            authors, next_cursor, prev_cursor = paginate_keyset(
+                authors_query, (Authors.sort_name, Authors.id), limit, after=cursor, before=before
+            )
+        except InvalidCursor as e:
+            return jsonify({"error": str(e)}), 400
+        response_data = {
+            "authors": [{
+                "name": author.name,
+                "slug": author.slug,
+                "book_count": author.book_count,
+            } for author in authors],
+            "total_authors": authors_query.order_by(None).count(),
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor
+        }
+        if include_letters:
+            initial = func.substr(Authors.sort_name, 1, 1)
+            response_data["letters"] = {
+                letter.upper(): count for letter, count in
+                session.query(initial, func.count()).filter(Authors.book_count > 0).group_by(initial)
+            }
+        return jsonify(response_data)
+    finally:
+        session.close()
 
 
 @authors_bp.route('/api/authors/<string:author_name>', methods=['GET'])
 @login_required
+@catalog_response()
 def get_author_books(author_name):
     """
     Returns all books by a specific author.
     """
     session = get_session()
-    normalized_author_name = author_name.replace('-', ' ').lower()
-    author_query = session.query(EpubMetadata).filter(
-        EpubMetadata.authors.ilike(f"%{normalized_author_name}%")
-    ).all()
-    if not author_query:
-        return jsonify({"error": f"No books found for author: {author_name}"}), 404
-    books = [{
-        "id": book.id,
-        "title": book.title,
-        "authors": book.authors.split(", "),
-        "series": book.series,
-        "seriesindex": book.seriesindex,
-        "coverUrl": f"/api/covers/{book.identifier}",
-        "relative_path": book.relative_path,
-        "identifier": book.identifier,
-    } for book in author_query]
-    return jsonify({
-        "author": author_name,
-        "books": books,
-        "total_books": len(books)
-    }), 200
+    try:
+        author_query = session.query(EpubMetadata).filter(
+            author_books_filter(author_name)
+        ).order_by(*BOOK_SORT_COLUMNS).all()
+        if not author_query:
+            return jsonify({"error": f"No books found for author: {author_name}"}), 404
+        books = [{
+            "id": book.id,
+            "title": book.title,
+            "authors": book.authors.split(", "),
+            "series": book.series,
+            "seriesindex": book.seriesindex,
+            "coverUrl": get_cover_url(book.identifier, book.cover_image_path),
+            "relative_path": book.relative_path,
+            "identifier": book.identifier,
+        } for book in author_query]
+        return jsonify({
+            "author": author_name,
+            "books": books,
+            "total_books": len(books)
+        }), 200
+    finally:
+        session.close()
@@ -6,8 +6,11 @@ from models.progress_mapping import ProgressMapping
 from models.users import Users
 from models.requests import Requests
 from functions.db import get_session
-from functions.book_management import update_book_progress_state, get_book_progress_record
+from functions.book_management import update_book_progress_state, get_book_progress_record, get_book_progress_records, BOOK_SORT_COLUMNS, get_cover_url
+from functions.pagination import paginate_keyset, paginate_ranked, encode_cursor, cursor_values, nulls_sort_last, InvalidCursor
+from functions.search import apply_search
 from functions.roles import login_required
+from functions.catalog import catalog_response
 from functions.utils import update_redis_cache
 from config.config import config, str_to_bool
 from config.logger import logger
@@ -15,7 +18,8 @@ import ebookmeta
 import os
 import base64
 import secrets
-from functions.metadata.scan import get_metadata, add_new_db_entry, get_image_save_path, save_cover_image
+import itertools
+from functions.metadata.scan import get_metadata, add_new_db_entry, get_image_save_path, save_cover_image, walk_epubs, get_file_manifest
 from urllib.parse import unquote
 
 books_bp = Blueprint('books', __name__)
@@ -23,15 +27,22 @@ books_bp = Blueprint('books', __name__)
 
 @books_bp.route('/api/books', methods=['GET'])
 @login_required
+@catalog_response(user_specific=True)
 def get_books(token_state):
     """
     Returns a JSON response of books with optional search and pagination.
 
     If 'favorites' is a query parameter, limits results to only those books
-    marked as a favorite for the logged-in user. Can combine with 'query' filter.
+    marked as a favorite for the logged-in user. Can combine with 'query' filter,
+    which matches the start of words in the title, authors and series and sorts by relevance.
+
+    Pages can be requested by 'offset', or by passing a 'cursor' (or 'before') token from a previous
+    response, which stays fast however deep into the library the page is.
     """
     query = request.args.get('query', '', type=str)
     offset = request.args.get('offset', 0, type=int)
+    cursor = request.args.get('cursor', None, type=str)
+    before = request.args.get('before', None, type=str)
     limit = request.args.get('limit', 18, type=int)
     favorites_queried = str_to_bool(request.args.get('favorites', False))
     finished_queried = str_to_bool(request.args.get('finished', False))
@@ -69,30 +80,39 @@ def get_books(token_state):
                     conditions.append(ProgressMapping.is_finished.is_(False))
                 return q.join(ProgressMapping, onclause).filter(*conditions)
             books_query = _books_query_filters(books_query, user_id, filter_flags)
-        if query:
-            query_like = f"%{query}%"
-            books_query = books_query.filter(
-                (EpubMetadata.title.ilike(query_like)) |
-                (EpubMetadata.authors.ilike(query_like)) |
-                (EpubMetadata.series.ilike(query_like))
-            )
-        books_query = books_query.order_by(
-            EpubMetadata.authors,
-            EpubMetadata.series,
-            EpubMetadata.seriesindex,
-            EpubMetadata.title
-        )
-        if books_query.limit(1).first() is None:
+        try:
+            if query:
+                # Search results are ordered by relevance, with cursors holding each book's position in the results
+                books_query, relevance = apply_search(books_query, query, session)
+                books, book_cursors, next_cursor, prev_cursor = paginate_ranked(
+                    books_query, [*relevance, *BOOK_SORT_COLUMNS], limit, after=cursor, before=before, offset=offset
+                )
+            elif cursor or before:
+                books, next_cursor, prev_cursor = paginate_keyset(
+                    books_query, BOOK_SORT_COLUMNS, limit,
+                    after=cursor, before=before, nulls_last=nulls_sort_last(session)
+                )
+                book_cursors = [encode_cursor(cursor_values(book, BOOK_SORT_COLUMNS)) for book in books]
+            else:
+                books_query = books_query.order_by(*BOOK_SORT_COLUMNS)
+                books = books_query.offset(offset).limit(limit).all()
+                book_cursors = [encode_cursor(cursor_values(book, BOOK_SORT_COLUMNS)) for book in books]
+                next_cursor = book_cursors[-1] if len(books) == limit else None
+                prev_cursor = book_cursors[0] if books and offset > 0 else None
+        except InvalidCursor as e:
+            return jsonify({"error": str(e)}), 400
+        first_page = offset == 0 and not (cursor or before)
+        if not books and (first_page or books_query.limit(1).first() is None):
             return jsonify({"message": "No books matching the specified query were found."}), 200
-        books = books_query.offset(offset).limit(limit).all()
+        progress_records = {}
+        if token_state != "no_token" and not (finished_queried and favorites_queried):
+            progress_records = get_book_progress_records(token_state["user_id"], [book.id for book in books], session)
         book_list = []
-        for book in books:
+        for book, book_cursor in zip(books, book_cursors):
             book_progress_finished = False if finished_queried is False else True
             book_progress_favorite = False if favorites_queried is False else True
             if token_state != "no_token":
-                book_progress = None
-                if not book_progress_finished or not book_progress_favorite:
-                    book_progress = get_book_progress_record(token_state, book.identifier, session)
+                book_progress = progress_records.get(book.id)
                 if not book_progress_favorite:
                     book_progress_favorite = book_progress.marked_favorite if book_progress is not None else False
                 if not book_progress_finished:
@@ -103,14 +123,17 @@ def get_books(token_state):
                 "authors": book.authors.split(", "),
                 "series": book.series,
                 "seriesindex": book.seriesindex,
-                "coverUrl": f"/api/covers/{book.identifier}",
+                "coverUrl": get_cover_url(book.identifier, book.cover_image_path),
                 "relative_path": book.relative_path,
                 "identifier": book.identifier,
                 "is_finished": book_progress_finished,
                 "marked_favorite": book_progress_favorite,
+                "cursor": book_cursor,
             })
         return jsonify({
-            "books": book_list
+            "books": book_list,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor
         })
     except Exception as e:
         logger.exception(e)
@@ -139,18 +162,11 @@ def upload_file(token_state):
         if not file.filename.lower().endswith('.epub'):
             return jsonify({'error': 'Only .epub files are allowed'}), 400
         filename = file.filename
-        existing_upload_files = []
-        existing_basedir_files = []
-        for root, dirs, files in os.walk(config.BASE_DIRECTORY):
-            existing_basedir_files.extend([f.lower() for f in files if f.endswith('.epub')])
-        for root, dirs, files in os.walk(config.UPLOADS_DIRECTORY):
-            existing_upload_files.extend([f.lower() for f in files if f.endswith('.epub')])
-        if filename.lower() in existing_basedir_files:
-            return jsonify({
-                'error': 'A file with this name already exists in the library',
-                'filename': filename
-            }), 409
-        if filename.lower() in existing_upload_files:
+        existing_files = itertools.chain(
+            walk_epubs(config.BASE_DIRECTORY, exclude_patterns=[], stat_files=False),
+            walk_epubs(config.UPLOADS_DIRECTORY, exclude_patterns=[], stat_files=False)
+        )
+        if any(os.path.basename(path).lower() == filename.lower() for path, _ in existing_files):
             return jsonify({
                 'error': 'A file with this name already exists in the library',
                 'filename': filename
@@ -232,6 +248,8 @@ def add_book(token_state):
     try:
         book_file = os.path.join(config.BASE_DIRECTORY, relative_path)
         metadata = get_metadata(book_file, config.BASE_DIRECTORY)
+        # Record the manifest so the next scan recognises the file instead of re-reading it
+        metadata.update(get_file_manifest(book_file))
         if new_title:
             metadata['title'] = new_title
         if new_authors:
@@ -307,6 +325,8 @@ def edit_book_metadata(token_state):
                     new_cover_bytes = new_cover.read()
                     book.cover_image_data = new_cover_bytes
             ebookmeta.set_metadata(book_file, book)
+            for key, value in get_file_manifest(book_file).items():
+                setattr(book_record, key, value)
         if new_title:
             book_record.title = new_title
         if new_authors:
@@ -1,9 +1,14 @@
 import os
-from flask import Blueprint, Response, current_app as app, send_from_directory, jsonify, abort, url_for, request
+import re
+import hashlib
+from functools import lru_cache
+from flask import Blueprint, Response, current_app as app, send_file, send_from_directory, jsonify, abort, url_for, request, redirect
 from models.epub_metadata import EpubMetadata
 from functions.db import get_session
 from functions.roles import login_required
 from functions.utils import update_redis_cache, invalidate_redis_cache
+from functions.book_management import get_cover_url
+from functions.metadata.scan import get_image_save_path
 from config.config import config
 
 media_bp = Blueprint('media', __name__)
@@ -20,40 +25,87 @@ def get_redis_cache(identifier, cache_name):
     return redis_client.hget(cache_name, identifier)
 
 
+# How long browsers may reuse a cover before revalidating it
+COVER_MAX_AGE = 259200
+# Token-addressed covers never change, so they are cached for a year
+COVER_FILE_MAX_AGE = 31536000
+COVER_TOKEN_PATTERN = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+@lru_cache(maxsize=1)
+def load_placeholder(static_folder):
+    placeholder_path = os.path.join(static_folder, 'placeholder.jpg')
+    with open(placeholder_path, 'rb') as f:
+        placeholder_image = f.read()
+    return placeholder_image, hashlib.sha1(placeholder_image).hexdigest()
+
+
+def placeholder_response():
+    placeholder_image, placeholder_etag = load_placeholder(app.static_folder)
+    response = Response(placeholder_image, mimetype='image/jpeg', headers={
+        "Cache-Control": f"public, max-age={COVER_MAX_AGE}"
+    })
+    response.set_etag(placeholder_etag)
+    return response.make_conditional(request)
+
+
+def cover_file_response(path, max_age=COVER_MAX_AGE):
+    """
+    Streams a cover file with send_file, which answers conditional and range requests itself.
+    The ETag is the cover's token filename, which changes whenever the cover does.
+    """
+    cover_image_path = os.path.join(config.COVER_BASE_DIRECTORY, path)
+    if not os.path.isfile(cover_image_path):
+        return None
+    token = os.path.splitext(os.path.basename(path))[0]
+    return send_file(cover_image_path, mimetype="image/webp", conditional=True, etag=token, max_age=max_age)
+
+
+@media_bp.route('/api/covers/file/<string:cover_token>.webp', methods=['GET'])
+def get_cover_file(cover_token):
+    """
+    Serve a cover by its token filename, as linked from book listings and OPDS feeds.
+    The path is derived from the token, so no database or Redis lookup is needed.
+    """
+    if not COVER_TOKEN_PATTERN.match(cover_token):
+        abort(404, description="Cover not found.")
+    response = cover_file_response(get_image_save_path(cover_token).as_posix(), max_age=COVER_FILE_MAX_AGE)
+    if response is None:
+        # Covers are written after the commit that links them, so the file may not exist yet.
+        # The placeholder must not be cached under a URL that will soon hold the real cover.
+        response = placeholder_response()
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+    response.cache_control.immutable = True
+    return response
+
+
 @media_bp.route('/api/covers/<string:book_identifier>', methods=['GET'])
 def get_cover(book_identifier):
     """
-    Serve cover images with browser-side caching enabled to reduce repeated requests.
+    Redirect to the token URL of a book's cover, or serve the placeholder if it has none.
+    Kept for clients holding URLs from before covers were token-addressed.
     """
-    def _return_placeholder():
-        placeholder_path = os.path.join(app.static_folder, 'placeholder.jpg')
-        with open(placeholder_path, 'rb') as f:
-            placeholder_image = f.read()
-        return Response(placeholder_image, mimetype='image/jpeg', headers={
-            "Cache-Control": "public, max-age=259200"
-        })
-    def _get_image_from_path(path):
-        cover_image_path = os.path.join(config.COVER_BASE_DIRECTORY, path)
-        if not os.path.isfile(cover_image_path):
+    def _redirect_to_cover(path):
+        if not os.path.isfile(os.path.join(config.COVER_BASE_DIRECTORY, path)):
             invalidate_redis_cache(book_identifier)
-            return _return_placeholder()
-        with open(cover_image_path, 'rb') as f:
-            cover_image = f.read()
-            return Response(cover_image, mimetype="image/webp", headers={
-                "Cache-Control": "public, max-age=259200"
-            })
+            return placeholder_response()
+        response = redirect(get_cover_url(book_identifier, path), code=302)
+        # The cover behind an identifier changes when it is edited, so the redirect must not be reused
+        response.headers["Cache-Control"] = "no-cache"
+        return response
     cover_image_path = get_redis_cache(book_identifier, "image_path_cache")
     if cover_image_path:
-        return _get_image_from_path(cover_image_path)
+        return _redirect_to_cover(cover_image_path)
     session = get_session()
     try:
         book_record = session.query(EpubMetadata).filter_by(identifier=str(book_identifier)).first()
         if not book_record or not book_record.cover_image_path:
-            return _return_placeholder()
+            return placeholder_response()
         meta = {'identifier': book_identifier, 'cover_image_path': book_record.cover_image_path,
                 'relative_path': book_record.relative_path}
         update_redis_cache(meta)
-        return _get_image_from_path(book_record.cover_image_path)
+        return _redirect_to_cover(book_record.cover_image_path)
     finally:
         session.close()
 
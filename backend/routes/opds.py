@@ -1,11 +1,12 @@
 import binascii
 import base64
 import uuid
+from functools import wraps
 from flask import Blueprint, request, make_response, current_app, Response
 from typing import cast
 from functions.db import get_session
 from functions.init import CustomFlask
-from bcrypt import checkpw
+from functions.passwords import check_password, rehash_if_needed
 from models.users import Users
 from datetime import datetime, timezone
 from config.logger import logger
@@ -14,10 +15,22 @@ from models.epub_metadata import EpubMetadata
 from urllib.parse import urljoin, quote
 from sqlalchemy.exc import SQLAlchemyError
 from redis.exceptions import RedisError
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, select
 from config.config import config
+from functions.book_management import BOOK_SORT_COLUMNS, author_books_filter, get_cover_url
+from models.authors import Authors
+from models.series import Series, series_name_key
+from functions.pagination import paginate_keyset, nulls_sort_last, InvalidCursor
+from functions.catalog import catalog_response
+from functions.principals import get_user_principal, credential_digest, password_tag_for
+
+OPDS_LAST_LOGIN_INTERVAL = 900
+
 
 def basic_auth():
+    """
+    Authenticates the request's Basic credentials, returning the user's id or an error response.
+    """
     if not config.OPDS_ENABLED:
         logger.warning("OPDS not enabled!")
         response = make_response('OPDS Feature Not Enabled', 501)
@@ -46,44 +59,40 @@ def basic_auth():
         response.headers['WWW-Authenticate'] = 'Basic realm="OPDS Catalog"'
         return response
 
-    # Check Redis for an existing session
-    opds_session_data = redis.get(f"opds_user_session:{username}")
-    if opds_session_data:
-        try:
-            user_id = int(opds_session_data)
-            session = get_session()
-            try:
-                user = session.query(Users).filter(Users.id == user_id).first()
-                if user:
-                    return user
-            finally:
-                session.close()
-        except ValueError:
-            # Invalid session data in Redis
-            redis.delete(f"opds_user_session:{username}")
-
-    # If no session found in Redis, validate credentials against database
+    # Credentials that passed bcrypt are remembered under an HMAC of the username and password, and stay
+    # valid only while the user's password hash is unchanged
+    credential_key = f"opds_credentials:{credential_digest(f'{username}:{password}')}"
+    try:
+        cached_credentials = redis.get(credential_key)
+        if cached_credentials:
+            user_id, password_tag = cached_credentials.split(':', 1)
+            principal = get_user_principal(int(user_id))
+            if principal and principal.get("password_tag") == password_tag:
+                record_opds_login(redis, int(user_id))
+                return int(user_id)
+            redis.delete(credential_key)
+    except (RedisError, ValueError) as e:
+        logger.debug(f"OPDS credential cache lookup failed: {e}")
+
     session = get_session()
     try:
         user = session.query(Users).filter((Users.username == username) | (Users.email == username)).first()
 
         # Use constant-time comparison for password check
-        if not user or not checkpw(password.encode('utf-8'), user.password_hash.encode('utf-8')):
+        if not user or not check_password(password, user.password_hash):
             logger.error("User auth failed")
             response = make_response('', 401)
             response.headers['WWW-Authenticate'] = 'Basic realm="OPDS Catalog"'
             return response
+        rehashed_password = rehash_if_needed(password, user.password_hash)
+        if rehashed_password:
+            user.password_hash = rehashed_password
+            session.commit()
 
-        # Create and store session in Redis with both username and session token
-        session_token = str(uuid.uuid4())
-        redis_key = f"opds_user_session:{username}:{session_token}"
-        redis.set(redis_key, user.id, ex=app.config.get('SESSION_LIFETIME', 86400))
-
-        # Update last_login timestamp
-        user.last_login = datetime.now(timezone.utc)
-        session.commit()
-
-        return user
+        redis.set(credential_key, f"{user.id}:{password_tag_for(user.password_hash)}",
+                  ex=app.config.get('SESSION_LIFETIME', 86400))
+        record_opds_login(redis, user.id)
+        return user.id
 
     except SQLAlchemyError as e:
         logger.error(f"Database error during Basic Auth: {str(e)}")
@@ -104,16 +113,46 @@ def basic_auth():
         session.close()
 
 
+def record_opds_login(redis, user_id):
+    """
+    Updates the user's last_login, at most once per OPDS_LAST_LOGIN_INTERVAL seconds.
+    """
+    if not redis.set(f"opds_last_login:{user_id}", 1, nx=True, ex=OPDS_LAST_LOGIN_INTERVAL):
+        return
+    session = get_session()
+    try:
+        session.query(Users).filter(Users.id == user_id).update(
+            {Users.last_login: datetime.now(timezone.utc)}, synchronize_session=False
+        )
+        session.commit()
+    except SQLAlchemyError as e:
+        session.rollback()
+        logger.warning(f"Failed to update last_login for UID {user_id}: {e}")
+    finally:
+        session.close()
+
+
+def opds_auth_required(func):
+    """
+    Runs basic_auth before the view, returning its error response if authentication fails.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        user_id = basic_auth()
+        if not isinstance(user_id, int):
+            return user_id
+        return func(*args, **kwargs)
+    return wrapper
+
+
 opds_bp = Blueprint('opds', __name__)
 @opds_bp.route('/opds', methods=['GET'])
+@opds_auth_required
+@catalog_response()
 def opds_root():
     """
     Root OPDS feed that provides navigation to other feeds
     """
-    user = basic_auth()
-    if not isinstance(user, Users):
-        return user  # Return error response if authentication failed
-
     # Create the root element with necessary namespaces
     feed = ElementTree.Element('feed', {
         'xmlns': 'https://www.w3.org/2005/Atom',
@@ -147,27 +186,22 @@ def opds_root():
 
 
 @opds_bp.route('/opds/all', methods=['GET'])
+@opds_auth_required
+@catalog_response()
 def opds_all_books():
     """
     OPDS feed that lists all available books
     """
-    user = basic_auth()
-    if not isinstance(user, Users):
-        return user
     session = get_session()
     try:
         # Query books with pagination
-        books_query = session.query(EpubMetadata).order_by(
-            EpubMetadata.authors,
-            EpubMetadata.series,
-            EpubMetadata.seriesindex,
-            EpubMetadata.title
-        )
+        books_query = session.query(EpubMetadata).order_by(*BOOK_SORT_COLUMNS)
         books, feed = setup_feed(
             books_query,
             'All Books',
             'opds/all',
-            'opds'
+            'opds',
+            sort_columns=BOOK_SORT_COLUMNS
         )
         for book in books:
             add_book_entries(feed, book)
@@ -178,28 +212,28 @@ def opds_all_books():
 
 
 @opds_bp.route('/opds/authors', methods=['GET'])
+@opds_auth_required
+@catalog_response()
 def opds_get_authors():
-    user = basic_auth()
-    if not isinstance(user, Users):
-        return user
     session = get_session()
     try:
-        authors_query = session.query(EpubMetadata.authors).distinct().order_by(
-            EpubMetadata.authors
-        )
+        authors_query = session.query(Authors.name, Authors.sort_name, Authors.id).filter(
+            Authors.book_count > 0
+        ).order_by(Authors.sort_name, Authors.id)
         authors, feed = setup_feed(
             authors_query,
             'Authors',
             'opds/authors',
-            'opds'
+            'opds',
+            sort_columns=(Authors.sort_name, Authors.id)
         )
         for author in authors:
             entry = ElementTree.SubElement(feed, 'entry')
-            ElementTree.SubElement(entry, 'title').text = author[0]
-            author_uuid = uuid.uuid5(uuid.NAMESPACE_URL, f"author:{author[0]}")
+            ElementTree.SubElement(entry, 'title').text = author.name
+            author_uuid = uuid.uuid5(uuid.NAMESPACE_URL, f"author:{author.name}")
             ElementTree.SubElement(entry, 'id').text = f'urn:uuid:{author_uuid}'
             ElementTree.SubElement(entry, 'updated').text = datetime.now(timezone.utc).isoformat() + 'Z'
-            add_link(entry, 'subsection', urljoin(request.url_root, f'opds/authors/{quote(author[0])}'),
+            add_link(entry, 'subsection', urljoin(request.url_root, f'opds/authors/{quote(author.name)}'),
                      'application/atom+xml;profile=opds-catalog;kind=acquisition')
         return Response(ElementTree.tostring(feed, encoding='unicode'),
                         mimetype='application/atom+xml')
@@ -208,10 +242,9 @@ def opds_get_authors():
 
 
 @opds_bp.route('/opds/authors/<string:author_name>', methods=['GET'])
+@opds_auth_required
+@catalog_response()
 def opds_get_author_name(author_name):
-    user = basic_auth()
-    if not isinstance(user, Users):
-        return user
     feed = ElementTree.Element('feed', {
         'xmlns': 'https://www.w3.org/2005/Atom',
         'xmlns:dcterms': 'https://purl.org/dc/terms/',
@@ -241,21 +274,20 @@ def opds_get_author_name(author_name):
 
 
 @opds_bp.route('/opds/authors/<string:author_name>/all', methods=['GET'])
+@opds_auth_required
+@catalog_response()
 def opds_get_author_name_all(author_name):
-    user = basic_auth()
-    if not isinstance(user, Users):
-        return user
     session = get_session()
     try:
-        normalized_author_name = author_name.replace('-', ' ').lower()
         books_query = session.query(EpubMetadata).filter(
-            EpubMetadata.authors.ilike(f"%{normalized_author_name}%")
-        )
+            author_books_filter(author_name)
+        ).order_by(*BOOK_SORT_COLUMNS)
         books, feed = setup_feed(
             books_query,
             author_name,
             f'opds/authors/{author_name}/all',
-            f'opds/authors/{author_name}'
+            f'opds/authors/{author_name}',
+            sort_columns=BOOK_SORT_COLUMNS
         )
         for book in books:
             add_book_entries(feed, book)
@@ -266,33 +298,29 @@ def opds_get_author_name_all(author_name):
 
 
 @opds_bp.route('/opds/authors/<string:author_name>/series', methods=['GET'])
+@opds_auth_required
+@catalog_response()
 def opds_get_authors_by_series(author_name):
-    user = basic_auth()
-    if not isinstance(user, Users):
-        return user
     session = get_session()
     try:
-        normalized_author_name = author_name.replace('-', ' ').lower()
-        series_query = session.query(EpubMetadata.series).distinct().filter(and_(
-            func.trim(EpubMetadata.series) != "",
-            EpubMetadata.series.is_not(None),
-            EpubMetadata.authors.ilike(f"%{normalized_author_name}%")
-        ))
+        series_query = session.query(Series.name, Series.sort_name, Series.id).filter(
+            Series.id.in_(select(EpubMetadata.series_id).where(author_books_filter(author_name)))
+        ).order_by(Series.sort_name, Series.id)
         series, feed = setup_feed(
             series_query,
             'Series',
             f'opds/authors/{author_name}/series',
-            f'opds/authors/{author_name}'
+            f'opds/authors/{author_name}',
+            sort_columns=(Series.sort_name, Series.id)
         )
-        for series_name in series:
-            logger.debug(series_name)
+        for series_entry in series:
             entry = ElementTree.SubElement(feed, 'entry')
-            ElementTree.SubElement(entry, 'title').text = series_name[0]
-            series_uuid = uuid.uuid5(uuid.NAMESPACE_URL, f"series:{series_name[0]}")
+            ElementTree.SubElement(entry, 'title').text = series_entry.name
+            series_uuid = uuid.uuid5(uuid.NAMESPACE_URL, f"series:{series_entry.name}")
             ElementTree.SubElement(entry, 'id').text = f'urn:uuid:{series_uuid}'
             ElementTree.SubElement(entry, 'updated').text = datetime.now(timezone.utc).isoformat() + 'Z'
             add_link(entry, 'subsection',
-                     urljoin(request.url_root, f'opds/authors/{author_name}/series/{quote(series_name[0])}'),
+                     urljoin(request.url_root, f'opds/authors/{author_name}/series/{quote(series_entry.name)}'),
                      'application/atom+xml;profile=opds-catalog;kind=acquisition')
         return Response(ElementTree.tostring(feed, encoding='unicode'),
                         mimetype='application/atom+xml')
@@ -301,27 +329,20 @@ def opds_get_authors_by_series(author_name):
 
 
 @opds_bp.route('/opds/authors/<string:author_name>/standalone', methods=['GET'])
+@opds_auth_required
+@catalog_response()
 def opds_get_authors_standalone(author_name):
-    user = basic_auth()
-    if not isinstance(user, Users):
-        return user
     session = get_session()
     try:
-        normalized_author_name = author_name.replace('-', ' ').lower()
         standalone_query = session.query(EpubMetadata).filter(and_(
-            or_(
-                EpubMetadata.series.is_(None),
-                and_(
-                    EpubMetadata.series.is_not(None),
-                    func.trim(EpubMetadata.series) == ""
-                )
-            ),
-            EpubMetadata.authors.ilike(f"%{normalized_author_name}%")
-        ))
+            EpubMetadata.series_id.is_(None),
+            author_books_filter(author_name)
+        )).order_by(*BOOK_SORT_COLUMNS)
         books, feed = setup_feed(
             standalone_query, 'Standalone Titles',
             f'opds/authors/{author_name}/standalone',
-            f'opds/authors/{author_name}'
+            f'opds/authors/{author_name}',
+            sort_columns=BOOK_SORT_COLUMNS
         )
         for book in books:
             add_book_entries(feed, book)
@@ -332,22 +353,21 @@ def opds_get_authors_standalone(author_name):
 
 
 @opds_bp.route('/opds/authors/<string:author_name>/series/<string:series_name>', methods=['GET'])
+@opds_auth_required
+@catalog_response()
 def opds_get_authors_series_titles(author_name, series_name):
-    user = basic_auth()
-    if not isinstance(user, Users):
-        return user
     session = get_session()
     try:
-        normalized_author_name = author_name.replace('-', ' ').lower()
         books_query = session.query(EpubMetadata).filter(and_(
-            EpubMetadata.authors.ilike(f"%{normalized_author_name}%"),
-            EpubMetadata.series == series_name
-        )).order_by(EpubMetadata.seriesindex)
+            author_books_filter(author_name),
+            EpubMetadata.series_id == select(Series.id).where(Series.name_key == series_name_key(series_name)).scalar_subquery()
+        )).order_by(EpubMetadata.seriesindex, EpubMetadata.id)
         books, feed = setup_feed(
             books_query,
             series_name,
             f'opds/authors/{author_name}/series/{series_name}',
-            f'opds/authors/{author_name}/series'
+            f'opds/authors/{author_name}/series',
+            sort_columns=(EpubMetadata.seriesindex, EpubMetadata.id)
         )
         for book in books:
             add_book_entries(feed, book)
@@ -365,11 +385,38 @@ def add_nav_entry(entry, title, link):
              'application/atom+xml;profile=opds-catalog;kind=acquisition')
 
 
-def setup_feed(query, title, link, up_link):
-    page = request.args.get('page', 1, type=int)
+def setup_feed(query, title, link, up_link, sort_columns=None):
+    """
+    Builds a paginated acquisition feed for the query.
+    With sort_columns, pages are linked by cursor so deep pages don't slow down; ?page=N is still honoured.
+    """
+    page = request.args.get('page', None, type=int)
     per_page = 30
-    query_count = query.count()
-    query_items = query.offset((page - 1) * per_page).limit(per_page).all()
+    prev_url = None
+    next_url = None
+    if sort_columns and page is None:
+        cursor = request.args.get('cursor', None, type=str)
+        before = request.args.get('before', None, type=str)
+        nulls_last = nulls_sort_last(query.session)
+        try:
+            query_items, next_cursor, prev_cursor = paginate_keyset(
+                query, sort_columns, per_page, after=cursor, before=before, nulls_last=nulls_last
+            )
+        except InvalidCursor:
+            logger.debug(f"Invalid OPDS cursor for {link}, returning the first page")
+            query_items, next_cursor, prev_cursor = paginate_keyset(query, sort_columns, per_page, nulls_last=nulls_last)
+        if prev_cursor:
+            prev_url = urljoin(request.url_root, f'{link}?before={prev_cursor}')
+        if next_cursor:
+            next_url = urljoin(request.url_root, f'{link}?cursor={next_cursor}')
+    else:
+        page = page or 1
+        query_count = query.count()
+        query_items = query.offset((page - 1) * per_page).limit(per_page).all()
+        if page > 1:
+            prev_url = urljoin(request.url_root, f'{link}?page={page - 1}')
+        if (page * per_page) < query_count:
+            next_url = urljoin(request.url_root, f'{link}?page={page + 1}')
     feed = ElementTree.Element('feed', {
         'xmlns': 'https://www.w3.org/2005/Atom',
         'xmlns:dcterms': 'https://purl.org/dc/terms/',
@@ -385,12 +432,10 @@ def setup_feed(query, title, link, up_link):
     add_link(feed, 'up', urljoin(request.url_root, up_link),
              'application/atom+xml;profile=opds-catalog;kind=navigation')
 
-    if page > 1:
-        prev_url = urljoin(request.url_root, f'{link}?page={page - 1}')
+    if prev_url:
         add_link(feed, 'previous', prev_url, 'application/atom+xml;profile=opds-catalog;kind=acquisition')
 
-    if (page * per_page) < query_count:
-        next_url = urljoin(request.url_root, f'{link}?page={page + 1}')
+    if next_url:
         add_link(feed, 'next', next_url, 'application/atom+xml;profile=opds-catalog;kind=acquisition')
     return query_items, feed
 
@@ -417,10 +462,10 @@ def add_book_entries(feed, book):
         ElementTree.SubElement(author, 'name').text = author_name
 
     # Add links for cover image and download
-    cover_url = urljoin(request.url_root, f'api/covers/{book.identifier}')
+    cover_url = urljoin(request.url_root, get_cover_url(book.identifier, book.cover_image_path).lstrip('/'))
     add_link(entry, 'http://opds-spec.org/image', cover_url, "image/webp")
 
-    thumbnail_url = urljoin(request.url_root, f'api/covers/{book.identifier}')
+    thumbnail_url = cover_url
     add_link(entry, 'http://opds-spec.org/image/thumbnail', thumbnail_url, "image/webp")
 
     # Add download link
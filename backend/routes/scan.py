@@ -1,9 +1,12 @@
-from flask import Blueprint, jsonify
-from functions.tasks.scan import scan_library_task
+from flask import Blueprint, jsonify, request
+from functions.tasks.scan import scan_library_task, sync_paths_task
+from functions.roles import login_required
 from celery_app import celery
 
 scan_bp = Blueprint('scan_bp', __name__)
 
+MAX_SYNC_PATHS = 1000
+
 
 @scan_bp.route('/scan-library', methods=['POST'])
 def trigger_scan_manually():
@@ -11,7 +14,32 @@ def trigger_scan_manually():
     return jsonify({"task_id": task.id}), 200
 
 
+@scan_bp.route('/scan-paths', methods=['POST'])
+@login_required(required_roles=["admin", "editor"])
+def trigger_path_sync():
+    """
+    Queues a sync of specific files or directories, relative to the library root, without a full scan.
+    Expects JSON: {"paths": ["Author/Book.epub", "Series/"], "reread": false}
+    """
+    data = request.get_json(silent=True) or {}
+    paths = data.get('paths')
+    if isinstance(paths, str):
+        paths = [paths]
+    if not paths or not isinstance(paths, list) or not all(isinstance(path, str) and path.strip() for path in paths):
+        return jsonify({"error": "paths must be a non-empty list of relative paths"}), 400
+    if len(paths) > MAX_SYNC_PATHS:
+        return jsonify({"error": f"At most {MAX_SYNC_PATHS} paths can be synced at once, use /scan-library instead"}), 400
+    task = sync_paths_task.delay(paths, bool(data.get('reread', False)))
+    return jsonify({"task_id": task.id}), 200
+
+
 @scan_bp.route('/scan-status/<task_id>', methods=['GET'])
 def get_scan_status(task_id):
+    """
+    Returns the task state, plus the scan's counts and phase timings while it runs (PROGRESS) and once done.
+    """
     result = celery.AsyncResult(task_id)
-    return jsonify({"state": result.state}), 200
+    response = {"state": result.state}
+    if isinstance(result.info, dict):
+        response["progress"] = result.info
+    return jsonify(response), 200
@@ -0,0 +1,91 @@
+from flask import Blueprint, jsonify, request
+from models.epub_metadata import EpubMetadata
+from models.series import Series, series_sort_name
+from functions.db import get_session
+from functions.roles import login_required
+from functions.pagination import paginate_keyset, InvalidCursor
+from functions.book_management import get_cover_url
+
+series_bp = Blueprint('series', __name__)
+
+MAX_SERIES_PAGE_SIZE = 200
+
+
+def _series_details(series, cover_identifier, cover_image_path):
+    return {
+        "id": series.id,
+        "name": series.name,
+        "book_count": series.book_count,
+        "min_index": series.min_index,
+        "max_index": series.max_index,
+        "coverUrl": get_cover_url(cover_identifier, cover_image_path) if cover_identifier else None,
+    }
+
+
+@series_bp.route('/api/series', methods=['GET'])
+@login_required
+def get_series():
+    """
+    Returns a page of series sorted alphabetically, optionally limited to names starting with 'prefix'.
+    Further pages are requested with the 'cursor' (or 'before') token from the previous response.
+    """
+    prefix = request.args.get('prefix', '', type=str)
+    cursor = request.args.get('cursor', None, type=str)
+    before = request.args.get('before', None, type=str)
+    limit = min(max(request.args.get('limit', 50, type=int), 1), MAX_SERIES_PAGE_SIZE)
+    session = get_session()
+    try:
+        series_query = session.query(
+            Series.id, Series.name, Series.sort_name, Series.book_count,
+            Series.min_index, Series.max_index, EpubMetadata.identifier, EpubMetadata.cover_image_path
+        ).outerjoin(EpubMetadata, EpubMetadata.id == Series.cover_book_id).filter(Series.book_count > 0)
+        if prefix:
+            series_query = series_query.filter(Series.sort_name.startswith(series_sort_name(prefix), autoescape=True))
+        try:
+            series_page, next_cursor, prev_cursor = paginate_keyset(
+                series_query, (Series.sort_name, Series.id), limit, after=cursor, before=before
+            )
+        except InvalidCursor as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify({
+            "series": [_series_details(series, series.identifier, series.cover_image_path) for series in series_page],
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor
+        })
+    finally:
+        session.close()
+
+
+@series_bp.route('/api/series/<int:series_id>', methods=['GET'])
+@login_required
+def get_series_books(series_id):
+    """
+    Returns a series and its books in reading order.
+    """
+    session = get_session()
+    try:
+        series = session.query(Series).filter(Series.id == series_id).first()
+        if not series:
+            return jsonify({"error": "Series not found"}), 404
+        books = session.query(EpubMetadata).filter(
+            EpubMetadata.series_id == series_id
+        ).order_by(EpubMetadata.seriesindex, EpubMetadata.id).all()
+        cover_book = next((book for book in books if book.id == series.cover_book_id), None)
+        return jsonify({
+            "series": _series_details(
+                series, cover_book and cover_book.identifier, cover_book and cover_book.cover_image_path
+            ),
+            "books": [{
+                "id": book.id,
+                "title": book.title,
+                "authors": book.authors.split(", "),
+                "series": book.series,
+                "seriesindex": book.seriesindex,
+                "coverUrl": get_cover_url(book.identifier, book.cover_image_path),
+                "relative_path": book.relative_path,
+                "identifier": book.identifier,
+            } for book in books],
+            "total_books": len(books)
+        }), 200
+    finally:
+        session.close()
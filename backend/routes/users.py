@@ -1,11 +1,11 @@
-import bcrypt
 import pyotp
 from flask import Blueprint, jsonify, request
 from sqlalchemy.exc import SQLAlchemyError
 from config.logger import logger
 from functions.roles import login_required
 from functions.db import get_session
-from functions.utils import hash_password, check_pw_complexity, encrypt_totp_secret, unlink_oidc
+from functions.utils import check_pw_complexity, encrypt_totp_secret, unlink_oidc
+from functions.passwords import hash_password, check_password
 from functions.extensions import limiter
 from models.users import Users
 
@@ -39,10 +39,10 @@ def change_password(token_state):
         if user_record.auth_type == "oidc":
             return jsonify({"error": "Unable to change your password while connected to OIDC. Please revert to a local account to change your password."}), 400
         current_hashed_password = user_record.password_hash
-        valid_old_pw = bcrypt.checkpw(old_password.encode('utf-8'), current_hashed_password.encode('utf-8'))
+        valid_old_pw = check_password(old_password, current_hashed_password)
         if not valid_old_pw:
             return jsonify({"error": "Current password is incorrect."}), 401
-        if bcrypt.checkpw(new_password.encode('utf-8'), current_hashed_password.encode('utf-8')):
+        if check_password(new_password, current_hashed_password):
             return jsonify({"error": "The new password cannot be the same as the current password."}), 400
         user_record.password_hash = hash_password(new_password)
         session.commit()
@@ -111,4 +111,52 @@ def test_scan_library_task_max_retries_exceeded(mock_request):
         # Verify logger exception was called
         mock_logger_exception.assert_called_once_with(
             "Maximum retries exceeded for task 'functions.tasks.scan.scan_library_task' after 5 attempts. Original DB Error: DB Error"
-        )
\ No newline at end of file
+        )
+
+def test_celery_scheduler_uses_reconcile_interval_with_watcher():
+    from unittest.mock import patch
+    from datetime import timedelta
+    from celery_app import make_celery
+    from config.config import config
+
+    with patch.object(config, 'SCHEDULER_ENABLED', True), \
+            patch.object(config, 'WATCHER_ENABLED', True), \
+            patch.object(config, 'WATCHER_RECONCILE_INTERVAL', 360):
+        celery = make_celery()
+
+        schedule = celery.conf['beat_schedule']['scan-library-periodically']['schedule']
+        assert schedule == timedelta(minutes=360)
+
+
+def test_lock_heartbeat_renews_lock_until_done():
+    import time
+    from functions.tasks.scan import lock_heartbeat
+
+    lock = MagicMock()
+    with lock_heartbeat(lock, interval=0.01):
+        time.sleep(0.1)
+    renewals = lock.reacquire.call_count
+    time.sleep(0.05)
+
+    assert renewals > 0
+    assert lock.reacquire.call_count == renewals
+
+
+def test_scan_library_task_queues_follow_up_when_locked():
+    from functions.tasks.scan import redis_lock_client
+
+    held = redis_lock_client.lock("scan_lock", timeout=5, thread_local=False)
+    assert held.acquire(blocking=False)
+    try:
+        with patch('functions.tasks.scan.scan_and_store_metadata') as mock_scan:
+            assert scan_library_task.run() == "scan_queued"
+            assert scan_library_task.run() == "scan_queued"
+        mock_scan.assert_not_called()
+    finally:
+        held.release()
+
+    with patch('functions.tasks.scan.scan_and_store_metadata', return_value={"counts": {}}), \
+            patch.object(scan_library_task, 'delay') as mock_delay:
+        scan_library_task.run()
+
+    mock_delay.assert_called_once_with("default")
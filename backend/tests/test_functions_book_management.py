@@ -12,3 +12,14 @@ def test_generate_sesion_id():
 
     assert is_valid_uuid(uuid) is True
 
+
+
+def test_get_book_progress_records(db_session):
+    from functions.book_management import get_book_progress_records
+
+    records = get_book_progress_records(2, [1, 50], db_session)
+
+    assert list(records) == [1]
+    assert records[1].is_finished is True
+    assert records[1].marked_favorite is True
+    assert get_book_progress_records(2, [], db_session) == {}
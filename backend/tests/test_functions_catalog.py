@@ -0,0 +1,50 @@
+def test_catalog_generation_bumps_on_commit(db_session):
+    from models.epub_metadata import EpubMetadata
+    from functions.catalog import get_catalog_generation
+    generation = get_catalog_generation()
+    book = EpubMetadata(identifier="catalog-test-1", title="Catalog Book", authors="Cat Alog",
+                        series="", seriesindex=0.0, relative_path="catalog/book.epub")
+    db_session.add(book)
+    db_session.commit()
+    assert get_catalog_generation() == generation + 1
+
+    db_session.commit()
+    assert get_catalog_generation() == generation + 1
+
+    db_session.delete(book)
+    db_session.commit()
+    assert get_catalog_generation() == generation + 2
+
+
+def test_catalog_response_not_modified(client):
+    response = client.get("/api/authors")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    cached = client.get("/api/authors")
+    assert cached.json == response.json
+    assert cached.headers["ETag"] == etag
+
+    not_modified = client.get("/api/authors", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.data == b""
+
+    # Proxies that compress the response weaken its ETag; If-None-Match uses weak comparison
+    weak_etag = etag if etag.startswith("W/") else f"W/{etag}"
+    assert client.get("/api/authors", headers={"If-None-Match": weak_etag}).status_code == 304
+
+
+def test_catalog_response_if_modified_since(client, db_session):
+    from models.epub_metadata import EpubMetadata
+    book = EpubMetadata(identifier="catalog-test-2", title="Dated Book", authors="Cat Alog",
+                        series="", seriesindex=0.0, relative_path="catalog/dated.epub")
+    db_session.add(book)
+    db_session.commit()
+
+    response = client.get("/api/books")
+    last_modified = response.headers["Last-Modified"]
+    assert client.get("/api/books", headers={"If-Modified-Since": last_modified}).status_code == 304
+    assert client.get("/api/books", headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"}).status_code == 200
+
+    db_session.delete(book)
+    db_session.commit()
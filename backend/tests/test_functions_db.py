@@ -25,4 +25,44 @@ def test_get_database_url_invalid_db_type():
 
     # Use pytest.raises to catch the ValueError
     with pytest.raises(ValueError, match="Unsupported DB_TYPE: unknown"):
-        get_database_url()
\ No newline at end of file
+        get_database_url()
+
+def test_get_engine_is_reused():
+    from functions.db import get_engine
+    assert get_engine() is get_engine()  # Ensure the engine is created once per process
+
+
+def test_get_session_shares_engine():
+    from functions.db import get_session, get_engine
+    session_one = get_session()
+    session_two = get_session()
+    try:
+        assert session_one is not session_two
+        assert session_one.get_bind() is get_engine()
+        assert session_two.get_bind() is get_engine()
+    finally:
+        session_one.close()
+        session_two.close()
+
+@patch("config.config.config.DB_TYPE", "postgres")
+@patch("config.config.config.DB_POOL_RECYCLE", 0)
+def test_get_engine_options_postgres():
+    from functions.db import get_engine_options
+    options = get_engine_options()
+    assert options["pool_recycle"] == 1800
+    assert options["pool_pre_ping"] is True
+
+@patch("config.config.config.DB_TYPE", "sqlite")
+def test_get_engine_options_sqlite():
+    from functions.db import get_engine_options
+    options = get_engine_options()
+    assert options["pool_pre_ping"] is False
+    assert "pool_recycle" not in options
+    assert options["connect_args"] == {"isolation_level": None}
+
+
+def test_engines_reset_after_fork():
+    from functions import db
+    engine = db.get_engine()
+    db._reset_engines_after_fork()
+    assert db.get_engine() is not engine
@@ -19,6 +19,26 @@ def test_init_rate_limit(test_app):
         init_rate_limit(test_app)
         assert test_app.config["RATELIMIT_ENABLED"] == config.RATE_LIMITER_ENABLED
 
+def test_init_uploads_symlink_created_concurrently(test_app, tmp_path):
+    import os
+    from unittest.mock import patch
+    from functions.init import init_uploads
+    uploads_directory = str(tmp_path / "uploads")
+    os.makedirs(uploads_directory)
+    real_symlink = os.symlink
+
+    def symlink_created_by_other_worker(src, dst):
+        real_symlink(src, dst)
+        raise FileExistsError(dst)
+
+    with patch("config.config.config.UPLOADS_ENABLED", True), \
+            patch("config.config.config.UPLOADS_DIRECTORY", uploads_directory), \
+            patch("config.config.config.BASE_DIRECTORY", str(tmp_path)), \
+            patch("functions.init.os.symlink", symlink_created_by_other_worker):
+        init_uploads(test_app)
+    assert test_app.config["UPLOADS_ENABLED"] is True
+    assert os.readlink(tmp_path / "_uploads") == uploads_directory
+
 def test_init_env_fail():
     from unittest.mock import patch
     with patch("config.config.config.BASE_URL", ""):
@@ -117,4 +117,314 @@ def test_scan_and_store_metadata_exception_handling():
         assert logged_message == "Error during library scan and metadata update: Simulated database failure"
 
     # Ensure session closes even after failure
-    mock_session.close.assert_called_once()
\ No newline at end of file
+    mock_session.close.assert_called_once()
+
+def test_scan_and_store_metadata_skips_unchanged_files(db_session):
+    from functions.metadata.scan import scan_and_store_metadata
+    from unittest.mock import patch
+    import os
+    current_file_path = os.path.abspath(__file__)
+    project_root = os.path.dirname(os.path.dirname(current_file_path))
+    scan_and_store_metadata(project_root)
+
+    # A second scan of an unchanged library should not open any ePub
+    with patch("functions.metadata.scan.get_metadata") as mock_get_metadata:
+        scan_and_store_metadata(project_root)
+        mock_get_metadata.assert_not_called()
+
+
+def test_get_file_hash_changes_with_content(tmp_path):
+    from functions.metadata.scan import get_file_hash, get_file_stat
+    test_file = tmp_path / "book.epub"
+    test_file.write_bytes(b"a" * 100000)
+    first_hash = get_file_hash(test_file, get_file_stat(test_file)['file_size'])
+    assert first_hash == get_file_hash(test_file, get_file_stat(test_file)['file_size'])
+    test_file.write_bytes(b"a" * 99999 + b"b")
+    assert first_hash != get_file_hash(test_file, get_file_stat(test_file)['file_size'])
+
+
+def test_iter_parsed_epubs_skips_unreadable_files(tmp_path):
+    from functions.metadata.scan import iter_parsed_epubs, get_file_stat
+    import os
+    current_file_path = os.path.abspath(__file__)
+    project_root = os.path.dirname(os.path.dirname(current_file_path))
+    good_epub = os.path.join(project_root, "tests", "epubs", "Test Book - Author One.epub")
+    bad_epub = tmp_path / "broken.epub"
+    bad_epub.write_bytes(b"not a zip file")
+    pending = [(good_epub, get_file_stat(good_epub)), (str(bad_epub), get_file_stat(bad_epub))]
+
+    results = dict(iter_parsed_epubs(pending, project_root))
+
+    assert results[good_epub]['title'] == "Test Book"
+    assert results[good_epub]['file_size'] == os.path.getsize(good_epub)
+    assert results[str(bad_epub)] is None
+
+
+def _copy_test_epubs(tmp_path, count):
+    import os
+    import shutil
+    source = os.path.join(os.path.dirname(os.path.abspath(__file__)), "epubs", "Test Book - Author One.epub")
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"book-{i}.epub"
+        shutil.copy(source, path)
+        paths.append(str(path))
+    return paths
+
+
+def test_iter_parsed_epubs_uses_worker_pool(tmp_path):
+    from concurrent.futures import ProcessPoolExecutor
+    from unittest.mock import patch
+    from functions.metadata.scan import iter_parsed_epubs, get_file_stat, PARALLEL_SCAN_MIN_FILES
+    paths = _copy_test_epubs(tmp_path, PARALLEL_SCAN_MIN_FILES + 4)
+    pending = ((path, get_file_stat(path)) for path in paths)
+
+    with patch("config.config.config.SCAN_WORKERS", 2), \
+            patch("functions.metadata.scan.ProcessPoolExecutor", wraps=ProcessPoolExecutor) as pool:
+        results = dict(iter_parsed_epubs(pending, str(tmp_path)))
+
+    pool.assert_called_once()
+    assert sorted(results) == sorted(paths)
+    assert all(metadata['title'] == "Test Book" for metadata in results.values())
+
+
+def _parse_in_daemon(paths, base_directory, queue):
+    from functions.metadata.scan import iter_parsed_epubs, get_file_stat
+    results = iter_parsed_epubs(((path, get_file_stat(path)) for path in paths), base_directory)
+    queue.put(sorted((path, metadata['title']) for path, metadata in results))
+
+
+def test_iter_parsed_epubs_in_daemonic_process(tmp_path):
+    import multiprocessing
+    from unittest.mock import patch
+    from functions.metadata.scan import PARALLEL_SCAN_MIN_FILES
+    # A daemonic process can't start the worker pool, so this covers the in-process fallback
+    paths = _copy_test_epubs(tmp_path, PARALLEL_SCAN_MIN_FILES)
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+
+    with patch("config.config.config.SCAN_WORKERS", 2):
+        process = context.Process(target=_parse_in_daemon, args=(paths, str(tmp_path), queue), daemon=True)
+        process.start()
+        results = queue.get(timeout=60)
+        process.join(10)
+
+    assert results == sorted((path, "Test Book") for path in paths)
+
+
+def test_scan_batch_writer_skips_duplicates_in_chunk(db_session):
+    from functions.metadata.scan import ScanBatchWriter
+    from models.epub_metadata import EpubMetadata
+
+    def _metadata(identifier, title):
+        return {
+            'title': title,
+            'authors': ["Batch Author"],
+            'series': '',
+            'seriesindex': 0.0,
+            'relative_path': f"batch/{identifier}.epub",
+            'cover_image_path': None,
+        }
+
+    writer = ScanBatchWriter(db_session, batch_size=10)
+    writer.insert("batch-book-1", _metadata("batch-book-1", "Batch Book 1"))
+    writer.insert("61cee114-a920-4427-809f-50da0678c004", _metadata("duplicate", "Duplicate Book"))
+    writer.insert("batch-book-2", _metadata("batch-book-2", "Batch Book 2"))
+    writer.flush()
+    db_session.commit()
+
+    assert writer.counts['inserted'] == 2
+    assert writer.counts['duplicates'] == 1
+    stored = db_session.query(EpubMetadata).filter(EpubMetadata.authors == "Batch Author").all()
+    assert sorted(book.title for book in stored) == ["Batch Book 1", "Batch Book 2"]
+    for book in stored:
+        db_session.delete(book)
+    db_session.commit()
+
+
+def test_scan_batch_writer_rolls_back_failed_chunk():
+    from functions.db import get_session
+    from functions.metadata.scan import ScanBatchWriter
+    from models.epub_metadata import EpubMetadata
+
+    def _metadata(identifier):
+        return {
+            'title': identifier,
+            'authors': ["Rollback Author"],
+            'series': '',
+            'seriesindex': 0.0,
+            'relative_path': f"rollback/{identifier}.epub",
+            'cover_image_path': None,
+        }
+
+    session = get_session()
+    try:
+        writer = ScanBatchWriter(session, batch_size=10)
+        writer.insert("rollback-book-1", _metadata("rollback-book-1"))
+        writer.flush()
+        writer.insert("rollback-book-2", _metadata("rollback-book-2"))
+        writer.insert("61cee114-a920-4427-809f-50da0678c004", _metadata("duplicate"))
+        writer.insert("rollback-book-3", _metadata("rollback-book-3"))
+        writer.flush()
+        assert writer.counts['inserted'] == 3
+        session.rollback()
+
+        # Releasing a chunk's savepoint must not commit it, nor the chunks before it
+        assert session.query(EpubMetadata).filter(EpubMetadata.authors == "Rollback Author").count() == 0
+    finally:
+        session.close()
+
+
+def test_scan_batch_writer_skips_conflicting_updates(db_session):
+    from functions.metadata.scan import ScanBatchWriter
+    from models.epub_metadata import EpubMetadata
+    books = [
+        EpubMetadata(identifier=f"update-book-{i}", title=f"Update Book {i}", authors="Update Author",
+                     series="", seriesindex=0.0, relative_path=f"update/{i}.epub")
+        for i in range(3)
+    ]
+    db_session.add_all(books)
+    db_session.commit()
+
+    writer = ScanBatchWriter(db_session, batch_size=10)
+    writer.update({'id': books[0].id, 'title': "Renamed Book"})
+    writer.update({'id': books[1].id, 'relative_path': "update/2.epub"})
+    writer.update({'id': books[2].id, 'title': "Renamed Book 2"})
+    writer.flush()
+    db_session.commit()
+
+    assert writer.counts['updated'] == 2
+    assert writer.counts['duplicates'] == 1
+    db_session.expire_all()
+    assert [book.title for book in books] == ["Renamed Book", "Update Book 1", "Renamed Book 2"]
+    assert books[1].relative_path == "update/1.epub"
+    for book in books:
+        db_session.delete(book)
+    db_session.commit()
+
+
+def test_walk_epubs_matches_case_insensitively_and_excludes(tmp_path):
+    from functions.metadata.scan import walk_epubs
+    import os
+    (tmp_path / "book.EPUB").write_bytes(b"")
+    (tmp_path / "notes.txt").write_bytes(b"")
+    (tmp_path / "@eaDir").mkdir()
+    (tmp_path / "@eaDir" / "thumb.epub").write_bytes(b"")
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "nested" / "other.epub").write_bytes(b"")
+    os.symlink(tmp_path, tmp_path / "nested" / "loop")
+
+    found = sorted(os.path.relpath(path, tmp_path) for path, _ in walk_epubs(str(tmp_path), exclude_patterns=["@eaDir"]))
+
+    assert found == ["book.EPUB", os.path.join("nested", "other.epub")]
+
+
+def test_walk_epubs_skips_symlinked_uploads(tmp_path):
+    from functions.metadata.scan import walk_epubs
+    import os
+    library = tmp_path / "library"
+    uploads = tmp_path / "uploads"
+    library.mkdir()
+    uploads.mkdir()
+    (library / "book.epub").write_bytes(b"")
+    (uploads / "pending.epub").write_bytes(b"")
+    os.symlink(uploads, library / "_uploads")
+
+    found = [os.path.relpath(path, library) for path, _ in walk_epubs(str(library), exclude_patterns=[])]
+
+    assert found == ["book.epub"]
+
+
+def test_sync_epub_paths_moves_and_removes(db_session, tmp_path):
+    from unittest.mock import patch
+    from functions.metadata.scan import sync_epub_paths, get_file_stat, get_file_hash
+    from models.epub_metadata import EpubMetadata
+    import shutil
+    library = tmp_path / "library"
+    (library / "old").mkdir(parents=True)
+    (library / "moved").mkdir()
+    book = library / "moved" / "book.epub"
+    book.write_bytes(b"sync_epub_paths test book")
+    file_stat = get_file_stat(book)
+    db_session.add(EpubMetadata(identifier="sync-test-book", title="Sync Test", authors="Sync Author",
+                                relative_path="old/book.epub", file_hash=get_file_hash(book, file_stat['file_size'])))
+    db_session.commit()
+
+    with patch('functions.metadata.scan.get_metadata') as mock_get_metadata:
+        counts = sync_epub_paths(str(library), ["old/book.epub", "moved/book.epub"])
+
+    mock_get_metadata.assert_not_called()
+    assert counts['updated'] == 1
+    db_session.expire_all()
+    record = db_session.query(EpubMetadata).filter_by(identifier="sync-test-book").first()
+    assert record.relative_path == "moved/book.epub"
+    assert record.file_size == file_stat['file_size']
+
+    shutil.rmtree(library / "moved")
+    counts = sync_epub_paths(str(library), ["moved"])
+
+    assert counts['removed'] == 1
+    db_session.expire_all()
+    assert db_session.query(EpubMetadata).filter_by(identifier="sync-test-book").first() is None
+
+
+def test_sync_epub_paths_applies_library_excludes(db_session, tmp_path):
+    from unittest.mock import patch
+    from functions.metadata.scan import sync_epub_paths
+    library = tmp_path / "library"
+    (library / "authors" / "drafts").mkdir(parents=True)
+    (library / "authors" / "drafts" / "draft.epub").write_bytes(b"draft")
+    (library / "authors" / "skip").mkdir()
+    (library / "authors" / "skip" / "book.epub").write_bytes(b"skipped")
+
+    with patch("config.config.config.SCAN_EXCLUDE", ["authors/drafts", "skip"]), \
+            patch("functions.metadata.scan.get_metadata") as mock_get_metadata:
+        counts = sync_epub_paths(str(library), ["authors", "authors/skip/book.epub"])
+
+    # Patterns with a path are matched against the path in the library, not in the synced directory
+    mock_get_metadata.assert_not_called()
+    assert counts['inserted'] == 0
+
+
+def test_scan_progress_charges_nested_phases_exclusively():
+    from unittest.mock import patch
+    from functions.metadata.scan import ScanProgress
+
+    clock = iter([0.0, 1.0, 3.0, 4.0, 10.0])
+    with patch('functions.metadata.scan.time.perf_counter', side_effect=lambda: next(clock)):
+        progress = ScanProgress()
+        with progress.phase('walk'):
+            with progress.phase('db_write'):
+                pass
+
+    # walk runs 1.0-3.0 and 4.0-10.0, db_write 3.0-4.0
+    assert progress.timings['walk'] == 8.0
+    assert progress.timings['db_write'] == 1.0
+
+
+def test_scan_batch_writer_calls_on_flush_per_chunk(db_session):
+    from unittest.mock import MagicMock
+    from functions.metadata.scan import ScanBatchWriter
+    from models.epub_metadata import EpubMetadata
+
+    on_flush = MagicMock()
+    writer = ScanBatchWriter(db_session, batch_size=2, on_flush=on_flush)
+    for i in range(3):
+        writer.insert(f"checkpoint-book-{i}", {
+            'title': f"Checkpoint Book {i}",
+            'authors': ["Checkpoint Author"],
+            'series': '',
+            'seriesindex': 0.0,
+            'relative_path': f"checkpoint/book-{i}.epub",
+            'cover_image_path': None,
+        })
+    assert on_flush.call_count == 1
+    writer.flush()
+    db_session.commit()
+
+    assert on_flush.call_count == 2
+    stored = db_session.query(EpubMetadata).filter(EpubMetadata.authors == "Checkpoint Author").all()
+    assert len(stored) == 3
+    for book in stored:
+        db_session.delete(book)
+    db_session.commit()
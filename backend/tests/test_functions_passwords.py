@@ -0,0 +1,57 @@
+def test_rehash_if_needed(monkeypatch):
+    from config.config import config
+    from functions.passwords import hash_password, check_password, needs_rehash, rehash_if_needed
+    monkeypatch.setattr(config, "BCRYPT_ROUNDS", 4)
+    password_hash = hash_password("P@ssw0rd")
+    assert password_hash.startswith("$2b$04$")
+    assert check_password("P@ssw0rd", password_hash)
+    assert not check_password("wrong", password_hash)
+    assert not check_password("P@ssw0rd", None)
+    assert rehash_if_needed("P@ssw0rd", password_hash) is None
+
+    monkeypatch.setattr(config, "BCRYPT_ROUNDS", 5)
+    assert needs_rehash(password_hash)
+    rehashed = rehash_if_needed("P@ssw0rd", password_hash)
+    assert rehashed.startswith("$2b$05$")
+    assert check_password("P@ssw0rd", rehashed)
+
+
+def test_password_hasher_queues_when_saturated(monkeypatch):
+    import threading
+    from config.config import config
+    from functions import passwords
+    monkeypatch.setattr(config, "PASSWORD_HASH_WORKERS", 1)
+    monkeypatch.setattr(passwords, "_executor", None)
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_check(password, password_hash):
+        started.set()
+        release.wait(5)
+        return True
+
+    monkeypatch.setattr(passwords, "_checkpw", slow_check)
+    completed = passwords.get_password_hasher_stats()["completed"]
+    workers = [threading.Thread(target=passwords.check_password, args=("P@ssw0rd", "$2b$04$hash")) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    started.wait(5)
+    stats = passwords.get_password_hasher_stats()
+    assert stats["running"] == 1
+    release.set()
+    for worker in workers:
+        worker.join()
+    stats = passwords.get_password_hasher_stats()
+    assert stats["running"] == 0
+    assert stats["completed"] == completed + 2
+
+
+def test_password_hasher_counts_failures(monkeypatch):
+    import pytest
+    from functions import passwords
+    stats = passwords.get_password_hasher_stats()
+    with pytest.raises(ValueError):
+        passwords.check_password("P@ssw0rd", "not a bcrypt hash")
+    after = passwords.get_password_hasher_stats()
+    assert after["failed"] == stats["failed"] + 1
+    assert after["completed"] == stats["completed"]
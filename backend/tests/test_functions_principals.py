@@ -0,0 +1,31 @@
+def test_principal_loaded_during_a_change_is_not_cached(db_session):
+    """
+    A principal loaded from the database while the user changes must not outlive the change in the caches
+    """
+    from unittest.mock import patch
+    from models.users import Users
+    import functions.principals as principals
+    principals.invalidate_user_principal(53)
+    load_principal = principals._load_principal
+
+    def load_then_change(user_id):
+        principal = load_principal(user_id)
+        user = db_session.query(Users).filter_by(id=53).first()
+        principals.revoke_user_tokens(user)
+        db_session.commit()
+        return principal
+
+    with patch("functions.principals._load_principal", side_effect=load_then_change):
+        stale = principals.get_user_principal(53)
+
+    assert principals.get_user_principal(53)["token_version"] == stale["token_version"] + 1
+
+
+def test_revoke_user_tokens_needs_commit(db_session):
+    from models.users import Users
+    from functions.principals import get_token_version, revoke_user_tokens
+    token_version = get_token_version(53)
+    user = db_session.query(Users).filter_by(id=53).first()
+    revoke_user_tokens(user)
+    db_session.rollback()
+    assert get_token_version(53) == token_version
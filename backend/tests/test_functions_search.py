@@ -0,0 +1,20 @@
+def test_get_search_terms_folds_case_and_accents():
+    from functions.search import get_search_terms
+    assert get_search_terms("Brontë, CHARLOTTE!") == ["bronte", "charlotte"]
+
+
+def test_apply_search_matches_word_prefixes(db_session):
+    from functions.search import apply_search
+    from models.epub_metadata import EpubMetadata
+    book = EpubMetadata(identifier="search-test-book", title="Les Misérables", authors="Victor Hugo",
+                        series="", seriesindex=0.0, relative_path="search/les-miserables.epub")
+    db_session.add(book)
+    db_session.commit()
+
+    query, _ = apply_search(db_session.query(EpubMetadata), "miser hug", db_session)
+    assert [result.identifier for result in query.all()] == ["search-test-book"]
+    query, _ = apply_search(db_session.query(EpubMetadata), "erables", db_session)
+    assert query.all() == []
+
+    db_session.delete(book)
+    db_session.commit()
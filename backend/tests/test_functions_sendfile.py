@@ -0,0 +1,68 @@
+import asyncio
+
+
+def _asgi_get(asgi_app, path, headers=None, method="GET"):
+    scope = {
+        "type": "http", "method": method, "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "scheme": "http", "server": ("localhost", 80), "http_version": "1.1",
+        "headers": [(b"host", b"localhost")] + [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+    }
+    response = {"body": b""}
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {k.decode().lower(): v.decode() for k, v in message["headers"]}
+        else:
+            response["body"] += message.get("body", b"")
+
+    asyncio.run(asgi_app(scope, receive, send))
+    return response
+
+
+def test_sendfile_middleware_streams_files(tmp_path):
+    from flask import Flask, send_from_directory
+    from asgiref.wsgi import WsgiToAsgi
+    from functions.sendfile import SendfileMiddleware, SENDFILE_CHUNK_SIZE
+    data = bytes(range(256)) * (SENDFILE_CHUNK_SIZE // 128)
+    (tmp_path / "book.epub").write_bytes(data)
+    flask_app = Flask(__name__)
+
+    @flask_app.route("/files/<path:filename>")
+    def serve_file(filename):
+        return send_from_directory(tmp_path, filename)
+
+    asgi_app = SendfileMiddleware(WsgiToAsgi(flask_app), flask_app)
+
+    response = _asgi_get(asgi_app, "/files/book.epub")
+    assert response["status"] == 200
+    assert response["body"] == data
+    assert response["headers"]["content-length"] == str(len(data))
+    assert "x-sendfile" not in response["headers"]
+
+    partial = _asgi_get(asgi_app, "/files/book.epub", headers={"Range": "bytes=100-299"})
+    assert partial["status"] == 206
+    assert partial["headers"]["content-range"] == f"bytes 100-299/{len(data)}"
+    assert partial["body"] == data[100:300]
+
+    head = _asgi_get(asgi_app, "/files/book.epub", method="HEAD")
+    assert head["status"] == 200
+    assert head["body"] == b""
+
+    not_modified = _asgi_get(asgi_app, "/files/book.epub", headers={"If-None-Match": response["headers"]["etag"]})
+    assert not_modified["status"] == 304
+    assert _asgi_get(asgi_app, "/files/missing.epub")["status"] == 404
+
+    precondition_failed = _asgi_get(asgi_app, "/files/book.epub", headers={"If-Match": '"other"'})
+    assert precondition_failed["status"] == 412
+    assert precondition_failed["body"] == b""
+    assert precondition_failed["headers"]["content-length"] == "0"
+    assert "x-sendfile" not in precondition_failed["headers"]
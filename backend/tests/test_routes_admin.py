@@ -209,6 +209,25 @@ def test_reset_user_password(client, db_session, headers):
     updated_user_hashed_pw = updated_user.password_hash
     assert bcrypt.checkpw("PASSWORD".encode('utf-8'),updated_user_hashed_pw.encode('utf-8'))
 
+def test_reset_user_password_revokes_tokens(client, headers):
+    """
+    Test that tokens issued before an admin password reset are rejected afterwards
+    """
+    from unittest.mock import patch
+    from routes.auth import generate_token
+    old_headers = {"Authorization": f"Bearer {generate_token(user_id=50, user_email='user50@example.com', user_role='user')}"}
+    response = client.post(
+        f"/api/admin/users/50/reset-password",
+        json={"new_password": "PASSWORD"},
+        headers=headers
+    )
+    assert response.status_code == 200
+
+    with patch("config.config.config.ALLOW_UNAUTHENTICATED", False):
+        assert client.get("/api/authors", headers=old_headers).status_code == 401
+        new_headers = {"Authorization": f"Bearer {generate_token(user_id=50, user_email='user50@example.com', user_role='user')}"}
+        assert client.get("/api/authors", headers=new_headers).status_code == 200
+
 def test_reset_user_password_generated(client, db_session, headers):
     """
     Test POST /api/admin/users/<user_id>/reset-password endpoint
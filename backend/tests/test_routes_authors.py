@@ -4,23 +4,17 @@ from unittest.mock import patch
 
 def test_get_authors_no_books(client):
     """
-    Test /api/authors when there are no books in the database (total_books == 0).
+    Test /api/authors when no author matches the requested prefix.
     """
-    from unittest.mock import patch
-    with patch("routes.authors.get_session") as mock_get_session:
-        # Mock the session
-        mock_session = mock_get_session.return_value
-        mock_session.query.return_value.count.return_value = 0
-
-        # Make a GET request to the endpoint
-        response = client.get("/api/authors")
+    response = client.get("/api/authors?prefix=zzzz")
 
-        # Verify the status code and response
-        assert response.status_code == 200
-        assert response.json == {
-            "authors": [],
-            "total_authors": 0
-        }
+    assert response.status_code == 200
+    assert response.json == {
+        "authors": [],
+        "total_authors": 0,
+        "next_cursor": None,
+        "prev_cursor": None
+    }
 
 def test_get_authors(client, headers):
     """
@@ -60,4 +54,53 @@ def test_get_author_books_not_exist(client):
     response = client.get(f"/api/authors/{encoded_author}",)
 
     assert response.status_code == 404
-    assert "No books found for author" in response.json["error"]
\ No newline at end of file
+    assert "No books found for author" in response.json["error"]
+def test_get_author_books_matches_whole_names(client, db_session):
+    from models.epub_metadata import EpubMetadata
+    from models.authors import Authors
+    books = [
+        EpubMetadata(identifier="author-test-1", title="Ann's Book", authors="Ann Lee",
+                     series="", seriesindex=0.0, relative_path="authors/ann.epub"),
+        EpubMetadata(identifier="author-test-2", title="Joanne's Book", authors="Joanne Lee, Ann Lee",
+                     series="", seriesindex=0.0, relative_path="authors/joanne.epub"),
+    ]
+    db_session.add_all(books)
+    db_session.commit()
+
+    response = client.get("/api/authors/joanne-lee")
+    assert response.status_code == 200
+    assert [book["title"] for book in response.json["books"]] == ["Joanne's Book"]
+    assert db_session.query(Authors).filter_by(name="Ann Lee").first().book_count == 2
+
+    for book in books:
+        db_session.delete(book)
+    db_session.commit()
+    assert db_session.query(Authors).filter_by(name="Ann Lee").first() is None
+
+
+def test_get_authors_pages_by_prefix(client, db_session):
+    from models.epub_metadata import EpubMetadata
+    books = [
+        EpubMetadata(identifier=f"prefix-test-{i}", title=f"Prefix Book {i}", authors=name,
+                     series="", seriesindex=0.0, relative_path=f"authors/prefix-{i}.epub")
+        for i, name in enumerate(["Quentin Aa", "quentin Bb", "Émile Quill", "Quincy Cc"])
+    ]
+    db_session.add_all(books)
+    db_session.commit()
+
+    response = client.get("/api/authors?prefix=qu&limit=2&letters=true")
+    assert response.status_code == 200
+    assert [author["name"] for author in response.json["authors"]] == ["Quentin Aa", "quentin Bb"]
+    assert response.json["total_authors"] == 3
+    assert response.json["letters"]["Q"] >= 3
+
+    response = client.get(f"/api/authors?prefix=qu&limit=2&cursor={response.json['next_cursor']}")
+    assert response.json["authors"] == [{"name": "Quincy Cc", "slug": "quincy-cc", "book_count": 1}]
+    assert response.json["next_cursor"] is None
+
+    response = client.get("/api/authors?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+    for book in books:
+        db_session.delete(book)
+    db_session.commit()
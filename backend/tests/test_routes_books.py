@@ -25,6 +25,23 @@ def test_get_one_book(client, db_session):
     assert len(response_data["books"]) == 1
     assert response_data["books"][0]["title"] == "Test Book 2"
 
+def test_get_books_cursor_pagination(client, db_session, headers):
+    first_page = client.get("/api/books?limit=1", headers=headers).json
+    assert first_page["prev_cursor"] is None
+    assert first_page["books"][0]["title"] == "Test Book"
+
+    second_page = client.get(f"/api/books?limit=1&cursor={first_page['next_cursor']}", headers=headers).json
+    assert second_page["books"][0]["title"] == "Test Book 2"
+    assert second_page["prev_cursor"] is not None
+
+    previous_page = client.get(f"/api/books?limit=1&before={second_page['prev_cursor']}", headers=headers).json
+    assert previous_page["books"][0]["title"] == "Test Book"
+    assert previous_page["prev_cursor"] is None
+
+def test_get_books_invalid_cursor(client, db_session, headers):
+    response = client.get("/api/books?cursor=not-a-cursor", headers=headers)
+    assert response.status_code == 400
+
 def test_get_favorites(client, db_session, headers):
     # Test query filter
     response = client.get(
@@ -30,6 +30,68 @@ def test_get_cover_without_cover_image(client):
     assert response.data == placeholder_data  # Validate it's indeed the placeholder image
     assert response.headers["Content-Type"] == "image/jpeg"  # Validate the MIME type is still JPEG
 
+def test_get_cover_placeholder_not_modified(client):
+    """
+    Test that a placeholder with a matching ETag is answered with 304 and no body.
+    """
+    response = client.get("/api/covers/nonexistent1234")
+    assert response.headers["ETag"]
+
+    response = client.get("/api/covers/nonexistent1234", headers={"If-None-Match": response.headers["ETag"]})
+    assert response.status_code == 304
+    assert response.data == b""
+
+def test_get_cover_file_by_token(client, tmp_path):
+    """
+    Test that token cover URLs are served from disk with year-long immutable caching.
+    """
+    from unittest.mock import patch
+    from functions.metadata.scan import get_image_save_path
+    with patch("config.config.config.COVER_BASE_DIRECTORY", tmp_path):
+        cover_path = tmp_path.joinpath(get_image_save_path("covertoken123"))
+        cover_path.parent.mkdir(parents=True)
+        cover_path.write_bytes(b"cover image")
+
+        response = client.get("/api/covers/file/covertoken123.webp")
+        assert response.status_code == 200
+        assert response.data == b"cover image"
+        assert response.headers["Content-Type"] == "image/webp"
+        assert "immutable" in response.headers["Cache-Control"]
+        assert "max-age=31536000" in response.headers["Cache-Control"]
+
+        assert client.get("/api/covers/file/bad.token.webp").status_code == 404
+
+        pending = client.get("/api/covers/file/notwrittenyet.webp")
+        assert pending.status_code == 200
+        assert pending.headers["Content-Type"] == "image/jpeg"
+        assert pending.headers["Cache-Control"] == "no-cache"
+
+def test_get_cover_redirects_to_token_url(client, db_session, tmp_path):
+    """
+    Test that the identifier cover URL redirects to the token URL of the book's cover.
+    """
+    from unittest.mock import patch
+    from functions.metadata.scan import get_image_save_path
+    cover_image_path = get_image_save_path("redirecttoken456").as_posix()
+    book = EpubMetadata(identifier="cover-redirect-book", title="Cover Redirect", authors="Cover Author",
+                        series="", seriesindex=0.0, relative_path="covers/redirect.epub",
+                        cover_image_path=cover_image_path)
+    db_session.add(book)
+    db_session.commit()
+    try:
+        with patch("config.config.config.COVER_BASE_DIRECTORY", tmp_path):
+            cover_path = tmp_path.joinpath(cover_image_path)
+            cover_path.parent.mkdir(parents=True)
+            cover_path.write_bytes(b"cover image")
+
+            response = client.get("/api/covers/cover-redirect-book")
+            assert response.status_code == 302
+            assert response.headers["Location"].endswith("/api/covers/file/redirecttoken456.webp")
+            assert response.headers["Cache-Control"] == "no-cache"
+    finally:
+        db_session.delete(book)
+        db_session.commit()
+
 def test_download_valid_book(client):
     """
     Test downloading a book with a valid identifier that exists in the database and filesystem.
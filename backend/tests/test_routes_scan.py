@@ -0,0 +1,35 @@
+from unittest.mock import patch, MagicMock
+
+
+def test_trigger_path_sync(client, headers):
+    with patch('routes.scan.sync_paths_task.delay', return_value=MagicMock(id="task-id")) as mock_delay:
+        response = client.post("/scan-paths", json={"paths": ["Author/Book.epub"], "reread": True}, headers=headers)
+
+    assert response.status_code == 200
+    assert response.json == {"task_id": "task-id"}
+    mock_delay.assert_called_once_with(["Author/Book.epub"], True)
+
+
+def test_trigger_path_sync_invalid_paths(client, headers):
+    with patch('routes.scan.sync_paths_task.delay') as mock_delay:
+        response = client.post("/scan-paths", json={"paths": []}, headers=headers)
+
+    assert response.status_code == 400
+    mock_delay.assert_not_called()
+
+
+def test_trigger_path_sync_not_editor(client, headers_other_user3):
+    with patch('routes.scan.sync_paths_task.delay') as mock_delay:
+        response = client.post("/scan-paths", json={"paths": ["Author/Book.epub"]}, headers=headers_other_user3)
+
+    assert response.status_code == 403
+    mock_delay.assert_not_called()
+
+
+def test_get_scan_status_includes_progress(client):
+    progress = {"counts": {"discovered": 10, "parsed": 4}, "timings": {"parse": 1.5}, "elapsed": 2.0}
+    with patch('routes.scan.celery.AsyncResult', return_value=MagicMock(state="PROGRESS", info=progress)):
+        response = client.get("/scan-status/task-id")
+
+    assert response.status_code == 200
+    assert response.json == {"state": "PROGRESS", "progress": progress}
@@ -0,0 +1,31 @@
+def test_get_series_and_books(client, db_session, headers):
+    from models.epub_metadata import EpubMetadata
+    books = [
+        EpubMetadata(identifier=f"series-test-{index}", title=f"Series Book {index}", authors="Series Author",
+                     series="Route Test Series", seriesindex=float(index), relative_path=f"series/book-{index}.epub")
+        for index in (2, 1)
+    ]
+    db_session.add_all(books)
+    db_session.commit()
+
+    response = client.get("/api/series?prefix=route test", headers=headers)
+    assert response.status_code == 200
+    series = response.json["series"][0]
+    assert series["name"] == "Route Test Series"
+    assert series["book_count"] == 2
+    assert (series["min_index"], series["max_index"]) == (1.0, 2.0)
+    assert series["coverUrl"] == "/api/covers/series-test-1"
+
+    response = client.get(f"/api/series/{series['id']}", headers=headers)
+    assert response.status_code == 200
+    assert [book["title"] for book in response.json["books"]] == ["Series Book 1", "Series Book 2"]
+
+    for book in books:
+        db_session.delete(book)
+    db_session.commit()
+    assert client.get(f"/api/series/{series['id']}", headers=headers).status_code == 404
+
+
+def test_get_series_invalid_cursor(client, headers):
+    response = client.get("/api/series?cursor=not-a-cursor", headers=headers)
+    assert response.status_code == 400
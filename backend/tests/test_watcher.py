@@ -0,0 +1,32 @@
+import os
+
+
+def test_library_event_handler_debounces_and_coalesces(tmp_path):
+    from watchdog.events import FileCreatedEvent, FileModifiedEvent, DirModifiedEvent, DirMovedEvent
+    from watcher import LibraryEventHandler
+
+    handler = LibraryEventHandler(str(tmp_path), debounce=2, max_delay=30)
+    handler.on_any_event(FileCreatedEvent(str(tmp_path / "series" / "book.epub")))
+    handler.on_any_event(FileCreatedEvent(str(tmp_path / "series" / "notes.txt")))
+    handler.on_any_event(DirModifiedEvent(str(tmp_path / "series")))
+    handler.on_any_event(DirMovedEvent(str(tmp_path / "old_series"), str(tmp_path / "series")))
+    handler.on_any_event(FileModifiedEvent(str(tmp_path / "Other.EPUB")))
+
+    # Still settling
+    assert handler.pop_ready(now=handler.last_event_at + 1) == []
+    # Paths under a changed directory are covered by syncing the directory itself
+    assert handler.pop_ready(now=handler.last_event_at + 2) == ["Other.EPUB", "old_series", "series"]
+    assert handler.pending == set()
+
+
+def test_library_event_handler_ignores_excluded_paths(tmp_path):
+    from unittest.mock import patch
+    from watchdog.events import FileCreatedEvent
+    from watcher import LibraryEventHandler
+
+    handler = LibraryEventHandler(str(tmp_path), debounce=0, max_delay=0)
+    with patch('config.config.config.SCAN_EXCLUDE', ["@eaDir"]):
+        handler.on_any_event(FileCreatedEvent(str(tmp_path / "@eaDir" / "nested" / "book.epub")))
+        handler.on_any_event(FileCreatedEvent(os.path.join(str(tmp_path), "book.epub")))
+
+    assert handler.pop_ready() == ["book.epub"]
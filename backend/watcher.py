@@ -0,0 +1,105 @@
+import os
+import time
+import threading
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
+from config.config import config
+from config.logger import logger
+from functions.metadata.scan import is_excluded
+
+
+class LibraryEventHandler(FileSystemEventHandler):
+    """
+    Collects changed ePubs and directories under base_directory from filesystem events.
+    Changes are coalesced until no new event has arrived for `debounce` seconds, or `max_delay` seconds
+    have passed since the first pending one, so a file being copied in is only synced once it settles.
+    """
+    def __init__(self, base_directory, debounce=None, max_delay=None):
+        self.base_directory = base_directory
+        self.debounce = config.WATCHER_DEBOUNCE if debounce is None else debounce
+        self.max_delay = config.WATCHER_MAX_DELAY if max_delay is None else max_delay
+        self.pending = set()
+        self.first_event_at = None
+        self.last_event_at = None
+        self.lock = threading.Lock()
+
+    def on_any_event(self, event):
+        if event.event_type in ('opened', 'closed_no_write'):
+            return
+        # A directory's own "modified" event only means its entries changed, which are reported separately
+        if event.is_directory and event.event_type == 'modified':
+            return
+        self.add_path(event.src_path, event.is_directory)
+        if getattr(event, 'dest_path', None):
+            self.add_path(event.dest_path, event.is_directory)
+
+    def add_path(self, path, is_directory=False):
+        path = os.fsdecode(path)
+        relative_path = os.path.relpath(path, self.base_directory)
+        if relative_path == '.' or relative_path == '..' or relative_path.startswith('..' + os.sep):
+            return
+        if not is_directory and not path.lower().endswith('.epub'):
+            return
+        parts = relative_path.split(os.sep)
+        for i, name in enumerate(parts):
+            if config.SCAN_EXCLUDE and is_excluded(os.sep.join(parts[:i + 1]), name, config.SCAN_EXCLUDE):
+                return
+        now = time.monotonic()
+        with self.lock:
+            self.pending.add(relative_path)
+            if self.first_event_at is None:
+                self.first_event_at = now
+            self.last_event_at = now
+
+    def pop_ready(self, now=None):
+        """
+        Returns the pending paths once they have settled, dropping any path that sits under a pending directory.
+        Returns an empty list while events are still arriving.
+        """
+        if now is None:
+            now = time.monotonic()
+        with self.lock:
+            if not self.pending:
+                return []
+            if now - self.last_event_at < self.debounce and now - self.first_event_at < self.max_delay:
+                return []
+            pending, self.pending = self.pending, set()
+            self.first_event_at = self.last_event_at = None
+        paths = []
+        for relative_path in sorted(pending):
+            parent = os.path.dirname(relative_path)
+            while parent and parent not in pending:
+                parent = os.path.dirname(parent)
+            if not parent:
+                paths.append(relative_path)
+        return paths
+
+
+def run_watcher():
+    # Delay import so the watcher module can be used without a Celery broker configured
+    from functions.tasks.scan import sync_paths_task
+    handler = LibraryEventHandler(config.BASE_DIRECTORY)
+    if config.WATCHER_POLLING:
+        observer = PollingObserver(timeout=config.WATCHER_POLL_INTERVAL)
+    else:
+        observer = Observer()
+    observer.schedule(handler, config.BASE_DIRECTORY, recursive=True)
+    observer.start()
+    logger.info(f"Watching {config.BASE_DIRECTORY} for library changes using {type(observer).__name__}.")
+    try:
+        while observer.is_alive():
+            paths = handler.pop_ready()
+            if paths:
+                sync_paths_task.delay(paths)
+                logger.info(f"Queued sync of {len(paths)} changed paths.")
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        observer.stop()
+        observer.join()
+
+
+if __name__ == '__main__':
+    run_watcher()
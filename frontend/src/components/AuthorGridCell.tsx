@@ -12,6 +12,9 @@ interface AuthorGridCellProps {
     isExpanded: boolean;
     toggleLetter: (letter: string) => void;
     authors: string[];
+    loading: boolean;
+    hasMore: boolean;
+    loadMore: () => void;
 }
 
 const AuthorGridCell: React.FC<AuthorGridCellProps> = ({
@@ -20,6 +23,9 @@ const AuthorGridCell: React.FC<AuthorGridCellProps> = ({
        isExpanded,
        toggleLetter,
        authors,
+       loading,
+       hasMore,
+       loadMore,
    }) => {
     const collapsedHeight = 85; // Fixed height when collapsed
 
@@ -56,6 +62,16 @@ const AuthorGridCell: React.FC<AuthorGridCellProps> = ({
                                 {author}
                             </Button>
                         ))}
+                        {loading && <div className="no-authors">Loading authors...</div>}
+                        {hasMore && !loading && (
+                            <Button
+                                variant={UI_BASE_COLOR}
+                                className="author-item link-button"
+                                onClick={loadMore}
+                            >
+                                More...
+                            </Button>
+                        )}
                     </div>
                 ) : (
                     <div className="no-authors">No authors available</div>
@@ -1,5 +1,5 @@
 // Authors.tsx
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useCallback } from 'react';
 import apiClient from '../utilities/apiClient';
 import { Button } from 'react-bootstrap';
 import './All.css';
@@ -8,44 +8,41 @@ import { useConfig } from '../context/ConfigProvider';
 
 const alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'.split('');
 
+const PAGE_SIZE = 200;
+
 interface AuthorsData {
   [key: string]: string[];
 }
 
+interface LetterPage {
+  nextCursor: string | null;
+  loading: boolean;
+}
+
+const emptyAuthorsData = (): AuthorsData =>
+  alphabet.reduce((acc, letter) => {
+    acc[letter] = [];
+    return acc;
+  }, {} as AuthorsData);
+
 const Authors: React.FC = () => {
-  const [authorsData, setAuthorsData] = useState<AuthorsData>(
-    alphabet.reduce((acc, letter) => {
-      acc[letter] = [];
-      return acc;
-    }, {} as AuthorsData)
-  );
+  const [authorsData, setAuthorsData] = useState<AuthorsData>(emptyAuthorsData());
+  // Number of authors under each initial; names are only fetched once a letter is expanded
+  const [letterCounts, setLetterCounts] = useState<Record<string, number>>({});
+  const [letterPages, setLetterPages] = useState<Record<string, LetterPage>>({});
   const [expandedLetters, setExpandedLetters] = useState<Set<string>>(new Set());
   const [loading, setLoading] = useState<boolean>(true);
   const [error, setError] = useState<string | null>(null);
   const { UI_BASE_COLOR } = useConfig();
 
   useEffect(() => {
-    const fetchAuthors = async () => {
+    const fetchLetterCounts = async () => {
       try {
         setLoading(true);
         setError(null);
 
-        const response = await apiClient.get('/api/authors');
-        const authors: string[] = response.data.authors;
-
-        const groupedAuthors: AuthorsData = alphabet.reduce((acc, letter) => {
-          acc[letter] = [];
-          return acc;
-        }, {} as AuthorsData);
-
-        authors.forEach((author) => {
-          const firstLetter = author[0].toUpperCase();
-          if (groupedAuthors[firstLetter]) {
-            groupedAuthors[firstLetter].push(author);
-          }
-        });
-
-        setAuthorsData(groupedAuthors);
+        const response = await apiClient.get('/api/authors', { params: { letters: true, limit: 1 } });
+        setLetterCounts(response.data.letters || {});
       } catch (err) {
         console.error('Error fetching authors:', err);
         setError('Failed to load authors list. Please try again.');
@@ -54,9 +51,32 @@ const Authors: React.FC = () => {
       }
     };
 
-    fetchAuthors();
+    fetchLetterCounts();
+  }, []);
+
+  const fetchLetter = useCallback(async (letter: string, cursor?: string) => {
+    setLetterPages((prev) => ({ ...prev, [letter]: { nextCursor: cursor ?? null, loading: true } }));
+    try {
+      const response = await apiClient.get('/api/authors', {
+        params: { prefix: letter, limit: PAGE_SIZE, ...(cursor ? { cursor } : {}) },
+      });
+      const names: string[] = response.data.authors.map((author: { name: string }) => author.name);
+      setAuthorsData((prev) => ({ ...prev, [letter]: cursor ? [...prev[letter], ...names] : names }));
+      setLetterPages((prev) => ({ ...prev, [letter]: { nextCursor: response.data.next_cursor ?? null, loading: false } }));
+    } catch (err) {
+      console.error(`Error fetching authors for ${letter}:`, err);
+      setLetterPages((prev) => ({ ...prev, [letter]: { nextCursor: cursor ?? null, loading: false } }));
+    }
   }, []);
 
+  useEffect(() => {
+    expandedLetters.forEach((letter) => {
+      if (!letterPages[letter]) {
+        fetchLetter(letter);
+      }
+    });
+  }, [expandedLetters, letterPages, fetchLetter]);
+
   const toggleLetter = (letter: string) => {
     setExpandedLetters((prev) => {
       const updated = new Set(prev);
@@ -71,7 +91,7 @@ const Authors: React.FC = () => {
 
 const expandAll = () => {
   const lettersWithAuthors = new Set(
-    alphabet.filter((letter) => authorsData[letter]?.length > 0)
+    alphabet.filter((letter) => letterCounts[letter] > 0)
   );
   setExpandedLetters(lettersWithAuthors);
 };
@@ -83,6 +103,7 @@ const expandAll = () => {
   console.group(`Authors render: ${new Date().toISOString()}`);
   console.log('Alphabet:', alphabet);
   console.log('Authors Data:', authorsData);
+  console.log('Letter Counts:', letterCounts);
   console.log('Expanded Letters:', [...expandedLetters]);
   console.groupEnd();
 
@@ -109,9 +130,10 @@ const expandAll = () => {
 
       <div className="grid">
         {alphabet.map((letter) => {
-          const hasAuthors = authorsData[letter]?.length > 0;
+          const hasAuthors = letterCounts[letter] > 0;
           const isExpanded = expandedLetters.has(letter);
           const authors = authorsData[letter] || [];
+          const page = letterPages[letter];
 
           return (
             <AuthorGridCell
@@ -121,6 +143,9 @@ const expandAll = () => {
               isExpanded={isExpanded}
               toggleLetter={toggleLetter}
               authors={authors}
+              loading={page?.loading ?? false}
+              hasMore={!!page?.nextCursor}
+              loadMore={() => page?.nextCursor && fetchLetter(letter, page.nextCursor)}
             />
           );
         })}
@@ -11,10 +11,14 @@ const CHUNK_SIZE = 18;
 const MAX_WINDOW_SIZE = 54;
 const PULL_THRESHOLD = 100; // How far user needs to "pull" to trigger load
 
+interface BookPage {
+  books: Book[];
+  nextCursor: string | null;
+  prevCursor: string | null;
+}
+
 const Home: React.FC<{ isLoggedIn: boolean, userRole: UserRole }> = ({ isLoggedIn, userRole }) => {
   const [books, setBooks] = useState<Book[]>([]);
-  const [offset, setOffset] = useState<number>(0);
-  const [topOffset, setTopOffset] = useState<number>(0);
   const [hasMore, setHasMore] = useState<boolean>(true);
   const [hasMoreAbove, setHasMoreAbove] = useState<boolean>(false);
   const [loading, setLoading] = useState<boolean>(false);
@@ -30,12 +34,14 @@ const Home: React.FC<{ isLoggedIn: boolean, userRole: UserRole }> = ({ isLoggedI
   const triggerRef = useRef<HTMLDivElement | null>(null);
   const containerRef = useRef<HTMLDivElement | null>(null);
 
-  const fetchBooks = async (offset: number, limit: number): Promise<Book[]> => {
+  // Pages are requested relative to the cursor of the first or last book in the window,
+  // so loading stays fast however far the user has scrolled
+  const fetchBooks = async (page: { cursor?: string; before?: string }, limit: number): Promise<BookPage> => {
     try {
       const response = await apiClient.get('/api/books', {
         params: {
           query: searchTerm,
-          offset,
+          ...page,
           limit,
           favorites: favoritesQueried,
           finished: finishedQueried,
@@ -45,13 +51,16 @@ const Home: React.FC<{ isLoggedIn: boolean, userRole: UserRole }> = ({ isLoggedI
       console.log('API Response:', response);
       if (!response.data || !Array.isArray(response.data.books)) {
         console.error('Invalid API response:', response.data);
-        return [];
+        return { books: [], nextCursor: null, prevCursor: null };
       }
-      const fetchedBooks = response.data.books;
-      return fetchedBooks || [];
+      return {
+        books: response.data.books,
+        nextCursor: response.data.next_cursor ?? null,
+        prevCursor: response.data.prev_cursor ?? null,
+      };
     } catch (error) {
       console.error('Error fetching books:', error);
-      return [];
+      return { books: [], nextCursor: null, prevCursor: null };
     }
   };
 
@@ -59,15 +68,19 @@ const Home: React.FC<{ isLoggedIn: boolean, userRole: UserRole }> = ({ isLoggedI
     if (loading || !hasMore) return;
 
     setLoading(true);
-    console.log('fetchAndAppendBooks - current state:', { offset, topOffset, hasMoreAbove });
+    const lastBook = books[books.length - 1];
+    console.log('fetchAndAppendBooks - current state:', { cursor: lastBook?.cursor, hasMoreAbove });
 
     try {
-      const newBooks = await fetchBooks(offset, CHUNK_SIZE);
+      const { books: newBooks, nextCursor } = await fetchBooks({ cursor: lastBook?.cursor }, CHUNK_SIZE);
 
       if (newBooks.length === 0) {
         setHasMore(false);
         return;
       }
+      if (!nextCursor) {
+        setHasMore(false);
+      }
 
       setBooks((prevBooks) => {
         const existingBookIds = new Set(prevBooks.map((book) => book.id));
@@ -79,31 +92,18 @@ const Home: React.FC<{ isLoggedIn: boolean, userRole: UserRole }> = ({ isLoggedI
             : updatedBooks;
       });
 
-      // Update offsets
-      const newOffset = offset + CHUNK_SIZE;
-      setOffset(newOffset);
-
-      // Update topOffset when we slice books from the top
-      setTopOffset(prevTopOffset => {
-        const newTopOffset = (books.length + newBooks.length > MAX_WINDOW_SIZE)
-            ? prevTopOffset + CHUNK_SIZE
-            : prevTopOffset;
-        console.log('Updated topOffset from', prevTopOffset, 'to', newTopOffset);
-        return newTopOffset;
-      });
-
-      // Enable loading above once we have some books loaded and topOffset > 0
-      if (!hasMoreAbove && (topOffset > 0 || (books.length + newBooks.length > MAX_WINDOW_SIZE))) {
+      // Enable loading above once books have been sliced from the top of the window
+      if (!hasMoreAbove && (books.length + newBooks.length > MAX_WINDOW_SIZE)) {
         console.log('Enabling hasMoreAbove');
         setHasMoreAbove(true);
       }
     } finally {
       setLoading(false);
     }
-  }, [loading, hasMore, offset, topOffset, hasMoreAbove, books.length, searchTerm]);
+  }, [loading, hasMore, hasMoreAbove, books, searchTerm]);
 
   const fetchAndPrependBooks = useCallback(async () => {
-    console.log('fetchAndPrepend called with:', { loadingAbove, hasMoreAbove, topOffset });
+    console.log('fetchAndPrepend called with:', { loadingAbove, hasMoreAbove, before: books[0]?.cursor });
 
     // Debounce: prevent rapid successive calls
     const now = Date.now();
@@ -117,11 +117,9 @@ const Home: React.FC<{ isLoggedIn: boolean, userRole: UserRole }> = ({ isLoggedI
       return;
     }
 
-    const newTopOffset = Math.max(0, topOffset - CHUNK_SIZE);
-    console.log('Attempting to load from offset:', newTopOffset, 'current topOffset:', topOffset);
-
-    if (newTopOffset >= topOffset) {
-      console.log('Cannot load - newTopOffset >= topOffset');
+    const firstBook = books[0];
+    if (!firstBook) {
+      console.log('Cannot load - no books in the window');
       setHasMoreAbove(false);
       return;
     }
@@ -131,7 +129,7 @@ const Home: React.FC<{ isLoggedIn: boolean, userRole: UserRole }> = ({ isLoggedI
     setPullDistance(0);
 
     try {
-      const newBooks = await fetchBooks(newTopOffset, CHUNK_SIZE);
+      const { books: newBooks, prevCursor } = await fetchBooks({ before: firstBook.cursor }, CHUNK_SIZE);
       console.log('Fetched books for prepend:', newBooks.length);
 
       if (newBooks.length === 0) {
@@ -150,16 +148,18 @@ const Home: React.FC<{ isLoggedIn: boolean, userRole: UserRole }> = ({ isLoggedI
             : updatedBooks;
       });
 
-      setTopOffset(newTopOffset);
-      console.log('Updated topOffset to:', newTopOffset);
+      // Books sliced from the bottom of the window can be loaded again when scrolling down
+      if (books.length + newBooks.length > MAX_WINDOW_SIZE) {
+        setHasMore(true);
+      }
 
-      if (newTopOffset === 0) {
+      if (!prevCursor) {
         setHasMoreAbove(false);
       }
     } finally {
       setLoadingAbove(false);
     }
-  }, [loadingAbove, hasMoreAbove, topOffset, lastTopLoadTime, searchTerm]);
+  }, [loadingAbove, hasMoreAbove, books, lastTopLoadTime, searchTerm]);
 
   // Handle pull-to-load scroll behavior
   useEffect(() => {
@@ -238,8 +238,6 @@ const Home: React.FC<{ isLoggedIn: boolean, userRole: UserRole }> = ({ isLoggedI
   }, [pullDistance, hasMoreAbove, loadingAbove, fetchAndPrependBooks]);
 
   const refreshBooks = () => {
-    setOffset(0);
-    setTopOffset(0);
     setHasMore(true);
     setHasMoreAbove(false);
     setBooks([]);
@@ -247,8 +245,6 @@ const Home: React.FC<{ isLoggedIn: boolean, userRole: UserRole }> = ({ isLoggedI
   };
 
   useEffect(() => {
-    setOffset(0);
-    setTopOffset(0);
     setHasMore(true);
     setHasMoreAbove(false);
     setBooks([]);
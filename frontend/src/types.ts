@@ -10,4 +10,5 @@
      identifier: string;
      is_finished: boolean;
      marked_favorite: boolean;
+     cursor?: string;
    }
\ No newline at end of file